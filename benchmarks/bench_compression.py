@@ -0,0 +1,111 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Compare the compressors of the message transport.
+
+Representative large messages are built: the 'url_reply' of an image
+resource with uncompressed XPM data, the snapshot of an Html widget with
+a long source, and the 'set_items' action of a ComboBox with thousands
+of items. A small attribute update is included to show the cost below
+the threshold. Each message is encoded with the binary codec alone and
+wrapped in a CompressingCodec for each registered compressor, and the
+encoded size and the encode and decode times are reported.
+
+"""
+import optparse
+import random
+import timeit
+
+from enaml.image_provider import Image
+from enaml.message_codecs import (
+    BinaryCodec, CompressingCodec, compressor_names,
+)
+from enaml.widgets.combo_box import ComboBox
+from enaml.widgets.html import Html
+
+
+def xpm_data(width, height, colors):
+    """ Create the data of a random XPM image.
+
+    """
+    rng = random.Random(0)
+    chars = [chr(ord('a') + idx) for idx in range(colors)]
+    lines = ['/* XPM */', 'static char *image[] = {']
+    lines.append('"%d %d %d 1",' % (width, height, colors))
+    for idx, char in enumerate(chars):
+        lines.append('"%s c #%06x",' % (char, rng.randrange(1 << 24)))
+    for row in range(height):
+        # Runs of color, like the flat regions of an icon.
+        pixels = []
+        while len(pixels) < width:
+            pixels.extend(rng.choice(chars) * rng.randrange(1, 12))
+        lines.append('"%s",' % ''.join(pixels[:width]))
+    lines.append('};')
+    return '\n'.join(lines)
+
+
+def build_messages():
+    """ Build the representative messages.
+
+    """
+    image = Image(format='xpm', size=(256, 256), data=xpm_data(256, 256, 16))
+    reply = {
+        'id': 'req', 'url': 'image://icons/large', 'status': 'ok',
+        'resource': image.snapshot(),
+    }
+    rows = ''.join(
+        '<tr><td>Row %d</td><td class="value">%f</td></tr>\n' % (idx, idx / 7.)
+        for idx in range(2000)
+    )
+    html = Html(source=u'<html><body><table>%s</table></body></html>' % rows)
+    items = [u'Item number %d' % idx for idx in range(5000)]
+    combo = ComboBox(items=items)
+    return [
+        ('image reply', ('session', 'url_reply', reply)),
+        ('html snapshot', ('session', 'snapshot', {'windows': [
+            html.snapshot(),
+        ]})),
+        ('combo items', (combo.object_id, 'set_items', {'items': items})),
+        ('small update', (combo.object_id, 'set_index', {'index': 3})),
+    ]
+
+
+def main():
+    usage = 'usage: %prog [options]'
+    parser = optparse.OptionParser(usage=usage, description=__doc__)
+    parser.add_option('-t', '--threshold', type='int', default=4096,
+                      help='The compression threshold in bytes')
+    parser.add_option('-n', '--number', type='int', default=20,
+                      help='The number of passes per measurement')
+    options, args = parser.parse_args()
+
+    number = options.number
+    for label, msg in build_messages():
+        print label
+        configs = [('none', BinaryCodec)]
+        for name in compressor_names():
+            def factory(name=name):
+                return CompressingCodec(BinaryCodec(), name, options.threshold)
+            configs.append((name, factory))
+        expected = None
+        for name, factory in configs:
+            data = factory().encode(*msg)
+            result = factory().decode(data)
+            if expected is None:
+                expected = result
+            elif result != expected:
+                raise AssertionError('%s does not round trip' % name)
+            # A fresh codec per pass, so the intern tables of the binary
+            # codec do not shrink the repeated messages.
+            enc = min(timeit.Timer(
+                lambda: factory().encode(*msg)).repeat(3, number))
+            dec = min(timeit.Timer(
+                lambda: factory().decode(data)).repeat(3, number))
+            print '    %-5s %9d bytes, encode %8.3f ms, decode %8.3f ms' % (
+                name, len(data), enc * 1000 / number, dec * 1000 / number
+            )
+
+
+if __name__ == '__main__':
+    main()
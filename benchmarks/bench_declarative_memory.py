@@ -0,0 +1,105 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Measure the memory used per widget by a large declarative tree.
+
+The tree is made of repeated rows of a Label and a Field, each with a
+few bound expressions and listeners. A snapshot of the tree is taken
+so that the expressions are evaluated. The script reports the growth of
+the resident set size per widget, and the bytes per widget used by the
+bound expressions and listeners and the containers which store them.
+An expression object which is shared by many widgets is counted once.
+
+"""
+import gc
+import optparse
+import os
+import sys
+
+from enaml.core.binding_table import table_items
+from enaml.tests.utils import compile_source
+
+
+SOURCE = """\
+from enaml.widgets.api import Container, Field, Label
+
+enamldef Row(Container):
+    attr index = 0
+    Label:
+        text << 'Row %d' % index
+    Field:
+        text = 'edit'
+        enabled << index % 2 == 0
+        text ::
+            print(text)
+"""
+
+
+def rss_bytes():
+    """ Return the resident set size of the process in bytes.
+
+    """
+    with open('/proc/self/statm') as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf('SC_PAGE_SIZE')
+
+
+def storage_bytes(obj, seen):
+    """ Return the bytes used by the binding storage of an object.
+
+    The storage is read from the instance dict so that measuring does
+    not create storage which was not already present. The ids of the
+    bound objects which were counted are added to the `seen` set.
+
+    """
+    total = 0
+    for key in ('_expressions', '_listeners', '_subscriptions'):
+        store = obj.__dict__.get(key)
+        if store is None:
+            continue
+        total += sys.getsizeof(store)
+        if key == '_subscriptions':
+            # The notifiers are the same with or without sharing.
+            continue
+        for name, value in table_items(store):
+            if isinstance(value, list):
+                total += sys.getsizeof(value)
+            else:
+                value = [value]
+            for item in value:
+                if id(item) not in seen:
+                    seen.add(id(item))
+                    total += sys.getsizeof(item)
+    return total
+
+
+def main():
+    usage = 'usage: %prog [options]'
+    parser = optparse.OptionParser(usage=usage, description=__doc__)
+    parser.add_option('-n', '--widgets', type='int', default=10000,
+                      help='The approximate number of widgets to create')
+    options, args = parser.parse_args()
+
+    module = compile_source(SOURCE, '__enaml_bench__')
+    from enaml.widgets.api import Container
+    gc.collect()
+    start = rss_bytes()
+    root = Container()
+    for index in xrange(options.widgets // 3):
+        module.Row(root, index=index)
+    root.snapshot()
+    widgets = list(root.traverse())
+    gc.collect()
+    used = rss_bytes() - start
+
+    count = len(widgets)
+    seen = set()
+    storage = sum(storage_bytes(widget, seen) for widget in widgets)
+    print '%d widgets' % count
+    print 'rss:     %8.1f bytes/widget' % (float(used) / count)
+    print 'storage: %8.1f bytes/widget' % (float(storage) / count)
+
+
+if __name__ == '__main__':
+    main()
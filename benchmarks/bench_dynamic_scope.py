@@ -0,0 +1,73 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Measure the cost of name lookups in a dynamic scope.
+
+A chain of nested Declarative objects is created and names are looked
+up from the innermost object: a name provided by the object itself, a
+name provided by the root of the chain, and a name provided by no
+object, which is the case for every global and builtin name used in an
+expression.
+
+"""
+import optparse
+import timeit
+
+from traits.api import Int
+
+from enaml.core.declarative import Declarative
+from enaml.core.dynamic_scope import DynamicScope
+
+
+class Root(Declarative):
+
+    value = Int(1)
+
+
+def make_scope(depth):
+    """ Create a scope for the innermost object of a chain.
+
+    """
+    obj = Root()
+    for idx in xrange(depth):
+        obj = Declarative(obj)
+    return DynamicScope(obj, {}, {}, None)
+
+
+def lookup(scope, name):
+    """ Lookup a name in the scope, ignoring a missing name.
+
+    """
+    try:
+        scope[name]
+    except KeyError:
+        pass
+
+
+def main():
+    usage = 'usage: %prog [options]'
+    parser = optparse.OptionParser(usage=usage, description=__doc__)
+    parser.add_option('-d', '--depth', type='int', default=10,
+                      help='The depth of the object chain')
+    parser.add_option('-n', '--number', type='int', default=20000,
+                      help='The number of lookups per measurement')
+    options, args = parser.parse_args()
+
+    scope = make_scope(options.depth)
+    cases = [
+        ('local', 'name'),
+        ('root', 'value'),
+        ('missing', 'len'),
+    ]
+    for label, name in cases:
+        timer = timeit.Timer(lambda: lookup(scope, name))
+        best = min(timer.repeat(3, options.number))
+        usec = best * 1e6 / options.number
+        print '%-8s depth %2d  %7.2f usec/lookup' % (
+            label, options.depth, usec,
+        )
+
+
+if __name__ == '__main__':
+    main()
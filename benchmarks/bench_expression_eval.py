@@ -0,0 +1,55 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Measure the evaluation rate of bound expressions.
+
+The `=`, `<<` and `::` expressions of a small enamldef are evaluated
+repeatedly and the number of evaluations per second is reported. The
+`<<` expression labeled 'fmt' does formatting and math with builtins,
+which measures the cost of the code tracing on such expressions.
+
+"""
+import optparse
+import timeit
+
+from enaml.tests.utils import compile_source
+
+
+SOURCE = """\
+from enaml.core.declarative import Declarative
+
+enamldef Main(Declarative):
+    attr a = 1
+    attr simple = a + 1
+    attr subscribe << a + 1
+    attr formatted << '{0:.2f} {1}'.format(abs(a) * 1.5, str(round(a, 1)).upper())
+    attr notify
+    notify ::
+        a + 1
+"""
+
+
+def main():
+    usage = 'usage: %prog [options]'
+    parser = optparse.OptionParser(usage=usage, description=__doc__)
+    parser.add_option('-n', '--number', type='int', default=20000,
+                      help='The number of evaluations per measurement')
+    options, args = parser.parse_args()
+
+    module = compile_source(SOURCE, '__enaml_bench__')
+    obj = module.Main()
+    obj.subscribe
+    cases = [
+        ('=', lambda: obj.eval_expression('simple')),
+        ('<<', lambda: obj.eval_expression('subscribe')),
+        ('::', lambda: obj.run_listeners('notify', 0, 1)),
+        ('fmt', lambda: obj.eval_expression('formatted')),
+    ]
+    for label, func in cases:
+        best = min(timeit.Timer(func).repeat(3, options.number))
+        print '%-3s %10.0f evaluations/sec' % (label, options.number / best)
+
+
+if __name__ == '__main__':
+    main()
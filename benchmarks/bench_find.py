@@ -0,0 +1,62 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Measure the time of name lookups with `Object.find`.
+
+A balanced tree of named objects is created, and the names of some of
+its leaves are looked up from the root, with and without a name index.
+
+"""
+import optparse
+import timeit
+
+from enaml.core.object import Object
+
+
+def build_tree(depth, fanout):
+    """ Build a balanced tree of uniquely named objects.
+
+    """
+    root = Object(name='root')
+    level = [root]
+    count = 0
+    for _ in range(depth):
+        next_level = []
+        for parent in level:
+            for _ in range(fanout):
+                next_level.append(Object(parent, name='obj_%d' % count))
+                count += 1
+        level = next_level
+    return root, [obj.name for obj in level[::max(1, len(level) // 10)]]
+
+
+def main():
+    usage = 'usage: %prog [options]'
+    parser = optparse.OptionParser(usage=usage, description=__doc__)
+    parser.add_option('-d', '--depth', type='int', default=4,
+                      help='The depth of the object tree')
+    parser.add_option('-f', '--fanout', type='int', default=8,
+                      help='The number of children of each object')
+    parser.add_option('-n', '--number', type='int', default=20,
+                      help='The number of lookups per measurement')
+    options, args = parser.parse_args()
+
+    root, names = build_tree(options.depth, options.fanout)
+    size = sum(1 for _ in root.traverse())
+
+    def lookup():
+        for name in names:
+            root.find(name)
+
+    print 'objects: %d' % size
+    for label in ('traverse', 'index'):
+        if label == 'index':
+            root.enable_name_index()
+        best = min(timeit.Timer(lookup).repeat(3, options.number))
+        per_find = best / (options.number * len(names)) * 1e6
+        print '%-9s %10.2f us/find' % (label, per_find)
+
+
+if __name__ == '__main__':
+    main()
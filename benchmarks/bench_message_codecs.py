@@ -0,0 +1,97 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Compare the size and speed of the message codecs.
+
+The traffic of a session is recorded: the snapshot of a window with a
+container of rows, where each row holds a label and a field, followed
+by text updates, enabled state changes and the insertion of new rows.
+Each codec encodes the recorded messages in order with a fresh codec
+instance, as it would for a new session, and the average bytes per
+message and the encode and decode throughputs are reported.
+
+"""
+import optparse
+import timeit
+
+from enaml.message_codecs import BinaryCodec, JSONCodec
+from enaml.tests.utils import RecordingSession
+from enaml.widgets.api import Container, Field, Label, Window
+
+
+def record_traffic(rows, updates):
+    """ Record the messages of a session.
+
+    """
+    window = Window()
+    container = Container(window)
+    fields = []
+    for idx in range(rows):
+        row = Container(container)
+        Label(row, text='Label %d' % idx)
+        fields.append(Field(row, text='Value %d' % idx))
+    window.initialize()
+    session = RecordingSession()
+    window.activate(session)
+    snapshot = {'windows': [window.snapshot()]}
+    session.send(session.session_id, 'snapshot', snapshot)
+    for idx in range(updates):
+        field = fields[idx % rows]
+        field.text = u'Updated %d' % idx
+        if idx % 10 == 0:
+            field.enabled = not field.enabled
+        if idx % 50 == 0:
+            row = Container()
+            Label(row, text='New %d' % idx)
+            Field(row, text='Value')
+            row.initialize()
+            row.set_parent(container)
+            row.activate(session)
+    return session.messages
+
+
+def main():
+    usage = 'usage: %prog [options]'
+    parser = optparse.OptionParser(usage=usage, description=__doc__)
+    parser.add_option('-r', '--rows', type='int', default=200,
+                      help='The number of rows in the window')
+    parser.add_option('-u', '--updates', type='int', default=2000,
+                      help='The number of updates after the snapshot')
+    parser.add_option('-n', '--number', type='int', default=3,
+                      help='The number of passes per measurement')
+    options, args = parser.parse_args()
+
+    messages = record_traffic(options.rows, options.updates)
+    count = len(messages)
+    print '%d messages recorded' % count
+    json_codec = JSONCodec()
+    expected = [json_codec.decode(json_codec.encode(*m)) for m in messages]
+    for codec_cls in (JSONCodec, BinaryCodec):
+        def encode_all():
+            encode = codec_cls().encode
+            return [encode(*msg) for msg in messages]
+
+        encoded = encode_all()
+
+        def decode_all():
+            decode = codec_cls().decode
+            return [decode(data) for data in encoded]
+
+        if decode_all() != expected:
+            raise AssertionError('%s does not round trip' % codec_cls.name)
+        sizes = [len(data) for data in encoded]
+        first = sizes[0]
+        rest = sum(sizes[1:]) / float(max(count - 1, 1))
+        enc = min(timeit.Timer(encode_all).repeat(3, options.number))
+        dec = min(timeit.Timer(decode_all).repeat(3, options.number))
+        enc_rate = count * options.number / enc
+        dec_rate = count * options.number / dec
+        print '%-7s snapshot %8d bytes, updates %6.1f bytes/msg, ' \
+              'encode %8.0f msg/s, decode %8.0f msg/s' % (
+                  codec_cls.name, first, rest, enc_rate, dec_rate
+              )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Measure the propagation of changes through chained subscriptions.
+
+Two dependency graphs are measured, with and without a refresh queue
+transaction:
+
+deep
+    A chain where each attribute depends on the previous two. Without
+    ordering, a change may cause a number of re-evaluations which grows
+    exponentially with the depth of the chain.
+
+wide
+    A set of attributes which depend on a model, and a sink attribute
+    which depends on all of them. Without ordering, the sink is
+    re-evaluated once for every attribute in the set.
+
+The number of expression evaluations is reported for each run.
+
+"""
+import optparse
+import time
+
+from traits.api import HasTraits, Int
+
+from enaml.core import refresh_queue
+from enaml.tests.utils import compile_source
+
+
+HEADER = """\
+from enaml.core.declarative import Declarative
+
+evaluations = [0]
+
+def tick(value):
+    evaluations[0] += 1
+    return value
+
+enamldef Main(Declarative):
+    attr model
+"""
+
+
+class Model(HasTraits):
+
+    value = Int
+
+
+def deep_source(size):
+    """ Generate the source for a deep dependency graph.
+
+    """
+    lines = [HEADER]
+    lines.append('    attr a0 << tick(model.value)\n')
+    lines.append('    attr a1 << tick(a0 + 1)\n')
+    for idx in xrange(2, size):
+        line = '    attr a%d << tick(a%d + a%d)\n' % (idx, idx - 1, idx - 2)
+        lines.append(line)
+    return ''.join(lines)
+
+
+def wide_source(size):
+    """ Generate the source for a wide dependency graph.
+
+    """
+    lines = [HEADER]
+    for idx in xrange(size):
+        lines.append('    attr a%d << tick(model.value + %d)\n' % (idx, idx))
+    terms = ' + '.join('a%d' % idx for idx in xrange(size))
+    lines.append('    attr sink << tick(%s)\n' % terms)
+    return ''.join(lines)
+
+
+def measure(source, sink, changes, use_transaction):
+    """ Measure the time and number of evaluations for model changes.
+
+    """
+    module = compile_source(source, '__enaml_bench__')
+    model = Model()
+    main = module.Main(model=model)
+    getattr(main, sink)
+    evaluations = module.evaluations
+    evaluations[0] = 0
+    start = time.time()
+    for value in xrange(1, changes + 1):
+        if use_transaction:
+            with refresh_queue.transaction():
+                model.value = value
+        else:
+            model.value = value
+    elapsed = time.time() - start
+    return elapsed, evaluations[0]
+
+
+def main():
+    usage = 'usage: %prog [options]'
+    parser = optparse.OptionParser(usage=usage, description=__doc__)
+    parser.add_option('-d', '--depth', type='int', default=16,
+                      help='The depth of the deep graph')
+    parser.add_option('-w', '--width', type='int', default=100,
+                      help='The width of the wide graph')
+    parser.add_option('-c', '--changes', type='int', default=20,
+                      help='The number of model changes to make')
+    options, args = parser.parse_args()
+
+    graphs = [
+        ('deep', deep_source(options.depth), 'a%d' % (options.depth - 1)),
+        ('wide', wide_source(options.width), 'sink'),
+    ]
+    for name, source, sink in graphs:
+        for use_transaction in (False, True):
+            elapsed, evaluations = measure(
+                source, sink, options.changes, use_transaction
+            )
+            mode = 'transaction' if use_transaction else 'immediate'
+            print '%s %-11s %8.1fms  %8d evaluations' % (
+                name, mode, elapsed * 1000.0, evaluations,
+            )
+
+
+if __name__ == '__main__':
+    main()
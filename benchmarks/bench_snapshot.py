@@ -0,0 +1,66 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Measure the time to snapshot a large widget tree.
+
+A window is created with a container of rows, where each row holds a
+label and a field. The time taken by `snapshot()`, which is what
+`Session.snapshot()` calls for each window, is reported. The snapshot
+of a window includes the layout constraints of its containers, so the
+time is also reported for a flat tree of the same widgets, which has
+no layout.
+
+"""
+import optparse
+import timeit
+
+from enaml.core.messenger import Messenger
+from enaml.widgets.api import Container, Field, Label, Window
+
+
+def build_window(rows):
+    """ Build a window with the given number of rows.
+
+    """
+    window = Window()
+    container = Container(window)
+    for idx in range(rows):
+        row = Container(container)
+        Label(row, text='Label %d' % idx)
+        Field(row, text='Value %d' % idx)
+    return window
+
+
+def build_flat(rows):
+    """ Build a flat tree with the widgets of the given number of rows.
+
+    """
+    root = Messenger()
+    for idx in range(rows):
+        Label(root, text='Label %d' % idx)
+        Field(root, text='Value %d' % idx)
+    return root
+
+
+def main():
+    usage = 'usage: %prog [options]'
+    parser = optparse.OptionParser(usage=usage, description=__doc__)
+    parser.add_option('-r', '--rows', type='int', default=1000,
+                      help='The number of rows in the window')
+    parser.add_option('-n', '--number', type='int', default=5,
+                      help='The number of snapshots per measurement')
+    options, args = parser.parse_args()
+
+    for label, builder in (('window', build_window), ('flat', build_flat)):
+        root = builder(options.rows)
+        size = sum(1 for _ in root.traverse())
+        best = min(timeit.Timer(root.snapshot).repeat(3, options.number))
+        per_snap = best / options.number
+        print '%-6s %5d widgets: %8.2f ms (%6.2f us/widget)' % (
+            label, size, per_snap * 1e3, per_snap / size * 1e6
+        )
+
+
+if __name__ == '__main__':
+    main()
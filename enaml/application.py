@@ -7,6 +7,7 @@ from heapq import heappush, heappop
 from itertools import count
 import logging
 from threading import Lock
+from timeit import default_timer
 
 
 logger = logging.getLogger(__name__)
@@ -99,6 +100,131 @@ class ScheduledTask(object):
         return self._result
 
 
+class IncrementalTask(object):
+    """ A task which runs the steps of a generator in time slices.
+
+    Each tick of the task advances the generator on the main event loop
+    thread until the time budget of the tick is spent, then schedules
+    the next tick with `Application.schedule`. Other scheduled tasks and
+    the event loop run between the ticks, so long running work does not
+    freeze the user interface. Tasks with the same priority take turns.
+
+    """
+    def __init__(self, steps, budget=0.01, progress=None, done=None,
+                 priority=0):
+        """ Initialize an IncrementalTask.
+
+        Parameters
+        ----------
+        steps : iterator
+            An iterator which performs a small unit of work each time
+            it is advanced. The values it yields, if not None, are
+            passed to the `progress` callback at the end of a tick.
+
+        budget : float, optional
+            The time budget of a tick, in seconds. At least one step is
+            run per tick. The default is 0.01.
+
+        progress : callable, optional
+            A callable which accepts the last value yielded during a
+            tick. It is invoked at the end of each tick.
+
+        done : callable, optional
+            A callable with no arguments which is invoked once the
+            iterator is exhausted.
+
+        priority : int, optional
+            The priority with which the ticks are scheduled. See
+            `Application.schedule`. The default is zero.
+
+        """
+        self._steps = steps
+        self._budget = budget
+        self._progress = progress
+        self._done = done
+        self._priority = priority
+        self._task = None
+        self._finished = False
+
+    #--------------------------------------------------------------------------
+    # Private API
+    #--------------------------------------------------------------------------
+    def _schedule(self):
+        """ Schedule the next tick of the task.
+
+        """
+        app = Application.instance()
+        if app is None:
+            raise RuntimeError('Application instance does not exist')
+        self._task = app.schedule(self._tick, priority=self._priority)
+
+    def _tick(self):
+        """ Run the steps of the task until the budget is spent.
+
+        """
+        if self._finished:
+            return
+        steps = self._steps
+        value = None
+        end = default_timer() + self._budget
+        try:
+            while True:
+                step = steps.next()
+                if step is not None:
+                    value = step
+                if default_timer() >= end:
+                    break
+        except StopIteration:
+            self._finished = True
+        except Exception:
+            self._finished = True
+            raise
+        if value is not None and self._progress is not None:
+            self._progress(value)
+        if self._finished:
+            if self._done is not None:
+                self._done()
+        else:
+            self._schedule()
+
+    #--------------------------------------------------------------------------
+    # Public API
+    #--------------------------------------------------------------------------
+    def start(self):
+        """ Schedule the first tick of the task.
+
+        """
+        self._schedule()
+
+    def run(self):
+        """ Run all of the remaining steps of the task synchronously.
+
+        """
+        if not self._finished:
+            self._budget = float('inf')
+            self._tick()
+
+    def cancel(self):
+        """ Cancel the remaining steps of the task.
+
+        The `done` callback is not invoked for a cancelled task.
+
+        """
+        self._finished = True
+        if self._task is not None:
+            self._task.unschedule()
+        close = getattr(self._steps, 'close', None)
+        if close is not None:
+            close()
+
+    def finished(self):
+        """ Returns True if the task is finished or cancelled, False
+        otherwise.
+
+        """
+        return self._finished
+
+
 class Application(object):
     """ The application object which manages the top-level communication
     protocol for serving Enaml views.
@@ -176,11 +302,80 @@ class Application(object):
                 priority, ignored, task = heappop(heap)
                 self.deferred_call(self._process_task, task)
 
+    def _iter_open_pair(self, session, session_id, chunk_size,
+                        create_client, connect):
+        """ A generator which opens a server session and the local
+        client session which displays it.
+
+        The server session is opened and its windows are initialized,
+        then the client session is built from the snapshot chunks, and
+        both sessions are activated. The initialization and the build
+        are each reported as half of the work. If a step raises, or the
+        generator is closed before it finishes, the server session is
+        closed and the client session is destroyed.
+
+        Parameters
+        ----------
+        session : Session
+            The server session to open.
+
+        session_id : str
+            The unique identifier to use for the session.
+
+        chunk_size : int
+            The maximum number of objects to build per step.
+
+        create_client : callable
+            A callable which accepts the opened server session and
+            returns a new client session. The client session must have
+            `build_chunk`, `activate` and `destroy` methods.
+
+        connect : callable
+            A callable with no arguments which returns a tuple of the
+            server socket and the client socket of a connected pair.
+
+        Returns
+        -------
+        result : generator
+            A generator which yields the fraction of the work which is
+            complete.
+
+        """
+        client = None
+        opened = False
+        try:
+            # Open the server-side session.
+            for value in session.iter_open(session_id):
+                yield 0.5 * value
+
+            # Create and build the client-side session.
+            total = sum(1 for w in session.windows for obj in w.traverse())
+            built = 0
+            client = create_client(session)
+            for chunk in session.snapshot_chunks(chunk_size):
+                client.build_chunk(chunk)
+                built += chunk['count']
+                yield 0.5 + 0.5 * min(float(built) / max(total, 1), 1.0)
+
+            # Activate the server and client sessions. The server session
+            # is activated first so that it is ready to receive messages
+            # sent by the client during activation. These messages will
+            # typically be requests for resources.
+            server_socket, client_socket = connect()
+            session.activate(server_socket)
+            client.activate(client_socket)
+            opened = True
+        finally:
+            if not opened:
+                if client is not None:
+                    client.destroy()
+                session.close()
+
     #--------------------------------------------------------------------------
     # Abstract API
     #--------------------------------------------------------------------------
     @abstractmethod
-    def start_session(self, name):
+    def start_session(self, name, budget=None):
         """ Start a new session of the given name.
 
         This method will create a new session object for the requested
@@ -192,6 +387,14 @@ class Application(object):
         name : str
             The name of the session to start.
 
+        budget : float, optional
+            If given, the session is opened incrementally with an
+            IncrementalTask which spends at most about `budget` seconds
+            per cycle of the event loop. The session is available from
+            `session` once it is fully opened and active, and reports
+            its progress through its `open_progress` attribute. The
+            default opens the session synchronously.
+
         Returns
         -------
         result : str
@@ -0,0 +1,134 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Compact storage for the bound expressions of Declarative objects.
+
+A binding table is a plain tuple whose first item is a `TableLayout`
+and whose remaining items are the values stored in the table. The
+layout maps an attribute name to the index of its value in the tuple.
+Layouts are immutable and shared: adding a name to a layout yields the
+same new layout every time, so all objects which are bound in the same
+order share the same layouts. An object with a handful of bindings
+therefore needs only a single small tuple, rather than a dict.
+
+A value of None in a table indicates that the name is not bound.
+
+"""
+
+
+class TableLayout(object):
+    """ An immutable mapping of names to indices in a binding table.
+
+    """
+    __slots__ = ('names', 'indices', '_transitions')
+
+    def __init__(self, names):
+        """ Initialize a TableLayout.
+
+        Parameters
+        ----------
+        names : tuple
+            The names stored in the table, in order of their index.
+
+        """
+        self.names = names
+        self.indices = dict((name, idx + 1) for idx, name in enumerate(names))
+        self._transitions = {}
+
+    def add(self, name):
+        """ Get the layout which results from adding a name.
+
+        Parameters
+        ----------
+        name : str
+            The name to add to the layout. It must not already exist
+            in the layout.
+
+        Returns
+        -------
+        result : TableLayout
+            The shared layout for the names of this layout followed by
+            the given name.
+
+        """
+        layout = self._transitions.get(name)
+        if layout is None:
+            layout = TableLayout(self.names + (name,))
+            self._transitions[name] = layout
+        return layout
+
+
+#: The binding table which holds no values.
+EMPTY_TABLE = (TableLayout(()),)
+
+
+def table_get(table, name):
+    """ Get the value for a name in a binding table.
+
+    Parameters
+    ----------
+    table : tuple
+        The binding table to search.
+
+    name : str
+        The name of interest.
+
+    Returns
+    -------
+    result : object or None
+        The value for the name, or None if the name is not bound.
+
+    """
+    idx = table[0].indices.get(name)
+    if idx is None:
+        return None
+    return table[idx]
+
+
+def table_set(table, name, value):
+    """ Set the value for a name in a binding table.
+
+    Parameters
+    ----------
+    table : tuple
+        The binding table to update.
+
+    name : str
+        The name to which the value should be bound.
+
+    value : object or None
+        The value to store for the name. None unbinds the name.
+
+    Returns
+    -------
+    result : tuple
+        The new binding table. The given table is not modified.
+
+    """
+    layout = table[0]
+    idx = layout.indices.get(name)
+    if idx is None:
+        return (layout.add(name),) + table[1:] + (value,)
+    return table[:idx] + (value,) + table[idx + 1:]
+
+
+def table_items(table):
+    """ Get the bound (name, value) pairs of a binding table.
+
+    Parameters
+    ----------
+    table : tuple
+        The binding table of interest.
+
+    Returns
+    -------
+    result : list
+        The list of (name, value) pairs for the bound names, in the
+        order in which the names were first bound.
+
+    """
+    return [
+        (name, value) for name, value in zip(table[0].names, table[1:])
+        if value is not None
+    ]
@@ -5,7 +5,8 @@
 from .byteplay import (
     LOAD_ATTR, LOAD_CONST, ROT_TWO, DUP_TOP, CALL_FUNCTION, POP_TOP, LOAD_FAST,
     BUILD_TUPLE, ROT_THREE, UNPACK_SEQUENCE, DUP_TOPX, BINARY_SUBSCR, GET_ITER,
-    LOAD_NAME, RETURN_VALUE
+    LOAD_NAME, RETURN_VALUE, LOAD_GLOBAL, LOAD_DEREF, BUILD_LIST, BUILD_MAP,
+    BUILD_SET, STORE_MAP, SetLineno, getse
 )
 
 
@@ -194,6 +195,120 @@ class CodeInverter(object):
         self.fail()
 
 
+#------------------------------------------------------------------------------
+# Tracing Analysis
+#------------------------------------------------------------------------------
+#: The opcodes which load a value by name.
+_NAME_LOADS = frozenset([LOAD_NAME, LOAD_GLOBAL, LOAD_FAST, LOAD_DEREF])
+
+#: The opcodes which produce a constant or a freshly built container.
+#: Such values are never traits objects and need not be traced.
+_PLAIN_VALUES = frozenset([
+    LOAD_CONST, BUILD_TUPLE, BUILD_LIST, BUILD_MAP, BUILD_SET, STORE_MAP,
+])
+
+#: The names of the builtins which return a new plain container. The
+#: results of calls to these names need not be traced when they are
+#: subscripted or iterated. This assumes the names are not shadowed.
+_PLAIN_BUILTINS = frozenset([
+    'dict', 'enumerate', 'frozenset', 'list', 'range', 'reversed', 'set',
+    'sorted', 'str', 'tuple', 'unicode', 'xrange', 'zip',
+])
+
+
+def _producer(codelist, idx, depth):
+    """ Find the op which produced a value on the stack.
+
+    This simulates the stack backwards from the given op within its
+    basic block. The search gives up if it reaches a label, a jump, or
+    an op which does not simply push the value.
+
+    Parameters
+    ----------
+    codelist : list
+        The list of byteplay code ops.
+
+    idx : int
+        The index of the op which consumes the value.
+
+    depth : int
+        The depth of the value on the stack before the op executes.
+        Zero is the top of the stack.
+
+    Returns
+    -------
+    result : int
+        The index of the op which pushed the value, or -1 if it could
+        not be determined.
+
+    """
+    for pos in xrange(idx - 1, -1, -1):
+        op, op_arg = codelist[pos]
+        if op is SetLineno:
+            continue
+        try:
+            pop, push = getse(op, op_arg)
+        except (ValueError, KeyError, TypeError):
+            return -1
+        if depth < push:
+            return pos if push == 1 else -1
+        depth += pop - push
+    return -1
+
+
+def _is_plain(codelist, pos, builtins=False):
+    """ Get whether the op at a position produces a plain value.
+
+    Parameters
+    ----------
+    codelist : list
+        The list of byteplay code ops.
+
+    pos : int
+        The index of the producing op, or -1 if it is unknown.
+
+    builtins : bool, optional
+        Whether the results of calls to the names in _PLAIN_BUILTINS
+        should be considered plain. The default is False.
+
+    """
+    if pos < 0:
+        return False
+    op, op_arg = codelist[pos]
+    if op in _PLAIN_VALUES:
+        return True
+    if builtins and op == CALL_FUNCTION:
+        n_stack_args = (op_arg & 0xFF) + 2 * ((op_arg >> 8) & 0xFF)
+        func_pos = _producer(codelist, pos, n_stack_args)
+        if func_pos >= 0:
+            func_op, func_arg = codelist[func_pos]
+            return func_op in _NAME_LOADS and func_arg in _PLAIN_BUILTINS
+    return False
+
+
+def _may_be_getattr(codelist, pos):
+    """ Get whether the op at a position may produce `getattr`.
+
+    Parameters
+    ----------
+    codelist : list
+        The list of byteplay code ops.
+
+    pos : int
+        The index of the producing op, or -1 if it is unknown.
+
+    """
+    if pos < 0:
+        return True
+    op, op_arg = codelist[pos]
+    if op in _NAME_LOADS or op == LOAD_ATTR:
+        return op_arg == 'getattr'
+    return op != LOAD_CONST
+
+
+#------------------------------------------------------------------------------
+# Code Transformers
+#------------------------------------------------------------------------------
 def inject_tracing(codelist):
     """ Inject tracing code into the given code list.
 
@@ -202,6 +317,13 @@ def inject_tracing(codelist):
     opcodes expect a fast local '_[tracer]' to be available when the
     code is executed.
 
+    Ops which can never produce a traits dependency are not traced.
+    This is determined from the op which produced the operand: calls
+    are only traced when the callable may be `getattr`, and attribute
+    loads, subscripts and iteration are not traced on constants and
+    freshly built containers. Subscripts and iteration are also not
+    traced on the results of builtins which make plain containers.
+
     Parameters
     ----------
     codelist : list
@@ -223,6 +345,8 @@ def inject_tracing(codelist):
     inserts = {}
     for idx, (op, op_arg) in enumerate(codelist):
         if op == LOAD_ATTR:
+            if _is_plain(codelist, _producer(codelist, idx, 0)):
+                continue
             code = [                        # obj
                 (DUP_TOP, None),            # obj -> obj
                 (LOAD_FAST, '_[tracer]'),   # obj -> obj -> tracer
@@ -242,6 +366,9 @@ def inject_tracing(codelist):
             # twice this number since the values on the stack alternate
             # name, value.
             n_stack_args = (op_arg & 0xFF) + 2 * ((op_arg >> 8) & 0xFF)
+            func_pos = _producer(codelist, idx, n_stack_args)
+            if not _may_be_getattr(codelist, func_pos):
+                continue
             code = [                                # func -> arg(0) -> arg(1) -> ... -> arg(n-1)
                 (BUILD_TUPLE, n_stack_args),        # func -> argtuple
                 (DUP_TOPX, 2),                      # func -> argtuple -> func -> argtuple
@@ -257,6 +384,9 @@ def inject_tracing(codelist):
             ]
             inserts[idx] = code
         elif op == BINARY_SUBSCR:
+            obj_pos = _producer(codelist, idx, 1)
+            if _is_plain(codelist, obj_pos, builtins=True):
+                continue
             code = [                            # obj -> idx
                 (DUP_TOPX, 2),                  # obj -> idx -> obj -> idx
                 (LOAD_FAST, '_[tracer]'),       # obj -> idx -> obj -> idx -> tracer
@@ -267,6 +397,9 @@ def inject_tracing(codelist):
             ]
             inserts[idx] = code
         elif op == GET_ITER:
+            obj_pos = _producer(codelist, idx, 0)
+            if _is_plain(codelist, obj_pos, builtins=True):
+                continue
             code = [                        # obj
                 (DUP_TOP, None),            # obj -> obj
                 (LOAD_FAST, '_[tracer]'),   # obj -> obj -> tracer
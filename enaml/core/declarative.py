@@ -2,10 +2,9 @@
 #  Copyright (c) 2012, Enthought, Inc.
 #  All rights reserved.
 #------------------------------------------------------------------------------
-from traits.api import (
-    Any, Property, Disallow, ReadOnly, CTrait, Instance, Uninitialized,
-)
+from traits.api import Any, Property, Disallow, ReadOnly, CTrait, Uninitialized
 
+from .binding_table import EMPTY_TABLE, table_get, table_set
 from .dynamic_scope import DynamicAttributeError
 from .object import Object
 from .operator_context import OperatorContext
@@ -87,7 +86,7 @@ def _compute_default(obj, name):
     except Exception:
         import traceback
         # XXX I'd rather not hack into Declarative's private api.
-        expr = obj._expressions[name]
+        expr = table_get(obj._expressions, name)
         filename = expr._func.func_code.co_filename
         lineno = expr._func.func_code.co_firstlineno
         args = (filename, lineno, traceback.format_exc())
@@ -213,19 +212,23 @@ class Declarative(Object):
     #: by user code.
     operators = ReadOnly
 
-    #: The dictionary of bound expression objects. XXX These dicts are
-    #: typically small and waste space. We need to switch to a more
-    #: space efficient hash table at some point in the future. For
-    #: pathological cases of large numbers of objects, the savings
-    #: can be as high as 20% of the heap size.
-    _expressions = Instance(dict, ())
+    #: The binding table of bound expression objects. Binding tables
+    #: are small tuples with a shared name layout, which use a fraction
+    #: of the space of a dict. See the `binding_table` module.
+    _expressions = Any(EMPTY_TABLE)
 
-    #: The dictionary of bound listener objects. XXX These dicts are
-    #: typically small and waste space. We need to switch to a more
-    #: space efficient hash table at some point in the future. For
-    #: pathological cases of large numbers of objects, the savings
-    #: can be as high as 20% of the heap size.
-    _listeners = Instance(dict, ())
+    #: The binding table of the lists of bound listener objects.
+    _listeners = Any(EMPTY_TABLE)
+
+    #: The binding table of the notifiers of the bound subscriptions.
+    #: The notifiers are created when the subscriptions are evaluated.
+    _subscriptions = Any(EMPTY_TABLE)
+
+    #: The identifiers dict of the scope in which the expressions bound
+    #: to this object are evaluated. The expression objects are shared
+    #: by all instances of an enamldef, so this is the only per-instance
+    #: state of most bindings. It is assigned by the operators.
+    _identifiers = Any
 
     #: A class attribute used by the Enaml compiler machinery to store
     #: the builder functions on the class. The functions are called
@@ -269,6 +272,11 @@ class Declarative(Object):
         for key, value in kwargs.iteritems():
             setattr(self, key, value)
 
+        # The builders may assign the name quietly. The name is only
+        # read on the next lookup, once the object is fully built.
+        if self._builders:
+            self._update_name_index()
+
     #--------------------------------------------------------------------------
     # Private API
     #--------------------------------------------------------------------------
@@ -356,10 +364,40 @@ class Declarative(Object):
         if curr is None or curr.trait_type is Disallow:
             msg = "Cannot bind expression. %s object has no attribute '%s'"
             raise AttributeError(msg % (self, name))
-        dct = self._expressions
-        if name not in dct:
+        table = self._expressions
+        if table_get(table, name) is None:
+            # A literal bound by a base builder is stored in the object
+            # dict, where it would take precedence over the wired trait.
+            self.__dict__.pop(name, None)
             _wire_default(self, name)
-        dct[name] = expression
+        self._expressions = table_set(table, name, expression)
+
+    def bind_literal(self, name, value):
+        """ Bind a literal default value to the given attribute name.
+
+        This method is called by the Enaml operators for `=` bindings
+        which the compiler has folded into a constant. The value is set
+        quietly and replaces any expression bound to the attribute by a
+        base builder. If the named attribute does not exist, an
+        exception is raised.
+
+        Parameters
+        ----------
+        name : string
+            The name of the attribute on which to bind the value.
+
+        value : object
+            The immutable literal value for the attribute.
+
+        """
+        curr = self._trait(name, 2)
+        if curr is None or curr.trait_type is Disallow:
+            msg = "Cannot bind literal. %s object has no attribute '%s'"
+            raise AttributeError(msg % (self, name))
+        table = self._expressions
+        if table_get(table, name) is not None:
+            self._expressions = table_set(table, name, None)
+        _set_quiet(self, name, value)
 
     def bind_listener(self, name, listener):
         """ A private method used by the Enaml execution engine.
@@ -384,12 +422,13 @@ class Declarative(Object):
         if curr is None or curr.trait_type is Disallow:
             msg = "Cannot bind listener. %s object has no attribute '%s'"
             raise AttributeError(msg % (self, name))
-        dct = self._listeners
-        if name not in dct:
-            dct[name] = [listener]
+        table = self._listeners
+        listeners = table_get(table, name)
+        if listeners is None:
+            self._listeners = table_set(table, name, [listener])
             self.add_notifier(name, ListenerNotifier)
         else:
-            dct[name].append(listener)
+            listeners.append(listener)
 
     def eval_expression(self, name):
         """ Evaluate a bound expression with the given name.
@@ -406,9 +445,9 @@ class Declarative(Object):
             if there is no expression bound to the given name.
 
         """
-        dct = self._expressions
-        if name in dct:
-            return dct[name].eval(self, name)
+        expr = table_get(self._expressions, name)
+        if expr is not None:
+            return expr.eval(self, name)
         return NotImplemented
 
     def refresh_expression(self, name):
@@ -439,8 +478,8 @@ class Declarative(Object):
             The new value to pass to the listeners.
 
         """
-        dct = self._listeners
-        if name in dct:
-            for listener in dct[name]:
+        listeners = table_get(self._listeners, name)
+        if listeners is not None:
+            for listener in listeners:
                 listener.value_changed(self, name, old, new)
 
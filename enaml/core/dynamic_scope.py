@@ -37,7 +37,7 @@ class AbstractScopeListener(object):
 
 
 #------------------------------------------------------------------------------
-# Dynamic Scope
+# Dynamic Attribute Error
 #------------------------------------------------------------------------------
 class DynamicAttributeError(AttributeError):
     """ A custom Attribute error for use with dynamic scoping.
@@ -50,6 +50,102 @@ class DynamicAttributeError(AttributeError):
     pass
 
 
+#------------------------------------------------------------------------------
+# Resolution Cache
+#------------------------------------------------------------------------------
+# The resolution cache of an object is a dict which maps a name to the
+# ancestor which provides it, or to None if no ancestor provides it. It
+# is stored on the object which owns the executing code. A cache only
+# depends on the ancestors of its object, so when an object is moved in
+# the tree, only the caches in the subtree of that object are dropped.
+def invalidate_scope_caches(obj):
+    """ Invalidate the resolution caches of an object and its subtree.
+
+    This is called automatically when an object is reparented. It must
+    be called manually if an attribute is added to an object in a way
+    which changes the resolution of a name in dynamic scope, in which
+    case it should be given the object which gained the attribute.
+
+    Parameters
+    ----------
+    obj : Object
+        The object at the root of the subtree to invalidate.
+
+    """
+    stack = [obj]
+    pop = stack.pop
+    push = stack.extend
+    while stack:
+        item = pop()
+        if item._scope_cache is not None:
+            item._scope_cache = None
+        children = item._children
+        if children:
+            push(children)
+
+
+#: A sentinel which indicates that a name is not in a resolution cache.
+_not_cached = object()
+
+
+def dynamic_lookup(obj, name):
+    """ Lookup a name by walking up the tree from an object.
+
+    The ancestor which provides the name is cached on the object, so
+    that subsequent lookups of the name, including lookups of names
+    which are not provided by any ancestor, do not walk the tree.
+
+    Parameters
+    ----------
+    obj : Object
+        The object from which to start the lookup.
+
+    name : str
+        The name of the attribute to lookup.
+
+    Returns
+    -------
+    result : (object, object)
+        The object which provides the name and the value of the name.
+
+    Raises
+    ------
+    KeyError
+        The name is not provided by any object in the tree.
+
+    """
+    cache = obj._scope_cache
+    if cache is None:
+        cache = obj._scope_cache = {}
+    else:
+        owner = cache.get(name, _not_cached)
+        if owner is None:
+            raise KeyError(name)
+        if owner is not _not_cached:
+            try:
+                return (owner, getattr(owner, name))
+            except DynamicAttributeError:
+                raise
+            except AttributeError:
+                pass
+    parent = obj
+    while parent is not None:
+        try:
+            value = getattr(parent, name)
+        except DynamicAttributeError:
+            raise
+        except AttributeError:
+            parent = parent.parent
+        else:
+            cache[name] = parent
+            return (parent, value)
+    cache[name] = None
+    raise KeyError(name)
+
+
+#------------------------------------------------------------------------------
+# Dynamic Scope
+#------------------------------------------------------------------------------
 class DynamicScope(object):
     """ A custom mapping object that implements Enaml's dynamic scope.
 
@@ -57,6 +153,11 @@ class DynamicScope(object):
     opcode is encountered in a code object which has been transformed
     by the Enaml compiler chain.
 
+    The magic name `nonlocals` is provided by the scope, unless it is
+    given in the overrides. The Nonlocals object is only created when
+    the name is accessed, so that evaluating an expression which does
+    not use it does not allocate it.
+
     Notes
     -----
     Strong references are kept to all objects passed to the constructor,
@@ -64,7 +165,9 @@ class DynamicScope(object):
     order to avoid unnecessary reference cycles.
 
     """
-    def __init__(self, obj, identifiers, overrides, listener):
+    __slots__ = ('_obj', '_identifiers', '_overrides', '_listener')
+
+    def __init__(self, obj, identifiers, overrides=None, listener=None):
         """ Initialize a DynamicScope.
 
         Parameters
@@ -75,11 +178,11 @@ class DynamicScope(object):
         identifiers : dict
             The identifiers available to the executing code.
 
-        overrides : dict
+        overrides : dict or None, optional
             A dict of objects which should have higher precedence than
             the identifiers.
 
-        listener : DynamicScopeListener or None
+        listener : DynamicScopeListener or None, optional
             A listener which should be notified when a name is loaded
             via dynamic scoping.
 
@@ -104,25 +207,18 @@ class DynamicScope(object):
 
         """
         dct = self._overrides
-        if name in dct:
+        if dct is not None and name in dct:
             return dct[name]
+        if name == 'nonlocals':
+            return Nonlocals(self._obj, self._listener)
         dct = self._identifiers
         if name in dct:
             return dct[name]
-        parent = self._obj
-        while parent is not None:
-            try:
-                value = getattr(parent, name)
-            except DynamicAttributeError:
-                raise
-            except AttributeError:
-                parent = parent.parent
-            else:
-                listener = self._listener
-                if listener is not None:
-                    listener.dynamic_load(parent, name, value)
-                return value
-        raise KeyError(name)
+        parent, value = dynamic_lookup(self._obj, name)
+        listener = self._listener
+        if listener is not None:
+            listener.dynamic_load(parent, name, value)
+        return value
 
     def __setitem__(self, name, value):
         """ Set an item in the scope.
@@ -137,6 +233,8 @@ class DynamicScope(object):
 
         """
         # This method is required for pdb to function properly.
+        if self._overrides is None:
+            self._overrides = {}
         self._overrides[name] = value
 
     def __contains__(self, name):
@@ -256,20 +354,11 @@ class Nonlocals(object):
             The named item is not contained in the nonlocals.
 
         """
-        parent = self._nls_obj
-        while parent is not None:
-            try:
-                value = getattr(parent, name)
-            except DynamicAttributeError:
-                raise
-            except AttributeError:
-                parent = parent.parent
-            else:
-                listener = self._nls_listener
-                if listener is not None:
-                    listener.dynamic_load(parent, name, value)
-                return value
-        raise KeyError(name)
+        parent, value = dynamic_lookup(self._nls_obj, name)
+        listener = self._nls_listener
+        if listener is not None:
+            listener.dynamic_load(parent, name, value)
+        return value
 
     def __setitem__(self, name, value):
         """ Sets the value of the nonlocal.
@@ -10,7 +10,7 @@ from .byteplay import (
     Code, LOAD_FAST, CALL_FUNCTION, LOAD_GLOBAL, STORE_FAST, LOAD_CONST,
     LOAD_ATTR, STORE_SUBSCR, RETURN_VALUE, POP_TOP, MAKE_FUNCTION, STORE_NAME,
     LOAD_NAME, DUP_TOP, SetLineno, BINARY_SUBSCR, STORE_ATTR, ROT_TWO,
-    DELETE_NAME, DELETE_FAST
+    DELETE_NAME, DELETE_FAST, BUILD_TUPLE
 )
 from .code_tracing import inject_tracing, inject_inversion
 
@@ -63,7 +63,24 @@ from .code_tracing import inject_tracing, inject_inversion
 # 7 : Fix bug with local deletes - 10 December 2012
 #     This fixes a bug in the locals optimization where the DELETE_NAME
 #     opcode was not being replaced with DELETE_FAST.
-COMPILER_VERSION = 7
+# 8 : Fold literal bindings - 17 October 2026
+#     This updates the compiler to detect `=` bindings whose expression
+#     is an immutable literal. Instead of generating a function for the
+#     expression, the compiler passes the constant value directly to the
+#     '__operator_Equal_Literal__' operator, which assigns it as the
+#     default value of the attribute without any expression machinery.
+# 9 : Share binding functions - 17 October 2026
+#     This updates the compiler to create the functions for the bound
+#     expressions once, when the enamldef class is created, instead of
+#     every time the builder is run. The functions are stored in a tuple
+#     which is the default value of the `_[funcs]` builder argument, so
+#     all instances of an enamldef share the same function objects.
+# 10 : Selective code tracing - 17 October 2026
+#     This updates the code tracing to skip the ops which can never
+#     produce a traits dependency: calls to callables other than
+#     `getattr`, and attribute loads, subscripts and iteration on
+#     constants, literal containers and plain builtin results.
+COMPILER_VERSION = 10
 
 
 # The Enaml compiler translates an Enaml AST into Python bytecode.
@@ -75,25 +92,28 @@ COMPILER_VERSION = 7
 #     a = '12'
 #     PushButton:
 #         id: btn
-#         text = 'clickme'
+#         text << foo.a
 #
 # The compiler generate bytecode that would corresponds to the following
 # Python code (though the function object is never assigned to a name in
 # the global namespace).
 #
-# def FooWindow(instance, identifiers, operators):
+# def FooWindow(instance, identifiers, operators, _[funcs]=<funcs>):
 #     f_globals = globals()
 #     _var_1 = instance
 #     identifiers['foo'] = _var_1
-#     op = operators['__operator_Equal__']
-#     op(_var_1, 'a', <function>, identifiers)
+#     op = operators['__operator_Equal_Literal__']
+#     op(_var_1, 'a', '12', identifiers)
 #     _var_2 = f_globals['PushButton'](_var_1)
 #     identifiers['btn'] = _var_2
-#     op = operators['__operator_Equal__']
-#     op(_var_2, 'text', <function>, identifiers)
+#     op = operators['__operator_LessLess__']
+#     op(_var_2, 'text', _[funcs][0], identifiers)
 #     return _var_1
 #
 # FooWindow = _make_enamldef_helper_('FooWindow', Window, FooWindow)
+#
+# Where <funcs> is a tuple holding a function for each bound expression
+# which is not a literal. It is created once along with the enamldef.
 
 
 #------------------------------------------------------------------------------
@@ -129,6 +149,58 @@ def update_firstlineno(code, firstlineno):
     )
 
 
+#------------------------------------------------------------------------------
+# Literal Folding
+#------------------------------------------------------------------------------
+# The names which always evaluate to a constant value.
+_LITERAL_NAMES = {'None': None, 'True': True, 'False': False}
+
+
+def _fold(node):
+    """ Fold a Python ast node into its constant value.
+
+    A ValueError is raised if the node is not an immutable literal.
+
+    """
+    if isinstance(node, (ast.Num, ast.Str)):
+        return node.n if isinstance(node, ast.Num) else node.s
+    if isinstance(node, ast.Name) and node.id in _LITERAL_NAMES:
+        return _LITERAL_NAMES[node.id]
+    if isinstance(node, ast.UnaryOp) and isinstance(node.operand, ast.Num):
+        if isinstance(node.op, ast.USub):
+            return -node.operand.n
+        if isinstance(node.op, ast.UAdd):
+            return +node.operand.n
+    if isinstance(node, ast.Tuple):
+        return tuple(_fold(elt) for elt in node.elts)
+    raise ValueError('not a literal')
+
+
+def fold_literal(py_ast):
+    """ Fold the ast of an `=` expression into a constant value.
+
+    Numbers, strings, None, True, False, signed numbers, and tuples of
+    those are considered literals. Mutable containers are never folded,
+    since every component instance must get its own copy.
+
+    Parameters
+    ----------
+    py_ast : ast.Expression
+        A Python ast Expression node.
+
+    Returns
+    -------
+    result : (bool, object)
+        A 2-tuple of whether the expression is a literal and its folded
+        value. The value is None if the expression is not a literal.
+
+    """
+    try:
+        return (True, _fold(py_ast.body))
+    except ValueError:
+        return (False, None)
+
+
 #------------------------------------------------------------------------------
 # Expression Compilers
 #------------------------------------------------------------------------------
@@ -398,7 +470,10 @@ class DeclarationCompiler(_NodeVisitor):
         """ The main entry point of the DeclarationCompiler.
 
         This compiler compiles the given Declaration node into a code
-        object for a builder function.
+        object for a builder function. The builder takes a fourth
+        argument `_[funcs]`: the tuple of functions for its bindings.
+        The tuple is made once for the enamldef and passed as the
+        default value of the argument.
 
         Parameters
         ----------
@@ -408,15 +483,23 @@ class DeclarationCompiler(_NodeVisitor):
         filename : str
             The string filename to use for the generated code objects.
 
+        Returns
+        -------
+        result : (Code, list)
+            The byteplay code for the builder function and the list of
+            code objects for the `_[funcs]` tuple. The item for a `:=`
+            binding is a 2-tuple of code objects.
+
         """
         compiler = cls(filename)
         compiler.visit(node)
         code_ops = compiler.code_ops
+        args = ['instance', 'identifiers', 'operators', '_[funcs]']
         code = Code(
-            code_ops, [], ['instance', 'identifiers', 'operators'], False,
-            False, True, node.name, filename, node.lineno, node.doc,
+            code_ops, [], args, False, False, True, node.name, filename,
+            node.lineno, node.doc,
         )
-        return code
+        return code, compiler.func_codes
 
     def __init__(self, filename):
         """ Initialize a DeclarationCompiler.
@@ -430,6 +513,7 @@ class DeclarationCompiler(_NodeVisitor):
         self.filename = filename
         self.code_ops = []
         self.extend_ops = self.code_ops.extend
+        self.func_codes = []
         self.name_gen = _var_name_generator()
         self.name_stack = []
         self.push_name = self.name_stack.append
@@ -497,47 +581,48 @@ class DeclarationCompiler(_NodeVisitor):
         """ Creates the bytecode ops for an attribute binding.
 
         This visitor handles loading and calling the appropriate
-        operator.
+        operator. An `=` binding to a literal value is folded into a
+        call to the literal operator with the constant value. Other
+        bindings load their function from the `_[funcs]` tuple, which
+        is created once for the enamldef and shared by its instances.
 
         """
         py_ast = node.binding.expr.py_ast
         op = node.binding.op
+        if op == '__operator_Equal__':
+            is_literal, value = fold_literal(py_ast)
+            if is_literal:
+                self.extend_ops([
+                    (SetLineno, node.binding.lineno),
+                    (LOAD_FAST, 'operators'),       # operators[op](obj, attr, value, identifiers)
+                    (LOAD_CONST, '__operator_Equal_Literal__'),
+                    (BINARY_SUBSCR, None),
+                    (LOAD_FAST, self.curr_name()),
+                    (LOAD_CONST, node.name),
+                    (LOAD_CONST, value),
+                    (LOAD_FAST, 'identifiers'),
+                    (CALL_FUNCTION, 0x0004),
+                    (POP_TOP, None),
+                ])
+                return
         op_compiler = COMPILE_OP_MAP[op]
         code = op_compiler(py_ast, self.filename)
-        if isinstance(code, tuple): # operator `::`
-            sub_code, upd_code = code
-            self.extend_ops([
-                (SetLineno, node.binding.lineno),
-                (LOAD_FAST, 'operators'),           # operators[op](obj, attr, sub_func, identifiers)
-                (LOAD_CONST, op),
-                (BINARY_SUBSCR, None),
-                (LOAD_FAST, self.curr_name()),
-                (LOAD_CONST, node.name),
-                (LOAD_CONST, sub_code),
-                (MAKE_FUNCTION, 0),
-                (DUP_TOP, None),
-                (LOAD_CONST, upd_code),
-                (MAKE_FUNCTION, 0),
-                (ROT_TWO, None),
-                (STORE_ATTR, '_update'),            # sub_func._update = upd_func
-                (LOAD_FAST, 'identifiers'),
-                (CALL_FUNCTION, 0x0004),
-                (POP_TOP, None),
-            ])
-        else:
-            self.extend_ops([
-                (SetLineno, node.binding.lineno),
-                (LOAD_FAST, 'operators'),           # operators[op](obj, attr, func, identifiers)
-                (LOAD_CONST, op),
-                (BINARY_SUBSCR, None),
-                (LOAD_FAST, self.curr_name()),
-                (LOAD_CONST, node.name),
-                (LOAD_CONST, code),
-                (MAKE_FUNCTION, 0),
-                (LOAD_FAST, 'identifiers'),
-                (CALL_FUNCTION, 0x0004),
-                (POP_TOP, None),
-            ])
+        index = len(self.func_codes)
+        self.func_codes.append(code)
+        self.extend_ops([
+            (SetLineno, node.binding.lineno),
+            (LOAD_FAST, 'operators'),           # operators[op](obj, attr, _[funcs][index], identifiers)
+            (LOAD_CONST, op),
+            (BINARY_SUBSCR, None),
+            (LOAD_FAST, self.curr_name()),
+            (LOAD_CONST, node.name),
+            (LOAD_FAST, '_[funcs]'),
+            (LOAD_CONST, index),
+            (BINARY_SUBSCR, None),
+            (LOAD_FAST, 'identifiers'),
+            (CALL_FUNCTION, 0x0004),
+            (POP_TOP, None),
+        ])
 
     def visit_Instantiation(self, node):
         """ Create the bytecode ops for a component instantiation.
@@ -675,14 +760,39 @@ class EnamlCompiler(_NodeVisitor):
         name = node.name
         extend_ops = self.extend_ops
         filename = self.filename
-        func_code = DeclarationCompiler.compile(node, filename)
+        func_code, func_codes = DeclarationCompiler.compile(node, filename)
         extend_ops([
             (SetLineno, node.lineno),
             (LOAD_NAME, '_make_enamldef_helper_'),  # Foo = _make_enamldef_helper_(name, base, buildfunc)
             (LOAD_CONST, name),
             (LOAD_NAME, node.base),
+        ])
+
+        # The functions for the bindings are created once here, and are
+        # shared by all instances of the enamldef. They are passed to
+        # the builder as the default value of its `_[funcs]` argument.
+        for code in func_codes:
+            if isinstance(code, tuple): # operator `:=`
+                sub_code, upd_code = code
+                extend_ops([
+                    (LOAD_CONST, sub_code),
+                    (MAKE_FUNCTION, 0),
+                    (DUP_TOP, None),
+                    (LOAD_CONST, upd_code),
+                    (MAKE_FUNCTION, 0),
+                    (ROT_TWO, None),
+                    (STORE_ATTR, '_update'),        # sub_func._update = upd_func
+                ])
+            else:
+                extend_ops([
+                    (LOAD_CONST, code),
+                    (MAKE_FUNCTION, 0),
+                ])
+
+        extend_ops([
+            (BUILD_TUPLE, len(func_codes)),
             (LOAD_CONST, func_code),
-            (MAKE_FUNCTION, 0),
+            (MAKE_FUNCTION, 1),
             (CALL_FUNCTION, 0x0003),
             (STORE_NAME, name),
         ])
@@ -0,0 +1,366 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" An opt-in profiler for the bound expressions of Enaml objects.
+
+The ExpressionProfiler is an operator context which wraps the operators
+of another context. Every expression and listener bound while it is the
+active context is wrapped in an object which records the number of
+calls, the time spent, and the last exception raised. The statistics
+are keyed by the `co_filename` and `co_firstlineno` of the compiled
+expression, so all instances of an enamldef share the same entry.
+
+The profiler only affects objects which are created while it is active.
+Objects created later by those objects, such as the children of an
+Include, inherit the profiler through their parent's operators::
+
+    profiler = ExpressionProfiler()
+    with profiler:
+        view = Main()
+    ...
+    print profiler.report()
+    profiler.dump_stats('expressions.prof')
+
+The profiler is not thread safe, and should be used from the thread
+which runs the user interface.
+
+"""
+import marshal
+import sys
+from timeit import default_timer
+
+from .abstract_expressions import AbstractExpression, AbstractListener
+from .binding_table import table_get, table_set
+from .operator_context import OperatorContext
+
+
+#: The operator symbols of the operators which are profiled.
+_SYMBOLS = {
+    '__operator_Equal__': '=',
+    '__operator_LessLess__': '<<',
+    '__operator_ColonEqual__': ':=',
+    '__operator_ColonColon__': '::',
+    '__operator_GreaterGreater__': '>>',
+}
+
+
+class ExpressionStats(object):
+    """ The statistics recorded for a bound expression.
+
+    """
+    __slots__ = (
+        'filename', 'lineno', 'label', 'calls', 'errors', 'total_time',
+        'cumulative_time', 'last_exception', 'callers',
+    )
+
+    def __init__(self, filename, lineno, label):
+        """ Initialize an ExpressionStats.
+
+        Parameters
+        ----------
+        filename : str
+            The filename of the code for the expression.
+
+        lineno : int
+            The first line number of the code for the expression.
+
+        label : str
+            The attribute name and operator of the expression.
+
+        """
+        self.filename = filename
+        self.lineno = lineno
+        self.label = label
+        self.clear()
+
+    @property
+    def key(self):
+        """ The pstats compatible key for the expression.
+
+        """
+        return (self.filename, self.lineno, self.label)
+
+    def clear(self):
+        """ Reset the statistics to their initial values.
+
+        """
+        self.calls = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.cumulative_time = 0.0
+        self.last_exception = None
+        self.callers = {}
+
+
+class ProfiledBinding(object):
+    """ A wrapper which records the statistics of a bound expression.
+
+    The wrapper implements both the AbstractExpression and the
+    AbstractListener interfaces, and forwards all other attribute
+    access to the wrapped object.
+
+    """
+    __slots__ = ('_binding', '_stats', '_profiler')
+
+    def __init__(self, binding, stats, profiler):
+        """ Initialize a ProfiledBinding.
+
+        Parameters
+        ----------
+        binding : AbstractExpression or AbstractListener
+            The expression or listener to wrap.
+
+        stats : ExpressionStats
+            The statistics object in which to record the calls.
+
+        profiler : ExpressionProfiler
+            The profiler which owns the statistics.
+
+        """
+        self._binding = binding
+        self._stats = stats
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        """ Forward attribute access to the wrapped binding.
+
+        """
+        return getattr(self._binding, name)
+
+    def _call(self, method, args):
+        """ Call a method of the wrapped binding and record the call.
+
+        The time spent in nested profiled calls is subtracted from the
+        total time of this call, but included in its cumulative time.
+
+        """
+        stats = self._stats
+        stack = self._profiler._stack
+        if stack:
+            caller = stack[-1][0].key
+            callers = stats.callers
+            callers[caller] = callers.get(caller, 0) + 1
+        frame = [stats, 0.0]
+        stack.append(frame)
+        start = default_timer()
+        try:
+            return method(*args)
+        except Exception:
+            stats.errors += 1
+            stats.last_exception = sys.exc_info()[1]
+            raise
+        finally:
+            elapsed = default_timer() - start
+            stack.pop()
+            stats.calls += 1
+            stats.cumulative_time += elapsed
+            stats.total_time += elapsed - frame[1]
+            if stack:
+                stack[-1][1] += elapsed
+
+    def eval(self, owner, name):
+        """ Evaluate the wrapped expression.
+
+        """
+        return self._call(self._binding.eval, (owner, name))
+
+    def value_changed(self, owner, name, old, new):
+        """ Run the wrapped listener.
+
+        """
+        args = (owner, name, old, new)
+        self._call(self._binding.value_changed, args)
+
+
+AbstractExpression.register(ProfiledBinding)
+AbstractListener.register(ProfiledBinding)
+
+
+def _profiled_operator(profiler, op, symbol):
+    """ Create an operator which profiles the bindings of another.
+
+    Parameters
+    ----------
+    profiler : ExpressionProfiler
+        The profiler which records the statistics.
+
+    op : callable
+        The operator to wrap.
+
+    symbol : str
+        The symbol of the wrapped operator.
+
+    """
+    def op_profiled(obj, name, func, identifiers):
+        expr = table_get(obj._expressions, name)
+        listeners = table_get(obj._listeners, name)
+        count = len(listeners) if listeners else 0
+        op(obj, name, func, identifiers)
+
+        new_expr = table_get(obj._expressions, name)
+        if new_expr is not None and new_expr is not expr:
+            stats = profiler.stats_for(func, '%s %s' % (name, symbol))
+            wrapper = ProfiledBinding(new_expr, stats, profiler)
+            obj._expressions = table_set(obj._expressions, name, wrapper)
+
+        listeners = table_get(obj._listeners, name)
+        if listeners and len(listeners) > count:
+            # The listener of a `:=` binding runs the update function.
+            code_func = getattr(func, '_update', func)
+            label = '%s %s' % (name, '>>' if symbol == ':=' else symbol)
+            stats = profiler.stats_for(code_func, label)
+            for idx in xrange(count, len(listeners)):
+                listeners[idx] = ProfiledBinding(
+                    listeners[idx], stats, profiler
+                )
+    return op_profiled
+
+
+class ExpressionProfiler(OperatorContext):
+    """ An operator context which profiles the bound expressions.
+
+    """
+    def __init__(self, context=None):
+        """ Initialize an ExpressionProfiler.
+
+        Parameters
+        ----------
+        context : OperatorContext, optional
+            The context which provides the operators to profile. The
+            default is the default operator context.
+
+        """
+        if context is None:
+            context = OperatorContext.default_context()
+        super(ExpressionProfiler, self).__init__(context)
+        for key, symbol in _SYMBOLS.iteritems():
+            if key in context:
+                self[key] = _profiled_operator(self, context[key], symbol)
+        self._stats = {}
+        self._stack = []
+
+    def __enter__(self):
+        """ Push the profiler onto the active context stack.
+
+        Returns
+        -------
+        result : ExpressionProfiler
+            This profiler, for use in a `with` statement.
+
+        """
+        super(ExpressionProfiler, self).__enter__()
+        return self
+
+    def stats_for(self, func, label):
+        """ Get the statistics object for an expression function.
+
+        Parameters
+        ----------
+        func : types.FunctionType
+            The function compiled for the expression.
+
+        label : str
+            The attribute name and operator of the expression.
+
+        Returns
+        -------
+        result : ExpressionStats
+            The shared statistics for the code of the function.
+
+        """
+        code = func.func_code
+        key = (code.co_filename, code.co_firstlineno, label)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = ExpressionStats(*key)
+        return stats
+
+    def stats(self, sort='cumulative'):
+        """ Get the statistics of the expressions which have run.
+
+        Parameters
+        ----------
+        sort : str, optional
+            The field by which to sort the results in descending order.
+            One of 'cumulative', 'time', 'calls' or 'errors'. The
+            default is 'cumulative'.
+
+        Returns
+        -------
+        result : list
+            The list of ExpressionStats with at least one call.
+
+        """
+        attrs = {
+            'cumulative': 'cumulative_time', 'time': 'total_time',
+            'calls': 'calls', 'errors': 'errors',
+        }
+        if sort not in attrs:
+            raise ValueError("invalid sort key '%s'" % sort)
+        attr = attrs[sort]
+        items = [stats for stats in self._stats.itervalues() if stats.calls]
+        items.sort(key=lambda stats: getattr(stats, attr), reverse=True)
+        return items
+
+    def clear(self):
+        """ Reset the statistics of all the expressions.
+
+        """
+        for stats in self._stats.itervalues():
+            stats.clear()
+
+    def report(self, sort='cumulative', limit=None):
+        """ Create a text report of the expression statistics.
+
+        Parameters
+        ----------
+        sort : str, optional
+            The field by which to sort the report. See `stats`.
+
+        limit : int, optional
+            The maximum number of expressions in the report. The default
+            includes all of the expressions which have run.
+
+        Returns
+        -------
+        result : str
+            The formatted report.
+
+        """
+        items = self.stats(sort)
+        if limit is not None:
+            items = items[:limit]
+        lines = ['%9s %7s %10s %10s  %s' % (
+            'calls', 'errors', 'tottime', 'cumtime', 'expression'
+        )]
+        for stats in items:
+            location = '%s:%d(%s)' % stats.key
+            lines.append('%9d %7d %10.6f %10.6f  %s' % (
+                stats.calls, stats.errors, stats.total_time,
+                stats.cumulative_time, location,
+            ))
+            if stats.last_exception is not None:
+                exc = stats.last_exception
+                lines.append('%39s%s: %s' % (
+                    '', type(exc).__name__, exc
+                ))
+        return '\n'.join(lines)
+
+    def dump_stats(self, filename):
+        """ Write the statistics to a file readable by `pstats`.
+
+        Parameters
+        ----------
+        filename : str
+            The path of the file to write.
+
+        """
+        data = {}
+        for stats in self.stats():
+            data[stats.key] = (
+                stats.calls, stats.calls, stats.total_time,
+                stats.cumulative_time, dict(stats.callers),
+            )
+        with open(filename, 'wb') as f:
+            marshal.dump(data, f)
@@ -3,14 +3,18 @@
 #  All rights reserved.
 #------------------------------------------------------------------------------
 from collections import namedtuple
+from itertools import izip
 from weakref import ref
 
 from traits.api import HasTraits, Disallow, TraitListObject, TraitDictObject
 
 from .abstract_expressions import AbstractExpression, AbstractListener
+from .binding_table import table_get, table_set
 from .code_tracing import CodeTracer, CodeInverter
 from .dynamic_scope import DynamicScope, AbstractScopeListener, Nonlocals
 from .funchelper import call_func
+from .operator_context import OperatorContext
+from .refresh_queue import refresh_queue
 
 
 #------------------------------------------------------------------------------
@@ -185,16 +189,74 @@ class StandardInverter(CodeInverter):
         obj[idx] = value
 
 
+#------------------------------------------------------------------------------
+# Evaluation Helpers
+#------------------------------------------------------------------------------
+# The expressions below evaluate their functions on a fast path which
+# avoids per-call allocations where possible: the scope creates the
+# nonlocals on demand, the operator context is pushed directly onto the
+# context stack instead of entering it as a context manager, a shared
+# empty keywords dict is passed to `call_func`, and the tracers used by
+# subscription expressions are pooled.
+
+#: The stack of active operator contexts.
+_context_stack = OperatorContext._stack_
+
+#: The empty keywords dict passed to `call_func`. It is never modified.
+_no_kwargs = {}
+
+#: The pool of idle tracers for subscription expressions. A tracer is
+#: taken from the pool for the duration of an evaluation, so nested
+#: evaluations each use their own tracer.
+_tracer_pool = []
+
+
 #------------------------------------------------------------------------------
 # Base Expression
 #------------------------------------------------------------------------------
+def shared_expression(kind, func):
+    """ Get the expression of a kind which is shared for a function.
+
+    The functions of the bindings of an enamldef are created once and
+    shared by all of its instances. The expression for a function is
+    created on first use and stored in the function dict, keyed on the
+    expression class, so the instances share the expression as well.
+    A shared expression evaluates in the identifiers of its owner.
+
+    Parameters
+    ----------
+    kind : type
+        The BaseExpression subclass of the expression.
+
+    func : types.FunctionType
+        The function of the binding.
+
+    Returns
+    -------
+    result : BaseExpression
+        The shared expression of the given kind for the function.
+
+    """
+    cache = func.__dict__
+    expr = cache.get(kind)
+    if expr is None:
+        expr = cache[kind] = kind(func)
+    return expr
+
+
 class BaseExpression(object):
     """ The base class of the standard Enaml expression classes.
 
+    An expression holds only the immutable part of a binding, so that
+    it can be shared by all instances of an enamldef. The state which
+    is specific to an instance lives on the owner of the expression:
+    the `_identifiers` dict of the owner, and the notifier of a
+    subscription in the `_subscriptions` table of the owner.
+
     """
     __slots__ = ('_func', '_f_locals')
 
-    def __init__(self, func, f_locals):
+    def __init__(self, func, f_locals=None):
         """ Initialize a BaseExpression.
 
         Parameters
@@ -204,13 +266,26 @@ class BaseExpression(object):
             has been patched to support the semantics required of the
             expression.
 
-        f_locals : dict
-            The dictionary of local identifiers for the function.
+        f_locals : dict, optional
+            The dictionary of local identifiers for the function. The
+            default is None, in which case the identifiers of the
+            owner are used. A dict is only given for a binding made in
+            a scope other than that of the owner, for example when the
+            enclosing enamldef binds an attribute on a child enamldef.
 
         """
         self._func = func
         self._f_locals = f_locals
 
+    def _scope_locals(self, owner):
+        """ Get the identifiers in which to evaluate the function.
+
+        """
+        f_locals = self._f_locals
+        if f_locals is None:
+            return owner._identifiers
+        return f_locals
+
 
 #------------------------------------------------------------------------------
 # Simple Expression
@@ -228,10 +303,14 @@ class SimpleExpression(BaseExpression):
         """ Evaluate and return the expression value.
 
         """
-        overrides = {'nonlocals': Nonlocals(owner, None)}
-        scope = DynamicScope(owner, self._f_locals, overrides, None)
-        with owner.operators:
-            return call_func(self._func, (), {}, scope)
+        f_locals = self._scope_locals(owner)
+        scope = DynamicScope(owner, f_locals)
+        stack = _context_stack
+        stack.append(owner.operators)
+        try:
+            return call_func(self._func, (), _no_kwargs, scope)
+        finally:
+            stack.pop()
 
 
 AbstractExpression.register(SimpleExpression)
@@ -256,13 +335,15 @@ class NotificationExpression(BaseExpression):
         """ Called when the attribute on the owner has changed.
 
         """
-        overrides = {
-            'event': NotificationEvent(owner, name, old, new),
-            'nonlocals': Nonlocals(owner, None),
-        }
-        scope = DynamicScope(owner, self._f_locals, overrides, None)
-        with owner.operators:
-            call_func(self._func, (), {}, scope)
+        overrides = {'event': NotificationEvent(owner, name, old, new)}
+        f_locals = self._scope_locals(owner)
+        scope = DynamicScope(owner, f_locals, overrides)
+        stack = _context_stack
+        stack.append(owner.operators)
+        try:
+            call_func(self._func, (), _no_kwargs, scope)
+        finally:
+            stack.pop()
 
 
 AbstractListener.register(NotificationExpression)
@@ -287,7 +368,8 @@ class UpdateExpression(BaseExpression):
         nonlocals = Nonlocals(owner, None)
         overrides = {'nonlocals': nonlocals}
         inverter = StandardInverter(nonlocals)
-        scope = DynamicScope(owner, self._f_locals, overrides, None)
+        f_locals = self._scope_locals(owner)
+        scope = DynamicScope(owner, f_locals, overrides, None)
         with owner.operators:
             call_func(self._func, (inverter, new), {}, scope)
 
@@ -298,13 +380,58 @@ AbstractListener.register(UpdateExpression)
 #------------------------------------------------------------------------------
 # Subcsription Expression
 #------------------------------------------------------------------------------
+def _subscription_notifier(obj, name):
+    """ Get the notifier of a subscription bound to an attribute.
+
+    Parameters
+    ----------
+    obj : HasTraits
+        The object which owns the attribute.
+
+    name : str
+        The name of the attribute.
+
+    Returns
+    -------
+    result : SubscriptionNotifier or None
+        The notifier of the subscription expression bound to the
+        attribute, or None if there is no such expression or it has
+        not yet been evaluated.
+
+    """
+    # The table is read from the instance dict so that objects which
+    # are not Declarative, or which have no subscriptions, are skipped.
+    table = obj.__dict__.get('_subscriptions')
+    if table is None:
+        return None
+    return table_get(table, name)
+
+
 class SubscriptionNotifier(object):
     """ A simple object used for attaching notification handlers.
 
+    The notifier keeps track of the traits items to which its handler
+    is connected, so that a change in the dependencies of an expression
+    is applied incrementally: handlers are removed from the items which
+    are no longer traced, and only the new items are connected.
+
+    The rank of the notifier is its depth in the graph of subscription
+    expressions: one more than the highest rank of the expressions on
+    which it depends. The refresh queue uses the rank to refresh the
+    expressions in topological order.
+
     """
-    __slots__ = ('owner', 'name', 'keyval', '__weakref__')
+    __slots__ = ('owner', 'name', 'keyval', 'refs', 'rank', '__weakref__')
+
+    #: The total number of handlers connected by all notifiers. This is
+    #: intended for use by tests and diagnostics.
+    connected = 0
+
+    #: The total number of handlers disconnected by all notifiers. This
+    #: is intended for use by tests and diagnostics.
+    disconnected = 0
 
-    def __init__(self, owner, name, keyval):
+    def __init__(self, owner, name):
         """ Initialize a SubscriptionNotifier.
 
         Parameters
@@ -315,35 +442,99 @@ class SubscriptionNotifier(object):
         name : str
             The name to which the expression is bound.
 
-        keyval : object
-            An object to use for testing equivalency of notifiers.
-
         """
         self.owner = ref(owner)
         self.name = name
-        self.keyval = keyval
+        self.keyval = ()
+        self.refs = ()
+        self.rank = 0
 
     def notify(self):
         """ Notify that the expression is invalid.
 
+        The expression is refreshed immediately, unless the refresh
+        queue accepts it for a later refresh.
+
+        """
+        if not refresh_queue().enqueue(self):
+            self.refresh()
+
+    def refresh(self):
+        """ Refresh the expression on its owner.
+
         """
         owner = self.owner()
         if owner is not None:
             owner.refresh_expression(self.name)
 
+    def update(self, traced):
+        """ Update the connected handlers for a new set of dependencies.
+
+        Parameters
+        ----------
+        traced : set
+            The set of (obj, name) pairs of the traits items on which
+            the expression now depends.
+
+        """
+        # In most cases, the objects comprising the dependencies of an
+        # expression will not change during subsequent evaluations of
+        # the expression. A key for the dependencies is computed and the
+        # handlers are updated only when the key changes. The key uses
+        # the id of an object instead of the object itself so strong
+        # references to the object are not maintained by the notifier.
+        # A sorted tuple is used instead of a frozenset to reduced the
+        # memory footprint. It is slightly slower to compute but ~5x
+        # smaller. The weakrefs guard against a reused id and allow the
+        # handlers of stale dependencies to be removed.
+        items = sorted(((id(obj), attr), obj) for obj, attr in traced)
+        keyval = tuple(key for key, _ in items)
+        refs = self.refs
+        if keyval == self.keyval:
+            for wr, (_, obj) in izip(refs, items):
+                if wr() is not obj:
+                    break
+            else:
+                return
+
+        handler = self.notify
+        stale = dict(izip(self.keyval, refs))
+        new_refs = []
+        connected = 0
+        for key, obj in items:
+            wr = stale.pop(key, None)
+            # An id can only be reused once the old object is dead, in
+            # which case there is no handler left to remove.
+            if wr is None or wr() is not obj:
+                obj.on_trait_change(handler, key[1])
+                connected += 1
+                wr = ref(obj)
+            new_refs.append(wr)
+
+        disconnected = 0
+        for key, wr in stale.iteritems():
+            obj = wr()
+            if obj is not None:
+                obj.on_trait_change(handler, key[1], remove=True)
+                disconnected += 1
+
+        self.keyval = keyval
+        self.refs = tuple(new_refs)
+        rank = 0
+        for (_, attr), obj in items:
+            upstream = _subscription_notifier(obj, attr)
+            if upstream is not None and upstream.rank >= rank:
+                rank = upstream.rank + 1
+        self.rank = rank
+        SubscriptionNotifier.connected += connected
+        SubscriptionNotifier.disconnected += disconnected
+
 
 class SubscriptionExpression(BaseExpression):
     """ An implementation of AbstractExpression for the `<<` operator.
 
     """
-    __slots__ = ('_notifier')
-
-    def __init__(self, func, f_locals):
-        """ Initialize a SubscriptionExpression.
-
-        """
-        super(SubscriptionExpression, self).__init__(func, f_locals)
-        self._notifier = None
+    __slots__ = ()
 
     #--------------------------------------------------------------------------
     # AbstractExpression Interface
@@ -352,31 +543,31 @@ class SubscriptionExpression(BaseExpression):
         """ Evaluate and return the expression value.
 
         """
-        tracer = TraitsTracer()
-        overrides = {'nonlocals': Nonlocals(owner, tracer)}
-        scope = DynamicScope(owner, self._f_locals, overrides, tracer)
-        with owner.operators:
-            result = call_func(self._func, (tracer,), {}, scope)
-
-        # In most cases, the objects comprising the dependencies of an
-        # expression will not change during subsequent evaluations of
-        # the expression. Rather than creating a new notifier on each
-        # pass and repeating the work of creating the change handlers,
-        # a key for the dependencies is computed and a new notifier is
-        # created only when the key changes. The key uses the id of an
-        # object instead of the object itself so strong references to
-        # the object are not maintained by the expression. A sorted
-        # tuple is used instead of a frozenset to reduced the memory
-        # footprint. It is slightly slower to compute but ~5x smaller.
+        pool = _tracer_pool
+        tracer = pool.pop() if pool else TraitsTracer()
         traced = tracer.traced_items
-        keyval = tuple(sorted((id(obj), attr) for obj, attr in traced))
-        notifier = self._notifier
-        if notifier is None or keyval != notifier.keyval:
-            notifier = SubscriptionNotifier(owner, name, keyval)
-            self._notifier = notifier
-            handler = notifier.notify
-            for obj, attr in traced:
-                obj.on_trait_change(handler, attr)
+        try:
+            f_locals = self._scope_locals(owner)
+            scope = DynamicScope(owner, f_locals, None, tracer)
+            stack = _context_stack
+            stack.append(owner.operators)
+            try:
+                result = call_func(self._func, (tracer,), _no_kwargs, scope)
+            finally:
+                stack.pop()
+
+            # A single notifier is used for each subscribed attribute of
+            # the owner. It connects and disconnects handlers as the
+            # dependencies of the expression change between evaluations.
+            table = owner._subscriptions
+            notifier = table_get(table, name)
+            if notifier is None:
+                notifier = SubscriptionNotifier(owner, name)
+                owner._subscriptions = table_set(table, name, notifier)
+            notifier.update(traced)
+        finally:
+            traced.clear()
+            pool.append(tracer)
 
         return result
 
@@ -403,7 +594,8 @@ class DelegationExpression(SubscriptionExpression):
         nonlocals = Nonlocals(owner, None)
         inverter = StandardInverter(nonlocals)
         overrides = {'nonlocals': nonlocals}
-        scope = DynamicScope(owner, self._f_locals, overrides, None)
+        f_locals = self._scope_locals(owner)
+        scope = DynamicScope(owner, f_locals, overrides, None)
         with owner.operators:
             call_func(self._func._update, (inverter, new), {}, scope)
 
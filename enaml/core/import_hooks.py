@@ -4,12 +4,16 @@
 #------------------------------------------------------------------------------
 from abc import ABCMeta, abstractmethod
 from collections import defaultdict, namedtuple
+import errno
+import hashlib
 import imp
 import marshal
 import os
+import random
 import struct
 import sys
 import types
+import zipfile
 
 from .enaml_compiler import EnamlCompiler, COMPILER_VERSION
 from .parser import parse
@@ -17,21 +21,58 @@ from .parser import parse
 from ..utils import abstractclassmethod
 
 
+# Increment this number whenever the layout of the .enamlc files changes.
+# It is part of the cache file names, so files written in an older layout
+# are never read by a newer importer.
+#
+# Version History
+# ---------------
+# 1 : Initial cache layout
+#     A 4-byte magic number and a 4-byte source modification time,
+#     followed by the marshalled code object.
+# 2 : Add a source content hash - 17 October 2012
+#     The modification time is followed by the 20-byte sha1 digest of
+#     the source, which allows the cache to be validated by content
+#     when timestamps are unreliable (copied or relocated installs).
+CACHE_VERSION = 2
+
+
 # The magic number as symbols for the current Python interpreter. These
 # define the naming scheme used when create cached files and directories.
 MAGIC = imp.get_magic()
 try:
-    MAGIC_TAG = 'enaml-py%s%s-cv%s' % (
+    MAGIC_TAG = 'enaml-py%s%s-cv%s-cf%s' % (
         sys.version_info.major, sys.version_info.minor, COMPILER_VERSION,
+        CACHE_VERSION,
     )
 except AttributeError: 
     # Python 2.6 compatibility
-    MAGIC_TAG = 'enaml-py%s%s-cv%s' % (
+    MAGIC_TAG = 'enaml-py%s%s-cv%s-cf%s' % (
         sys.version_info[0], sys.version_info[1], COMPILER_VERSION,
+        CACHE_VERSION,
     )
 CACHEDIR = '__enamlcache__'
 
 
+# The header of a cache file: the magic number, the source modification
+# time and the sha1 digest of the source.
+HEADER = struct.Struct('<4si20s')
+
+
+# The environment variable which, when set, redirects the cache files to
+# a tree rooted at the given directory instead of the source directories.
+# This allows read-only installs to still benefit from cached bytecode.
+CACHE_DIR_ENV = 'ENAML_CACHE_DIR'
+
+
+# The environment variable which selects how cache files are validated.
+# The default 'timestamp' mode trusts a cache which is newer than its
+# source and falls back to comparing the content hash. The 'hash' mode
+# always compares the content hash, which is required when timestamps
+# can't be trusted (e.g. normalized by a build system).
+CACHE_MODE_ENV = 'ENAML_CACHE_MODE'
+
+
 #------------------------------------------------------------------------------
 # Import Helpers
 #------------------------------------------------------------------------------
@@ -41,6 +82,10 @@ EnamlFileInfo = namedtuple('EnamlFileInfo', 'src_path, cache_path, cache_dir')
 def make_file_info(src_path):
     """ Create an EnamlFileInfo object for the given src_path.
 
+    If the `ENAML_CACHE_DIR` environment variable is set, the cache
+    directory is located under that root by mirroring the absolute
+    path of the source directory.
+
     Parameters
     ----------
     src_path : string
@@ -54,12 +99,106 @@ def make_file_info(src_path):
     """
     root, tail = os.path.split(src_path)
     fnroot, _ = os.path.splitext(tail)
-    cache_dir = os.path.join(root, CACHEDIR)
+    cache_root = os.environ.get(CACHE_DIR_ENV)
+    if cache_root:
+        drive, rest = os.path.splitdrive(os.path.abspath(root))
+        parts = [cache_root]
+        if drive:
+            parts.append(drive.rstrip(':'))
+        parts.append(rest.lstrip(os.sep))
+        cache_dir = os.path.join(os.path.join(*parts), CACHEDIR)
+    else:
+        cache_dir = os.path.join(root, CACHEDIR)
     fn = ''.join((fnroot, '.', MAGIC_TAG, os.path.extsep, 'enamlc'))
     cache_path = os.path.join(cache_dir, fn)
     return EnamlFileInfo(src_path, cache_path, cache_dir)
 
 
+def source_digest(src):
+    """ Compute the content hash used to validate a cache file.
+
+    Parameters
+    ----------
+    src : str
+        The raw contents of the .enaml source file.
+
+    Returns
+    -------
+    result : str
+        The 20-byte sha1 digest of the source.
+
+    """
+    return hashlib.sha1(src).digest()
+
+
+def hash_validation():
+    """ Returns True if cache files should always be validated by the
+    content hash of their source, False otherwise.
+
+    """
+    return os.environ.get(CACHE_MODE_ENV, 'timestamp') == 'hash'
+
+
+def pack_cache(code, ts, digest):
+    """ Pack a code object into the bytes of a cache file.
+
+    Parameters
+    ----------
+    code : types.CodeType
+        The code object to write to the cache.
+
+    ts : int
+        The integer modification time of the source.
+
+    digest : str
+        The content hash of the source.
+
+    Returns
+    -------
+    result : str
+        The bytes of the cache file.
+
+    """
+    return HEADER.pack(MAGIC, ts, digest) + marshal.dumps(code)
+
+
+def unpack_cache_header(data):
+    """ Unpack the header from the bytes of a cache file.
+
+    Parameters
+    ----------
+    data : str
+        The bytes of the cache file, or at least its header.
+
+    Returns
+    -------
+    result : (magic, timestamp, digest)
+        The magic string, integer timestamp and content hash, or
+        (None, 0, None) if the data is too short to hold a header.
+
+    """
+    if len(data) < HEADER.size:
+        return (None, 0, None)
+    return HEADER.unpack(data[:HEADER.size])
+
+
+def _replace(src, dst):
+    """ Rename src to dst, replacing dst if it exists.
+
+    On POSIX this is atomic. Windows refuses to rename over an existing
+    file, so the destination is removed first; a concurrent reader can
+    then only ever see a missing file, never a partial one.
+
+    """
+    try:
+        os.rename(src, dst)
+    except OSError:
+        if not os.path.exists(dst):
+            raise
+        os.remove(dst)
+        os.rename(src, dst)
+
+
 #------------------------------------------------------------------------------
 # Abstract Enaml Importer
 #------------------------------------------------------------------------------
@@ -261,14 +400,18 @@ class EnamlImporter(AbstractEnamlImporter):
 
         """
         with open(file_info.cache_path, 'rb') as cache_file:
-            cache_file.read(8)
+            cache_file.read(HEADER.size)
             code = marshal.load(cache_file)
         return code
 
-    def _write_cache(self, code, ts, file_info):
+    def _write_cache(self, code, ts, digest, file_info):
         """ Write the cached file for then given info, creating the 
         cache directory if needed. This call will suppress any 
         IOError or OSError exceptions.
+
+        The file is written to a temporary file in the cache directory
+        and then renamed into place, so concurrent importers will never
+        load a partially written cache file.
         
         Parameters
         ----------
@@ -277,20 +420,48 @@ class EnamlImporter(AbstractEnamlImporter):
         
         ts : int
             The integer timestamp for the file.
+
+        digest : str
+            The content hash of the source which generated the code.
         
         file_info : EnamlFileInfo
             The file info object for the file.
+
+        Returns
+        -------
+        result : bool
+            True if the cache file was written, False otherwise.
         
         """
+        data = pack_cache(code, ts, digest)
+        cache_dir = file_info.cache_dir
         try:
-            if not os.path.exists(file_info.cache_dir):
-                os.mkdir(file_info.cache_dir)
-            with open(file_info.cache_path, 'w+b') as cache_file:
-                cache_file.write(MAGIC)
-                cache_file.write(struct.pack('i', ts))
-                marshal.dump(code, cache_file)
+            if not os.path.isdir(cache_dir):
+                try:
+                    os.makedirs(cache_dir)
+                except OSError as exc:
+                    # Another process may have won the race.
+                    if exc.errno != errno.EEXIST:
+                        raise
+            tmp_path = '%s.%d.%x.tmp' % (
+                file_info.cache_path, os.getpid(), random.getrandbits(32),
+            )
+            flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY
+            flags |= getattr(os, 'O_BINARY', 0)
+            fd = os.open(tmp_path, flags, 0666)
+            try:
+                with os.fdopen(fd, 'wb') as cache_file:
+                    cache_file.write(data)
+                _replace(tmp_path, file_info.cache_path)
+            except (OSError, IOError):
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
         except (OSError, IOError):
-            pass
+            return False
+        return True
 
     def _get_magic_info(self, file_info):
         """ Loads and returns the magic info for the given path.
@@ -302,14 +473,64 @@ class EnamlImporter(AbstractEnamlImporter):
         
         Returns
         -------
-        result : (magic, timestamp)
-            The magic string and integer timestamp for the file.
+        result : (magic, timestamp, digest)
+            The magic string, integer timestamp and source content
+            hash for the file.
 
         """
         with open(file_info.cache_path, 'rb') as cache_file:
-            magic = cache_file.read(4)
-            timestamp = struct.unpack('i', cache_file.read(4))[0]
-        return (magic, timestamp)
+            header = cache_file.read(HEADER.size)
+        return unpack_cache_header(header)
+
+    def _is_cache_current(self, file_info, src_mod_time):
+        """ Returns whether the cache file for the given info exists and
+        is valid for the given source.
+
+        Parameters
+        ----------
+        file_info : EnamlFileInfo
+            The file info object for the file.
+
+        src_mod_time : int
+            The integer modification time of the source file.
+
+        Returns
+        -------
+        result : bool
+            True if the cached file can be used in place of the source.
+
+        """
+        if not os.path.exists(file_info.cache_path):
+            return False
+        magic, ts, digest = self._get_magic_info(file_info)
+        if magic != MAGIC:
+            return False
+        if not hash_validation() and src_mod_time <= ts:
+            return True
+        with open(file_info.src_path, 'rb') as src_file:
+            src = src_file.read()
+        return digest == source_digest(src)
+
+    def _compile_source(self, file_info):
+        """ Parse and compile the source file for the given info.
+
+        Parameters
+        ----------
+        file_info : EnamlFileInfo
+            The file info object for the file.
+
+        Returns
+        -------
+        result : (code, digest)
+            The compiled code object for the Enaml module and the
+            content hash of the source which was compiled.
+
+        """
+        with open(file_info.src_path, 'rb') as src_file:
+            src = src_file.read()
+        ast = parse(src.replace('\r\n', '\n'), filename=file_info.src_path)
+        code = EnamlCompiler.compile(ast, file_info.src_path)
+        return (code, source_digest(src))
 
     def get_code(self):
         """ Loads and returns the code object for the Enaml module and
@@ -335,21 +556,222 @@ class EnamlImporter(AbstractEnamlImporter):
 
         # Use the cached file if it exists and is current
         src_mod_time = int(os.path.getmtime(file_info.src_path))
-        if os.path.exists(file_info.cache_path):
-            magic, ts = self._get_magic_info(file_info)
-            if magic == MAGIC and src_mod_time <= ts:
-                code = self._load_cache(file_info)
-                return (code, file_info.src_path)
+        if self._is_cache_current(file_info, src_mod_time):
+            code = self._load_cache(file_info)
+            return (code, file_info.src_path)
 
         # Otherwise, compile from source and attempt to cache
-        with open(file_info.src_path) as src_file:
-            src = src_file.read()
-        ast = parse(src)
-        code = EnamlCompiler.compile(ast, file_info.src_path)
-        self._write_cache(code, src_mod_time, file_info)
+        code, digest = self._compile_source(file_info)
+        self._write_cache(code, src_mod_time, digest, file_info)
         return (code, file_info.src_path)
 
 
+#------------------------------------------------------------------------------
+# Zip Archive Enaml Importer
+#------------------------------------------------------------------------------
+class EnamlZipImporter(AbstractEnamlImporter):
+    """ An importer which imports Enaml modules from zip archives.
+
+    This importer locates .enaml modules inside zip archives which are
+    on sys.path, or inside packages which were themselves imported from
+    a zip archive. If the archive contains a current .enamlc file for a
+    module (for example, produced by the `enaml-compile` tool before the
+    archive was built), the embedded bytecode is used. Otherwise, the
+    module is compiled from the archived source; nothing is ever written
+    back to the archive.
+
+    The directory of each archive is read once and cached, so locating
+    a module requires no filesystem access after the first import from
+    an archive. Call `invalidate_caches` if an archive is modified.
+
+    This importer is not enabled by default. It can be enabled with
+    `imports.add_importer(EnamlZipImporter)`.
+
+    """
+    #: A mapping of sys.path or __path__ entry to the tuple of
+    #: (archive path, prefix in archive) or None if the entry does not
+    #: refer to a location inside a zip archive.
+    _path_entries = {}
+
+    #: A mapping of archive path to the tuple of (ZipFile, set of the
+    #: names in the archive).
+    _archives = {}
+
+    @classmethod
+    def invalidate_caches(cls):
+        """ Clear the cached archive and path entry information.
+
+        """
+        for zfile, names in cls._archives.itervalues():
+            zfile.close()
+        cls._archives.clear()
+        cls._path_entries.clear()
+
+    @classmethod
+    def _split_entry(cls, entry):
+        """ Split a path entry into an archive path and a prefix.
+
+        Parameters
+        ----------
+        entry : str
+            The sys.path or __path__ entry to split.
+
+        Returns
+        -------
+        result : (str, str) or None
+            The path to the zip archive and the prefix of the entry in
+            the archive, or None if the entry is not in an archive.
+
+        """
+        if not entry or os.path.isdir(entry):
+            return None
+        path = entry
+        parts = []
+        while not os.path.isfile(path):
+            head, tail = os.path.split(path)
+            if not tail or head == path:
+                return None
+            parts.append(tail)
+            path = head
+        if not zipfile.is_zipfile(path):
+            return None
+        prefix = ''.join(part + '/' for part in reversed(parts))
+        return (path, prefix)
+
+    @classmethod
+    def _archive_info(cls, entry):
+        """ Get the cached archive information for a path entry.
+
+        Parameters
+        ----------
+        entry : str
+            The sys.path or __path__ entry to lookup.
+
+        Returns
+        -------
+        result : (str, str, set) or None
+            The archive path, the prefix in the archive, and the set
+            of names in the archive, or None if the entry does not
+            refer to a location inside a zip archive.
+
+        """
+        entries = cls._path_entries
+        if entry in entries:
+            split = entries[entry]
+        else:
+            split = entries[entry] = cls._split_entry(entry)
+        if split is None:
+            return None
+        archive, prefix = split
+        archives = cls._archives
+        if archive not in archives:
+            zfile = zipfile.ZipFile(archive)
+            archives[archive] = (zfile, set(zfile.namelist()))
+        return (archive, prefix, archives[archive][1])
+
+    @classmethod
+    def locate_module(cls, fullname, path=None):
+        """ Searches for the given Enaml module and returns an instance 
+        of this class on success.
+
+        Paramters
+        ---------
+        fullname : string
+            The fully qualified name of the module.
+        
+        path : list or None
+            The subpackage __path__ for submodules and subpackages
+            or None if a top-level module.
+
+        Returns
+        -------
+        results : Instance(AbstractEnamlImporter) or None
+            If the Enaml module is located an instance of the importer
+            that will perform the rest of the operations is returned. 
+            Otherwise, returns None.
+        
+        """
+        if path is not None:
+            modname = fullname.rsplit('.', 1)[-1]
+            entries = path
+        elif '.' in fullname:
+            return
+        else:
+            modname = fullname
+            entries = sys.path
+
+        src_leaf = modname + os.path.extsep + 'enaml'
+        cache_leaf = ''.join((
+            CACHEDIR, '/', modname, '.', MAGIC_TAG, os.path.extsep, 'enamlc',
+        ))
+        for entry in entries:
+            if not isinstance(entry, basestring):
+                continue
+            info = cls._archive_info(entry)
+            if info is None:
+                continue
+            archive, prefix, names = info
+            src_name = prefix + src_leaf
+            cache_name = prefix + cache_leaf
+            if src_name in names or cache_name in names:
+                return cls(archive, src_name, cache_name)
+
+    def __init__(self, archive, src_name, cache_name):
+        """ Initialize an EnamlZipImporter.
+
+        Parameters
+        ----------
+        archive : str
+            The path to the zip archive which contains the module.
+
+        src_name : str
+            The name of the .enaml source in the archive.
+
+        cache_name : str
+            The name of the .enamlc cache file in the archive.
+
+        """
+        self.archive = archive
+        self.src_name = src_name
+        self.cache_name = cache_name
+
+    def get_code(self):
+        """ Loads and returns the code object for the Enaml module and
+        the full path to the module for use as the __file__ attribute 
+        of the module.
+
+        Returns
+        -------
+        result : (code, path)
+            The Python code object for the .enaml module, and the full
+            path to the module as a string.
+
+        """
+        zfile, names = self._archives[self.archive]
+        path = os.path.join(self.archive, self.src_name.replace('/', os.sep))
+        src = None
+        if self.src_name in names:
+            src = zfile.read(self.src_name)
+
+        # Archive timestamps are unreliable, so an embedded cache file
+        # is validated against the archived source by content hash.
+        if self.cache_name in names:
+            data = zfile.read(self.cache_name)
+            magic, ts, digest = unpack_cache_header(data)
+            if magic == MAGIC:
+                if src is None or digest == source_digest(src):
+                    code = marshal.loads(data[HEADER.size:])
+                    return (code, path)
+            elif src is None:
+                cache_path = os.path.join(self.archive, self.cache_name)
+                msg = 'Bad magic number in Enaml cache file %s'
+                raise ImportError(msg % cache_path)
+
+        ast = parse(src.replace('\r\n', '\n'), filename=path)
+        code = EnamlCompiler.compile(ast, path)
+        return (code, path)
+
+
 #------------------------------------------------------------------------------
 # Enaml Imports Context
 #------------------------------------------------------------------------------
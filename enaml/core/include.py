@@ -2,12 +2,35 @@
 #  Copyright (c) 2012, Enthought, Inc.
 #  All rights reserved.
 #------------------------------------------------------------------------------
+from collections import defaultdict
+
 from traits.api import List, Instance, Bool
 
 from .declarative import Declarative
 from .object import Object, ChildrenEventContext
 
 
+def _unparent(objects):
+    """ Unparent the given objects in bulk.
+
+    The objects are grouped by parent and each parent removes its group
+    with a single call to `remove_children`.
+
+    Parameters
+    ----------
+    objects : iterable
+        The objects to unparent. Objects without a parent are ignored.
+
+    """
+    groups = defaultdict(list)
+    for obj in objects:
+        parent = obj.parent
+        if parent is not None:
+            groups[parent].append(obj)
+    for parent, children in groups.iteritems():
+        parent.remove_children(children)
+
+
 class Include(Declarative):
     """ An object which dynamically inserts children into its parent.
 
@@ -50,8 +73,7 @@ class Include(Declarative):
             with ChildrenEventContext(new):
                 with ChildrenEventContext(old):
                     if new is None:
-                        for obj in self.objects:
-                            obj.set_parent(None)
+                        _unparent(self.objects)
                     else:
                         new.insert_children(self, self.objects)
 
@@ -74,9 +96,7 @@ class Include(Declarative):
                             if obj not in new_set:
                                 obj.destroy()
                     else:
-                        for obj in old:
-                            if obj not in new_set:
-                                obj.set_parent(None)
+                        _unparent(obj for obj in old if obj not in new_set)
                     if new_set:
                         parent.insert_children(self, self.objects)
                         self._activate_objects(new_set)
@@ -100,9 +120,9 @@ class Include(Declarative):
                             if obj not in add_set:
                                 obj.destroy()
                     else:
-                        for obj in event.removed:
-                            if obj not in add_set:
-                                obj.set_parent(None)
+                        _unparent(
+                            obj for obj in event.removed if obj not in add_set
+                        )
                     if add_set:
                         parent.insert_children(self, self.objects)
                         self._activate_objects(add_set)
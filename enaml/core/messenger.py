@@ -2,9 +2,9 @@
 #  Copyright (c) 2012, Enthought, Inc.
 #  All rights reserved.
 #------------------------------------------------------------------------------
-from traits.api import Instance, Uninitialized
+from traits.api import Bool, Instance, Uninitialized
 
-from enaml.utils import LoopbackGuard
+from enaml.utils import LoopbackGuard, sequence_checksum, sequence_splices
 
 from .declarative import Declarative
 from .include import Include
@@ -32,6 +32,75 @@ class PublishAttributeNotifier(object):
 PublishAttributeNotifier = PublishAttributeNotifier()
 
 
+#: A mapping of Messenger class to the (class_name, base_names) pair
+#: for the snapshots of its instances. This is populated on demand by
+#: `Messenger.snapshot`.
+_snapshot_schemas = {}
+
+
+def snapshot_chunks(roots, chunk_size=500):
+    """ Generate the snapshots of trees of Messengers in chunks.
+
+    The trees are walked depth first and split into chunks of at most
+    `chunk_size` objects, so that a client can start to build a large
+    tree before the server has serialized all of it. A chunk is a dict
+    with the following keys:
+
+    'trees'
+        A list of `[parent_id, tree]` pairs. The `tree` is a snapshot
+        in the same format as `Messenger.snapshot`, which may contain
+        only part of the children of the object. Each tree should be
+        appended to the children of the object with `parent_id`, or be
+        built as a new top-level object if `parent_id` is None. Trees
+        are given in order, and a parent is always given in an earlier
+        pair or chunk than its children.
+
+    'complete'
+        The list of the object ids of the roots whose trees are fully
+        given by this chunk and the chunks before it.
+
+    'count'
+        The number of objects in the chunk.
+
+    A new chunk is started for each root, so that a client can finish
+    the first window before the rest are serialized.
+
+    Parameters
+    ----------
+    roots : iterable
+        The Messengers at the roots of the trees to snapshot.
+
+    chunk_size : int, optional
+        The maximum number of objects in a chunk. The default is 500.
+
+    """
+    for root in roots:
+        trees = []
+        current = {}
+        stack = [(root, None)]
+        while stack:
+            obj, parent_id = stack.pop()
+            snap = obj.snapshot(shallow=True)
+            parent_snap = current.get(parent_id)
+            if parent_snap is not None:
+                parent_snap['children'].append(snap)
+            else:
+                trees.append([parent_id, snap])
+            object_id = snap['object_id']
+            current[object_id] = snap
+            children = obj.snap_children()
+            stack.extend((child, object_id) for child in reversed(children))
+            count = len(current)
+            if count >= chunk_size and stack:
+                yield {'trees': trees, 'complete': [], 'count': count}
+                trees = []
+                current = {}
+        yield {
+            'trees': trees, 'complete': [root.object_id],
+            'count': len(current),
+        }
+
+
 class Messenger(Declarative):
     """ A base class for creating messaging-enabled Enaml objects.
 
@@ -45,6 +114,13 @@ class Messenger(Declarative):
     #: cycle when setting attributes from within an action handler.
     loopback_guard = Instance(LoopbackGuard, ())
 
+    #: Whether the children of this object are withheld from the client.
+    #: Deferred children are neither activated nor included in the
+    #: snapshot until `materialize_children` is called. This flag is
+    #: set by lazy containers such as a Notebook or a Stack, and should
+    #: not be manipulated directly by user code.
+    _deferred = Bool(False)
+
     #--------------------------------------------------------------------------
     # Lifetime API
     #--------------------------------------------------------------------------
@@ -70,6 +146,16 @@ class Messenger(Declarative):
         super(Messenger, self).post_initialize()
         self.bind()
 
+    def activate_children(self, session):
+        """ A reimplemented child activation method.
+
+        The children of the object are not activated if they have been
+        deferred. They are activated by `materialize_children` instead.
+
+        """
+        if not self._deferred:
+            super(Messenger, self).activate_children(session)
+
     def bind(self):
         """ Called during initialization pass to bind change handlers.
 
@@ -83,12 +169,21 @@ class Messenger(Declarative):
     #--------------------------------------------------------------------------
     # Snapshot API
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Get a dictionary representation of the widget tree.
 
         This method can be called to get a dictionary representation of
         the current state of the widget tree which can be used by client
         side implementation to construct their own implementation tree.
+        Subclasses which reimplement this method must pass `shallow` to
+        the superclass.
+
+        Parameters
+        ----------
+        shallow : bool, optional
+            If True, the snapshot has an empty list of children and only
+            represents this object. This is used by `snapshot_chunks` to
+            walk a tree without recursion. The default is False.
 
         Returns
         -------
@@ -97,20 +192,32 @@ class Messenger(Declarative):
             from this widget down.
 
         """
+        # The class and base names are computed once per class. The
+        # same bases list is shared by every snapshot of the class, so
+        # consumers of a snapshot must not modify it.
+        cls = type(self)
+        schema = _snapshot_schemas.get(cls)
+        if schema is None:
+            schema = (intern(self.class_name()), self.base_names())
+            _snapshot_schemas[cls] = schema
         snap = {}
         snap['object_id'] = self.object_id
         snap['name'] = self.name
-        snap['class'] = self.class_name()
-        snap['bases'] = self.base_names()
-        snap['children'] = [c.snapshot() for c in self.snap_children()]
+        snap['class'] = schema[0]
+        snap['bases'] = schema[1]
+        if shallow:
+            snap['children'] = []
+        else:
+            snap['children'] = [c.snapshot() for c in self.snap_children()]
         return snap
 
     def snap_children(self):
         """ Get an iterable of children to include in the snapshot.
 
         The default implementation returns the list of children which
-        are instances of Messenger. Subclasses may reimplement this
-        method if more control is needed.
+        are instances of Messenger, or an empty list if the children
+        have been deferred. Subclasses may reimplement this method if
+        more control is needed.
 
         Returns
         -------
@@ -118,11 +225,17 @@ class Messenger(Declarative):
             The list of children which are instances of Messenger.
 
         """
+        if self._deferred:
+            return []
         return [c for c in self.children if isinstance(c, Messenger)]
 
     def class_name(self):
         """ Get the name of the class for this instance.
 
+        The result is cached per class by `snapshot`, so subclasses
+        which reimplement this method must return a value which depends
+        only on the class.
+
         Returns
         -------
         result : str
@@ -134,6 +247,10 @@ class Messenger(Declarative):
     def base_names(self):
         """ Get the list of base class names for this instance.
 
+        The result is cached per class by `snapshot`, so subclasses
+        which reimplement this method must return a value which depends
+        only on the class.
+
         Returns
         -------
         result : list
@@ -144,7 +261,7 @@ class Messenger(Declarative):
         """
         names = []
         for base in type(self).mro()[1:]:
-            names.append(base.__name__)
+            names.append(intern(base.__name__))
             if base is Object:
                 break
         return names
@@ -193,6 +310,47 @@ class Messenger(Declarative):
         for attr in attrs:
             self.add_notifier(attr, PublishAttributeNotifier)
 
+    def materialize_children(self):
+        """ Send the deferred children of this object to the client.
+
+        The children are sent as a `children_changed` action which adds
+        them to the client object, and are then activated. This method
+        is a no-op if the children of the object are not deferred.
+
+        """
+        if not self._deferred:
+            return
+        self._deferred = False
+        if self.is_active:
+            children = self.snap_children()
+            if children:
+                content = {}
+                content['splices'] = [
+                    [0, 0, [c.object_id for c in children]]
+                ]
+                content['base'] = sequence_checksum([])
+                content['removed'] = []
+                content['added'] = [c.snapshot() for c in children]
+                self.send_action('children_changed', content)
+            session = self.session
+            for child in self.children:
+                child.activate(session)
+
+    def on_action_resync_children(self, content):
+        """ Handle the 'resync_children' action from the client.
+
+        The client sends this action when it cannot apply the splices
+        of a 'children_changed' action. The full order of the children
+        is sent in reply.
+
+        """
+        if not self._deferred:
+            content = {}
+            content['order'] = [c.object_id for c in self.snap_children()]
+            content['removed'] = []
+            content['added'] = []
+            self.send_action('children_changed', content)
+
     def children_event(self, event):
         """ Handle a `ChildrenEvent` for the widget.
 
@@ -203,21 +361,38 @@ class Messenger(Declarative):
 
         """
         # Children events are fired all the time. Only pull for a new
-        # snapshot if the widget has been fully activated.
-        if self.is_active:
+        # snapshot if the widget has been fully activated. The order
+        # of the children is sent as the splices which transform the
+        # old order into the new one, so the size of the message is
+        # proportional to the size of the change. The 'destroy' action
+        # of a destroyed child precedes this action, and the client has
+        # already dropped the child when it applies the splices, so the
+        # splices are computed from the old order without the children
+        # being destroyed. A checksum of that order lets the client
+        # detect that its children differ, for example when a child
+        # could not be built, and request the full order with
+        # 'resync_children'.
+        if self.is_active and not self._deferred:
             content = {}
-            new_set = set(event.new)
-            old_set = set(event.old)
-            added = new_set - old_set
-            removed = old_set - new_set
-            content['order'] = [
-                c.object_id for c in event.new if isinstance(c, Messenger)
-            ]
-            content['removed'] = [
-                c.object_id for c in removed if isinstance(c, Messenger)
+            old = [c for c in event.old if isinstance(c, Messenger)]
+            new = [c for c in event.new if isinstance(c, Messenger)]
+            new_set = set(new)
+            base_ids = [
+                c.object_id for c in old
+                if c in new_set or not c.is_destroying
             ]
+            new_ids = [c.object_id for c in new]
+            splices = sequence_splices(base_ids, new_ids)
+            removed = [c.object_id for c in old if c not in new_set]
+            if not splices and not removed:
+                super(Messenger, self).children_event(event)
+                return
+            old_set = set(old)
+            content['splices'] = splices
+            content['base'] = sequence_checksum(base_ids)
+            content['removed'] = removed
             content['added'] = [
-                c.snapshot() for c in added if isinstance(c, Messenger)
+                c.snapshot() for c in new if c not in old_set
             ]
             self.send_action('children_changed', content)
         super(Messenger, self).children_event(event)
@@ -12,6 +12,7 @@ from traits.api import (
 
 from enaml.utils import make_dispatcher, id_generator
 
+from .dynamic_scope import invalidate_scope_caches
 from .trait_types import EnamlEvent
 
 
@@ -38,6 +39,226 @@ ParentEvent = namedtuple('ParentEvent', 'old new')
 object_id_generator = id_generator('o_')
 
 
+#: The number of objects with an enabled name index. The indexes are
+#: only maintained while this is non-zero.
+_name_index_count = 0
+
+
+class NameIndex(object):
+    """ An index of the named objects in a subtree.
+
+    An index is owned by the object at the root of the subtree. It is
+    updated by the Object parenting and destruction methods, and when
+    the name of an object changes. Objects with an empty name are not
+    indexed.
+
+    The names of added objects are read lazily, on the next lookup.
+    The name of an object may be bound to an expression which can not
+    be evaluated until the object is fully constructed, so the index
+    must not read it while the object is being parented.
+
+    """
+    __slots__ = ('_objects', '_names', '_pending')
+
+    def __init__(self):
+        """ Initialize a NameIndex.
+
+        """
+        self._objects = {}
+        self._names = {}
+        self._pending = set()
+
+    def _resolve(self):
+        """ Read the names of the objects added since the last lookup.
+
+        """
+        pending = self._pending
+        objects = self._objects
+        names = self._names
+        while pending:
+            obj = pending.pop()
+            name = obj.name
+            if name:
+                objects.setdefault(name, []).append(obj)
+                names[obj] = name
+
+    def get(self, name):
+        """ Get the indexed objects with the given name.
+
+        The objects are returned in an arbitrary order.
+
+        """
+        if self._pending:
+            self._resolve()
+        return self._objects.get(name, ())
+
+    def add(self, obj):
+        """ Add an object to the index.
+
+        """
+        self._pending.add(obj)
+
+    def discard(self, obj):
+        """ Remove an object from the index, if it is present.
+
+        """
+        self._pending.discard(obj)
+        name = self._names.pop(obj, None)
+        if name is not None:
+            objects = self._objects[name]
+            objects.remove(obj)
+            if not objects:
+                del self._objects[name]
+
+    def update(self, obj):
+        """ Update the name of an object in the index.
+
+        """
+        self.discard(obj)
+        self.add(obj)
+
+
+def _name_indexes(obj):
+    """ Get the name indexes which contain an object.
+
+    Parameters
+    ----------
+    obj : Object or None
+        The object of interest. If None, the result is empty.
+
+    Returns
+    -------
+    result : list
+        The indexes of the object and its ancestors, nearest first.
+
+    """
+    indexes = []
+    while obj is not None:
+        index = obj._name_index
+        if index is not None:
+            indexes.append(index)
+        obj = obj._parent
+    return indexes
+
+
+def _index_subtree(obj, parent, add):
+    """ Add or remove a subtree to the name indexes of a parent.
+
+    Parameters
+    ----------
+    obj : Object
+        The object at the root of the subtree.
+
+    parent : Object or None
+        The parent which gains or loses the subtree.
+
+    add : bool
+        True if the subtree should be added, False if removed.
+
+    """
+    indexes = _name_indexes(parent)
+    if indexes:
+        objects = list(obj.traverse())
+        for index in indexes:
+            if add:
+                for item in objects:
+                    index.add(item)
+            else:
+                for item in objects:
+                    index.discard(item)
+
+
+def _child_index(parent, child):
+    """ Get the position of a child in the children of its parent.
+
+    The positions are cached on the parent for its current children
+    tuple, so repeated lookups in a wide parent take constant time
+    until its children change.
+
+    """
+    children = parent._children
+    cache = parent._child_positions
+    if cache is None or cache[0] is not children:
+        positions = dict((obj, idx) for idx, obj in enumerate(children))
+        cache = parent._child_positions = (children, positions)
+    return cache[1][child]
+
+
+def _in_subtree(root, obj):
+    """ Get whether an object is in the subtree of a root.
+
+    """
+    while obj is not None:
+        if obj is root:
+            return True
+        obj = obj._parent
+    return False
+
+
+def _tree_path(root, obj):
+    """ Get the path of child indices from a root to an object.
+
+    Parameters
+    ----------
+    root : Object
+        The object at the root of the path.
+
+    obj : Object
+        The object at the end of the path.
+
+    Returns
+    -------
+    result : list or None
+        The list of child indices leading from the root to the object,
+        or None if the object is not in the subtree of the root.
+
+    """
+    path = []
+    while obj is not root:
+        parent = obj._parent
+        if parent is None:
+            return None
+        path.append(_child_index(parent, obj))
+        obj = parent
+    path.reverse()
+    return path
+
+
+def _indexed_find(root, index, name):
+    """ Find the objects with a name in the subtree of a root.
+
+    Parameters
+    ----------
+    root : Object
+        The object at the root of the subtree to search.
+
+    index : NameIndex
+        The name index of the root or one of its ancestors.
+
+    name : str
+        The name of interest.
+
+    Returns
+    -------
+    result : list
+        The objects in the subtree of the root with the given name,
+        in breadth first order.
+
+    """
+    objects = index.get(name)
+    if len(objects) == 1:
+        obj = objects[0]
+        return [obj] if _in_subtree(root, obj) else []
+    keyed = []
+    for obj in objects:
+        path = _tree_path(root, obj)
+        if path is not None:
+            keyed.append(((len(path), path), obj))
+    if len(keyed) > 1:
+        keyed.sort(key=lambda item: item[0])
+    return [obj for _, obj in keyed]
+
+
 class ChildrenEventContext(object):
     """ A context manager which will emit a child event on an Object.
 
@@ -121,7 +342,9 @@ class Object(HasStrictTraits):
 
     #: A read-only property which returns the objects children. This
     #: will be an iterable of Object instances. A strong reference is
-    #: kept to all child objects.
+    #: kept to all child objects. The children are stored in a tuple,
+    #: so every change copies it. Use the bulk parenting methods to
+    #: add or remove many children with a single copy.
     children = Property(fget=lambda self: self._children)
 
     #: An event fired when an the oject has been initialized. It is
@@ -188,6 +411,19 @@ class Object(HasStrictTraits):
     _children = Any     # tuple of Object
     _session = Any      # Session or None
 
+    #: The cache of the ancestors which resolve names in dynamic scope.
+    #: This is managed by the `dynamic_scope` module.
+    _scope_cache = Any  # dict or None
+
+    #: The index of the named objects in the subtree of this object.
+    #: This is managed by `enable_name_index`.
+    _name_index = Any   # NameIndex or None
+
+    #: The cached positions of the children of this object, as a tuple
+    #: of the children tuple and a dict of child to index. This is
+    #: managed by the name index lookups.
+    _child_positions = Any  # tuple or None
+
     def __init__(self, parent=None, **kwargs):
         """ Initialize an Object.
 
@@ -230,6 +466,24 @@ class Object(HasStrictTraits):
         self.state = 'initialized'
         self.post_initialize()
 
+    def iter_initialize(self):
+        """ A generator which initializes the object tree incrementally.
+
+        This is equivalent to `initialize`, but yields after each object
+        in the tree is initialized, so that the initialization of a large
+        tree may be spread over several cycles of the event loop. The
+        tree must not be modified while the generator is suspended.
+
+        """
+        self.state = 'initializing'
+        self.pre_initialize()
+        for child in self.children:
+            for step in child.iter_initialize():
+                yield step
+        self.state = 'initialized'
+        self.post_initialize()
+        yield
+
     def pre_initialize(self):
         """ Called during the initialization pass before any children
         are initialized.
@@ -266,11 +520,27 @@ class Object(HasStrictTraits):
         self.pre_activate(session)
         self._session = session
         session.register(self)
-        for child in self._children:
-            child.activate(session)
+        self.activate_children(session)
         self.state = 'active'
         self.post_activate(session)
 
+    def activate_children(self, session):
+        """ Called during the activation pass to activate the children.
+
+        The object `state` during this call will be 'activating'. The
+        default implementation activates all of the children. Subclasses
+        may reimplement this method to defer the activation of some of
+        their children.
+
+        Parameters
+        ----------
+        session : Session
+            The session to use for messaging with this object tree.
+
+        """
+        for child in self._children:
+            child.activate(session)
+
     def pre_activate(self, session):
         """ Called during the activation pass before any children are
         activated.
@@ -314,6 +584,8 @@ class Object(HasStrictTraits):
         parent = self._parent
         if parent is None or not parent.is_destroying:
             self.send_action('destroy', {})
+            if _name_index_count and parent is not None:
+                _index_subtree(self, parent, False)
         self.state = 'destroying'
         self.pre_destroy()
         if self._children:
@@ -323,8 +595,11 @@ class Object(HasStrictTraits):
         if parent is not None:
             if parent.is_destroying:
                 self._parent = None
+                invalidate_scope_caches(self)
             else:
                 self.set_parent(None)
+        if self._name_index is not None:
+            self.disable_name_index()
         session = self._session
         if session is not None:
             session.unregister(self)
@@ -384,6 +659,10 @@ class Object(HasStrictTraits):
         if parent is not None and not isinstance(parent, Object):
             raise TypeError('parent must be an Object or None')
         self._parent = parent
+        invalidate_scope_caches(self)
+        if _name_index_count:
+            _index_subtree(self, old_parent, False)
+            _index_subtree(self, parent, True)
         self.parent_event(ParentEvent(old_parent, parent))
         if old_parent is not None:
             old_kids = old_parent._children
@@ -440,21 +719,110 @@ class Object(HasStrictTraits):
         if not added:
             new.extend(insert_tup)
 
+        # The children of each old parent are rebuilt once, rather than
+        # once per child which is removed from it.
+        removals = defaultdict(set)
         for child in insert_tup:
             old_parent = child._parent
             if old_parent is not self:
                 child._parent = self
+                invalidate_scope_caches(child)
+                if _name_index_count:
+                    _index_subtree(child, old_parent, False)
+                    _index_subtree(child, self, True)
                 child.parent_event(ParentEvent(old_parent, self))
                 if old_parent is not None:
-                    old_kids = old_parent._children
-                    idx = old_kids.index(child)
-                    old_kids = old_kids[:idx] + old_kids[idx + 1:]
-                    with ChildrenEventContext(old_parent):
-                        old_parent._children = old_kids
+                    removals[old_parent].add(child)
+
+        for old_parent, removed in removals.iteritems():
+            old_kids = old_parent._children
+            with ChildrenEventContext(old_parent):
+                old_parent._children = tuple(
+                    child for child in old_kids if child not in removed
+                )
 
         with ChildrenEventContext(self):
             self._children = tuple(new)
 
+    def extend_children(self, children):
+        """ Append children to the end of the children of this object.
+
+        This is equivalent to `insert_children(None, children)`. The
+        children are parented in bulk and a single children event is
+        emitted for this object.
+
+        Parameters
+        ----------
+        children : iterable
+            An iterable of Object children to append to this object.
+
+        """
+        self.insert_children(None, children)
+
+    def move_children(self, before, children):
+        """ Move existing children of this object to a new location.
+
+        A single children event is emitted for the move.
+
+        Parameters
+        ----------
+        before : Object or None
+            A child object to use as the marker for the new location.
+            The children will be moved directly before this marker. If
+            the Object is None or not a child, then the children will
+            be moved to the end of the children.
+
+        children : iterable
+            An iterable of the children of this object to move.
+
+        """
+        children = tuple(children)
+        for child in children:
+            if child._parent is not self:
+                raise ValueError('cannot move an object which is not a child')
+        self.insert_children(before, children)
+
+    def remove_children(self, children):
+        """ Unparent several children of this object at once.
+
+        This is the bulk equivalent of calling `set_parent(None)` on
+        each child. The children tuple is rebuilt once and a single
+        children event is emitted for this object.
+
+        Parameters
+        ----------
+        children : iterable
+            An iterable of the children of this object to remove.
+
+        Notes
+        -----
+        It is the responsibility of the caller to destroy the children
+        if they are no longer needed.
+
+        """
+        remove_tup = tuple(children)
+        remove_set = set(remove_tup)
+        if len(remove_tup) != len(remove_set):
+            raise ValueError('cannot remove duplicate children')
+        for child in remove_tup:
+            if child._parent is not self:
+                raise ValueError('cannot remove an object which is not a child')
+        if not remove_tup:
+            return
+
+        for child in remove_tup:
+            child._parent = None
+            invalidate_scope_caches(child)
+            if _name_index_count:
+                _index_subtree(child, self, False)
+            child.parent_event(ParentEvent(self, None))
+
+        old_kids = self._children
+        with ChildrenEventContext(self):
+            self._children = tuple(
+                child for child in old_kids if child not in remove_set
+            )
+
     def parent_event(self, event):
         """ Handle a `ParentEvent` posted to this object.
 
@@ -572,13 +940,44 @@ class Object(HasStrictTraits):
             yield parent
             parent = parent._parent
 
+    def enable_name_index(self):
+        """ Enable an index of the names of the objects in the subtree.
+
+        While the index is enabled, `find` and `find_all` look up exact
+        names for this object and its descendants in the index instead
+        of traversing the tree. The index is kept up-to-date as objects
+        are added to, removed from, and renamed in the subtree. This is
+        a no-op if the index is already enabled.
+
+        """
+        global _name_index_count
+        if self._name_index is None:
+            index = NameIndex()
+            for obj in self.traverse():
+                index.add(obj)
+            self._name_index = index
+            _name_index_count += 1
+
+    def disable_name_index(self):
+        """ Disable the name index of the subtree.
+
+        This is a no-op if the index is not enabled.
+
+        """
+        global _name_index_count
+        if self._name_index is not None:
+            self._name_index = None
+            _name_index_count -= 1
+
     def find(self, name, regex=False):
         """ Find the first object in the subtree with the given name.
 
         This method will traverse the tree of objects, breadth first,
         from this object downward, looking for an object with the given
         name. The first object with the given name is returned, or None
-        if no object is found with the given name.
+        if no object is found with the given name. If a name index is
+        enabled on this object or an ancestor, an exact name is looked
+        up in the index instead.
 
         Parameters
         ----------
@@ -597,6 +996,11 @@ class Object(HasStrictTraits):
             object is found with the given name.
 
         """
+        if not regex and name and _name_index_count:
+            index = self._nearest_name_index()
+            if index is not None:
+                found = _indexed_find(self, index, name)
+                return found[0] if found else None
         if regex:
             rgx = re.compile(name)
             match = lambda n: bool(rgx.match(n))
@@ -612,7 +1016,8 @@ class Object(HasStrictTraits):
         This method will traverse the tree of objects, breadth first,
         from this object downward, looking for a objects with the given
         name. All of the objects with the given name are returned as a
-        list.
+        list. If a name index is enabled on this object or an ancestor,
+        an exact name is looked up in the index instead.
 
         Parameters
         ----------
@@ -631,6 +1036,10 @@ class Object(HasStrictTraits):
             list if no objects are found with the given name.
 
         """
+        if not regex and name and _name_index_count:
+            index = self._nearest_name_index()
+            if index is not None:
+                return _indexed_find(self, index, name)
         if regex:
             rgx = re.compile(name)
             match = lambda n: bool(rgx.match(n))
@@ -643,6 +1052,42 @@ class Object(HasStrictTraits):
                 push(obj)
         return res
 
+    def _nearest_name_index(self):
+        """ Get the name index of this object or its nearest ancestor.
+
+        Returns
+        -------
+        result : NameIndex or None
+            The nearest index which contains this object, or None if
+            there is no such index.
+
+        """
+        obj = self
+        while obj is not None:
+            index = obj._name_index
+            if index is not None:
+                return index
+            obj = obj._parent
+
+    def _update_name_index(self):
+        """ Update the name of this object in the enabled name indexes.
+
+        This is called when the name of the object changes. It is also
+        called by subclasses which may assign the name quietly, such
+        as Declarative after it is constructed. The new name is read
+        lazily, on the next lookup in the index.
+
+        """
+        if _name_index_count:
+            for index in _name_indexes(self):
+                index.update(self)
+
+    def _name_changed(self):
+        """ Update the name indexes when the name of the object changes.
+
+        """
+        self._update_name_index()
+
     #--------------------------------------------------------------------------
     # HasTraits Fixes
     #--------------------------------------------------------------------------
@@ -2,6 +2,15 @@
 #  Copyright (c) 2012, Enthought, Inc.
 #  All rights reserved.
 #------------------------------------------------------------------------------
+def _literal_operator(op):
+    """ Create a literal operator which delegates to an `=` operator.
+
+    """
+    def op_literal(obj, name, value, identifiers):
+        op(obj, name, lambda: value, identifiers)
+    return op_literal
+
+
 class OperatorContext(dict):
     """ The Enaml operator context which provides the binding operators
     for Enaml components and a means by which developers can author
@@ -56,3 +65,16 @@ class OperatorContext(dict):
         """
         OperatorContext._stack_.pop()
 
+    def __missing__(self, key):
+        """ Provide the literal operator for contexts which lack one.
+
+        The compiler folds `=` bindings of literals into calls to the
+        '__operator_Equal_Literal__' operator. A custom context which
+        does not provide that operator gets one which wraps the value
+        in a function and passes it to the context's `=` operator.
+
+        """
+        if key == '__operator_Equal_Literal__':
+            return _literal_operator(self['__operator_Equal__'])
+        raise KeyError(key)
+
@@ -32,10 +32,28 @@ identifiers : dict
 """
 from .expressions import (
     SimpleExpression, NotificationExpression, SubscriptionExpression,
-    UpdateExpression, DelegationExpression
+    UpdateExpression, DelegationExpression, shared_expression
 )
 
 
+def _make_expression(kind, obj, func, identifiers):
+    """ Make the expression of a kind for a binding on an object.
+
+    The first identifiers dict used to bind an expression on an object
+    becomes the identifiers of the object. Bindings in that scope use
+    the expression which is shared by all instances of the enamldef.
+    A binding from another scope, such as an enamldef which binds an
+    attribute on a child enamldef, gets an expression of its own.
+
+    """
+    scope = obj._identifiers
+    if scope is None:
+        obj._identifiers = scope = identifiers
+    if scope is identifiers:
+        return shared_expression(kind, func)
+    return kind(func, identifiers)
+
+
 def op_simple(obj, name, func, identifiers):
     """ The default Enaml operator for `=` expressions.
 
@@ -45,10 +63,22 @@ def op_simple(obj, name, func, identifiers):
     invoked with `funchelper.call_func(...)`.
 
     """
-    expr = SimpleExpression(func, identifiers)
+    expr = _make_expression(SimpleExpression, obj, func, identifiers)
     obj.bind_expression(name, expr)
 
 
+def op_simple_literal(obj, name, value, identifiers):
+    """ The default Enaml operator for `=` expressions of literals.
+
+    The compiler folds an `=` expression which is an immutable literal
+    into its value, and passes that value in place of a function. This
+    operator assigns the value as the default of the attribute, without
+    binding any expression object.
+
+    """
+    obj.bind_literal(name, value)
+
+
 def op_notify(obj, name, func, identifiers):
     """ The default Enaml operator for `::` expressions.
 
@@ -58,7 +88,7 @@ def op_notify(obj, name, func, identifiers):
     invoked with `funchelper.call_func(...)`.
 
     """
-    expr = NotificationExpression(func, identifiers)
+    expr = _make_expression(NotificationExpression, obj, func, identifiers)
     obj.bind_listener(name, expr)
 
 
@@ -72,7 +102,7 @@ def op_update(obj, name, func, identifiers):
     `funchelper.call_func(...)`.
 
     """
-    expr = UpdateExpression(func, identifiers)
+    expr = _make_expression(UpdateExpression, obj, func, identifiers)
     obj.bind_listener(name, expr)
 
 
@@ -86,7 +116,7 @@ def op_subscribe(obj, name, func, identifiers):
     `funchelper.call_func(...)`.
 
     """
-    expr = SubscriptionExpression(func, identifiers)
+    expr = _make_expression(SubscriptionExpression, obj, func, identifiers)
     obj.bind_expression(name, expr)
 
 
@@ -102,13 +132,14 @@ def op_delegate(obj, name, func, identifiers):
     and `op_update`.
 
     """
-    expr = DelegationExpression(func, identifiers)
+    expr = _make_expression(DelegationExpression, obj, func, identifiers)
     obj.bind_expression(name, expr)
     obj.bind_listener(name, expr)
 
 
 OPERATORS = {
     '__operator_Equal__': op_simple,
+    '__operator_Equal_Literal__': op_simple_literal,
     '__operator_LessLess__': op_subscribe,
     '__operator_ColonEqual__': op_delegate,
     '__operator_ColonColon__': op_notify,
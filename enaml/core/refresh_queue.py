@@ -0,0 +1,226 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" A queue for coalescing the refreshes of subscription expressions.
+
+By default, a `<<` or `:=` expression is re-evaluated synchronously
+every time one of its dependencies changes. When batching is enabled,
+a change instead marks the expression dirty, and every dirty expression
+is re-evaluated once on the next cycle of the event loop. An expression
+which depends on several attributes which are updated together is then
+evaluated once instead of once per attribute.
+
+While batching is enabled, the value of a dirty expression is stale
+until the queue is flushed. If no Application instance exists, there
+is no event loop on which to flush, and refreshes happen immediately.
+
+Independent of batching, changes made within a `transaction` are
+queued and flushed when the outermost transaction exits. Transactions
+are local to a thread: only the changes made by the thread which opened
+the transaction are queued, and they are refreshed on that thread. The
+changes made by other threads are refreshed as if no transaction were
+in progress.
+
+The queue is flushed in topological order. Every subscription notifier
+has a rank which is one more than the highest rank of the subscription
+expressions it depends on. Notifiers are refreshed in order of rank,
+so for chained expressions such as `b << a`, `c << a + b`, the value
+of `c` is only computed after `b` is up-to-date, and exactly once per
+flush. Expressions queued by a refresh during a flush are refreshed as
+part of the same flush.
+
+"""
+from contextlib import contextmanager
+from heapq import heappush, heappop
+from itertools import count
+from threading import Lock, local
+
+from enaml.application import Application
+
+
+class RefreshQueue(object):
+    """ A queue of subscription notifiers waiting to be refreshed.
+
+    The notifiers queued by batching are shared by all threads and are
+    flushed on the event loop. The notifiers queued while a transaction
+    or flush is in progress are held by the thread which started it.
+
+    """
+    def __init__(self):
+        """ Initialize a RefreshQueue.
+
+        """
+        self.enabled = False
+        self._heap = []
+        self._dirty = set()
+        self._counter = count()
+        self._scheduled = False
+        self._lock = Lock()
+        self._local = local()
+
+    def _thread_state(self):
+        """ Get the transaction state of the current thread.
+
+        Returns
+        -------
+        result : threading.local
+            An object with the 'depth' of the transactions and flushes
+            in progress on the thread, and the 'heap' and 'dirty' set of
+            the notifiers they queued.
+
+        """
+        state = self._local
+        if not hasattr(state, 'depth'):
+            state.depth = 0
+            state.heap = []
+            state.dirty = set()
+        return state
+
+    def _push(self, heap, dirty, notifier):
+        """ Push a notifier onto a heap unless it is already dirty.
+
+        """
+        if notifier not in dirty:
+            dirty.add(notifier)
+            heappush(heap, (notifier.rank, self._counter.next(), notifier))
+
+    def _drain(self, state):
+        """ Refresh the notifiers queued on a thread in order of rank.
+
+        """
+        heap = state.heap
+        dirty = state.dirty
+        state.depth += 1
+        try:
+            while heap:
+                notifier = heappop(heap)[2]
+                dirty.discard(notifier)
+                notifier.refresh()
+        finally:
+            state.depth -= 1
+
+    def enqueue(self, notifier):
+        """ Queue a notifier to be refreshed.
+
+        A notifier is queued if a transaction or flush is in progress on
+        the current thread, or if batching is enabled and an application
+        exists. A notifier which is already queued is not added a second
+        time. When batching, the first queued notifier schedules a flush
+        with the application.
+
+        Parameters
+        ----------
+        notifier : SubscriptionNotifier
+            The notifier for the expression which is invalid.
+
+        Returns
+        -------
+        result : bool
+            True if the notifier was queued, False if the caller should
+            refresh the notifier immediately.
+
+        """
+        state = self._thread_state()
+        if state.depth > 0:
+            self._push(state.heap, state.dirty, notifier)
+            return True
+        if not self.enabled:
+            return False
+        app = Application.instance()
+        if app is None:
+            return False
+        with self._lock:
+            self._push(self._heap, self._dirty, notifier)
+            if self._scheduled:
+                return True
+            self._scheduled = True
+        app.schedule(self.flush)
+        return True
+
+    def flush(self):
+        """ Refresh all of the queued notifiers in order of rank.
+
+        The notifiers queued by batching are refreshed on the calling
+        thread along with those queued by the thread itself.
+
+        """
+        state = self._thread_state()
+        with self._lock:
+            self._scheduled = False
+            heap = self._heap
+            self._heap = []
+            self._dirty = set()
+        for item in heap:
+            notifier = item[2]
+            if notifier not in state.dirty:
+                state.dirty.add(notifier)
+                heappush(state.heap, item)
+        self._drain(state)
+
+    @contextmanager
+    def transaction(self):
+        """ A context manager which queues refreshes until it exits.
+
+        Transactions may be nested. The notifiers queued by the thread
+        are refreshed when its outermost transaction exits.
+
+        """
+        state = self._thread_state()
+        state.depth += 1
+        try:
+            yield
+        finally:
+            state.depth -= 1
+            if state.depth == 0:
+                self._drain(state)
+
+
+#: The refresh queue used by the subscription notifiers.
+_queue = RefreshQueue()
+
+
+def refresh_queue():
+    """ Get the refresh queue used by the subscription notifiers.
+
+    """
+    return _queue
+
+
+def enable_batching():
+    """ Enable the coalesced refresh of subscription expressions.
+
+    """
+    _queue.enabled = True
+
+
+def disable_batching():
+    """ Disable the coalesced refresh of subscription expressions.
+
+    Any expressions which are waiting to be refreshed are refreshed
+    before this function returns.
+
+    """
+    _queue.enabled = False
+    _queue.flush()
+
+
+def flush():
+    """ Refresh all of the queued subscription expressions now.
+
+    This is useful for tests and for code which needs up-to-date
+    values before the event loop flushes the queue.
+
+    """
+    _queue.flush()
+
+
+def transaction():
+    """ Get a context manager which defers refreshes until it exits.
+
+    Changes made within the transaction queue the expressions which
+    depend on them. When the outermost transaction exits, each queued
+    expression is refreshed once, in topological order.
+
+    """
+    return _queue.transaction()
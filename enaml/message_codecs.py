@@ -0,0 +1,803 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Codecs for the messages sent across an action socket.
+
+A message is an `(object_id, action, content)` triple, where `content`
+is a JSON serializable dict. A codec converts a message to and from a
+byte string. Two codecs are provided:
+
+JSONCodec
+    Encodes the triple as a JSON array. It is stateless and is always
+    available.
+
+BinaryCodec
+    A compact tagged binary encoding. The object ids, the action names,
+    the dict keys and a few well known string values are interned into
+    small integers the first time they are sent, and lists of numbers
+    are packed into arrays. The intern tables are built as a side
+    effect of the messages, so a BinaryCodec holds the state of one
+    session: one instance must be used for each session, and the
+    messages must be decoded in the order in which they were encoded.
+
+The result of decoding an encoded message is always equal to the result
+of a JSON round trip of the message: tuples become lists, and all of the
+strings are unicode.
+
+The codec of a session is negotiated with `negotiate_codec`, given the
+names of the codecs supported by the peer in order of preference.
+
+A codec may be wrapped in a `CompressingCodec`, which compresses the
+encoded messages above a size threshold, such as the data of images and
+large html sources. The compression of a session is negotiated with
+`negotiate_compression`. 'zlib' is always available, and 'bz2' is
+available when Python is built with it. A compressed message is never
+decompressed beyond the `max_size` of the codec, so a peer cannot
+exhaust the memory of the process with a small compression bomb.
+
+"""
+from abc import ABCMeta, abstractmethod
+import json
+import struct
+import zlib
+
+try:
+    import bz2
+except ImportError:
+    bz2 = None
+
+
+class MessageCodec(object):
+    """ An abstract base class for message codecs.
+
+    """
+    __metaclass__ = ABCMeta
+
+    #: The name of the codec, used to negotiate the codec of a session.
+    name = ''
+
+    @abstractmethod
+    def encode(self, object_id, action, content):
+        """ Encode a message into a byte string.
+
+        Parameters
+        ----------
+        object_id : str
+            The object id of the target of the message.
+
+        action : str
+            The action to be performed by the target.
+
+        content : dict
+            The JSON serializable content of the action.
+
+        Returns
+        -------
+        result : str
+            The encoded message.
+
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def decode(self, data):
+        """ Decode a message from a byte string.
+
+        Parameters
+        ----------
+        data : str
+            A message encoded by the peer codec.
+
+        Returns
+        -------
+        result : tuple
+            The `(object_id, action, content)` triple of the message.
+
+        """
+        raise NotImplementedError
+
+
+class JSONCodec(MessageCodec):
+    """ A codec which encodes messages as JSON arrays.
+
+    """
+    name = 'json'
+
+    def encode(self, object_id, action, content):
+        """ Encode a message into a JSON string.
+
+        """
+        return json.dumps([object_id, action, content], separators=(',', ':'))
+
+    def decode(self, data):
+        """ Decode a message from a JSON string.
+
+        """
+        object_id, action, content = json.loads(data)
+        return object_id, action, content
+
+
+#------------------------------------------------------------------------------
+# Binary Codec
+#------------------------------------------------------------------------------
+#: The version byte which starts each binary message.
+_VERSION = '\x01'
+
+#: The names of the dict keys whose string values are interned. These
+#: hold the object ids and class names of snapshots and the symbolic
+#: names of layout constraints, which are repeated in many messages.
+INTERNED_KEYS = frozenset([
+    'object_id', 'class', 'bases', 'action', 'owner', 'name', 'type', 'op',
+    'strength',
+])
+
+#: The minimum length of a list of numbers which is packed as an array.
+_PACK_MIN = 4
+
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+_pack_i = struct.Struct('<i').pack
+_pack_q = struct.Struct('<q').pack
+_pack_d = struct.Struct('<d').pack
+_unpack_b = struct.Struct('<b').unpack_from
+_unpack_i = struct.Struct('<i').unpack_from
+_unpack_q = struct.Struct('<q').unpack_from
+_unpack_d = struct.Struct('<d').unpack_from
+
+#: The encodings of the integers which fit in a single byte.
+_SMALL_INTS = dict(
+    (value, 'b' + struct.pack('<b', value)) for value in xrange(-128, 128)
+)
+
+
+def _varint(value):
+    """ Encode a non-negative integer as a little endian base 128
+    varint.
+
+    """
+    if value < 0x80:
+        return chr(value)
+    parts = []
+    while value >= 0x80:
+        parts.append(chr((value & 0x7f) | 0x80))
+        value >>= 7
+    parts.append(chr(value))
+    return ''.join(parts)
+
+
+def _decode_varint(data, pos):
+    """ Decode the varint which starts at the given position.
+
+    Returns
+    -------
+    result : tuple
+        The decoded integer and the position after the varint.
+
+    """
+    byte = ord(data[pos])
+    if byte < 0x80:
+        return byte, pos + 1
+    value = 0
+    shift = 0
+    while byte >= 0x80:
+        value |= (byte & 0x7f) << shift
+        shift += 7
+        pos += 1
+        byte = ord(data[pos])
+    return value | (byte << shift), pos + 1
+
+
+def _json_key(key):
+    """ Convert a dict key into the string used for it by JSON.
+
+    """
+    if isinstance(key, basestring):
+        return key
+    if key is None or isinstance(key, (bool, int, long, float)):
+        return json.dumps(key)
+    raise TypeError('key %r is not a string' % (key,))
+
+
+class BinaryCodec(MessageCodec):
+    """ A codec which encodes messages in a compact binary format.
+
+    Each value is encoded as a tag byte followed by its data. The tags
+    are::
+
+        N T F       None, True and False
+        b i q       integers of 1, 4 and 8 bytes
+        L           a larger integer, as a decimal string
+        d           a float of 8 bytes
+        u           a literal string, as a varint size and UTF-8 data
+        s           a string which is added to the intern table
+        r           an interned string, as a varint index
+        l           a list, as a varint count and the items
+        m           a dict, as a varint count and the key, value pairs
+        I           a packed array of integers, as a width code of 'b',
+                    'i' or 'q', a varint count and the data
+        D           a packed array of floats, as a varint count and the
+                    data
+
+    A message is a version byte followed by the object id, the action
+    and the content.
+
+    """
+    name = 'binary'
+
+    def __init__(self, max_interned=65536):
+        """ Initialize a BinaryCodec.
+
+        Parameters
+        ----------
+        max_interned : int, optional
+            The maximum number of strings interned by the encoder. Once
+            the table is full, new strings are sent as literals. The
+            default is 65536.
+
+        """
+        self._max_interned = max_interned
+        # A mapping of interned string to the encoding of its reference.
+        self._encode_table = {}
+        self._decode_table = []
+        # The strings added to the encode table by the message being
+        # encoded, which are removed if the encoding fails.
+        self._staged = []
+
+    #--------------------------------------------------------------------------
+    # Encoding
+    #--------------------------------------------------------------------------
+    def _encode_string(self, value, parts, intern):
+        """ Encode a string, interning it if requested.
+
+        Byte strings are assumed to be UTF-8 encoded, as they are by
+        the `json` module.
+
+        """
+        tag = 'u'
+        if intern:
+            table = self._encode_table
+            ref = table.get(value)
+            if ref is not None:
+                parts.append(ref)
+                return
+            count = len(table)
+            if count < self._max_interned:
+                table[value] = 'r' + _varint(count)
+                self._staged.append(value)
+                tag = 's'
+        data = value.encode('utf-8') if type(value) is unicode else value
+        parts.append(tag + _varint(len(data)) + data)
+
+    def _encode_numbers(self, value, parts):
+        """ Encode a list as a packed array if it holds only numbers.
+
+        Returns True if the list was packed, False otherwise.
+
+        """
+        kinds = set(map(type, value))
+        if len(kinds) != 1:
+            return False
+        kind = kinds.pop()
+        if kind is int:
+            low = min(value)
+            high = max(value)
+            if -0x80 <= low and high < 0x80:
+                code = 'b'
+            elif -0x80000000 <= low and high < 0x80000000:
+                code = 'i'
+            else:
+                code = 'q'
+            tag = 'I' + code
+        elif kind is float:
+            code = 'd'
+            tag = 'D'
+        else:
+            return False
+        count = len(value)
+        data = struct.pack('<%d%s' % (count, code), *value)
+        parts.append(tag + _varint(count) + data)
+        return True
+
+    def _encode_value(self, value, parts, intern=False):
+        """ Encode a JSON serializable value.
+
+        """
+        kind = type(value)
+        if kind is unicode or kind is str:
+            self._encode_string(value, parts, intern)
+        elif kind is dict:
+            parts.append('m' + _varint(len(value)))
+            table = self._encode_table
+            encode_string = self._encode_string
+            encode_value = self._encode_value
+            for key, item in value.iteritems():
+                # Keys are always interned. Most are found in the table.
+                ref = table.get(key)
+                if ref is not None:
+                    parts.append(ref)
+                else:
+                    if type(key) is not str and type(key) is not unicode:
+                        key = _json_key(key)
+                    encode_string(key, parts, True)
+                encode_value(item, parts, key in INTERNED_KEYS)
+        elif kind is list or kind is tuple:
+            if len(value) >= _PACK_MIN and self._encode_numbers(value, parts):
+                return
+            parts.append('l' + _varint(len(value)))
+            encode_value = self._encode_value
+            for item in value:
+                encode_value(item, parts, intern)
+        elif kind is int:
+            small = _SMALL_INTS.get(value)
+            if small is not None:
+                parts.append(small)
+            elif -0x80000000 <= value < 0x80000000:
+                parts.append('i' + _pack_i(value))
+            else:
+                parts.append('q' + _pack_q(value))
+        elif kind is float:
+            parts.append('d' + _pack_d(value))
+        elif value is None:
+            parts.append('N')
+        elif value is True:
+            parts.append('T')
+        elif value is False:
+            parts.append('F')
+        elif kind is long:
+            if _INT64_MIN <= value <= _INT64_MAX:
+                parts.append('q' + _pack_q(value))
+            else:
+                data = str(value)
+                parts.append('L' + _varint(len(data)) + data)
+        elif isinstance(value, (list, tuple)):
+            # Subclasses, such as named tuples, are encoded like their
+            # base types, as they are by the `json` module.
+            self._encode_value(list(value), parts, intern)
+        elif isinstance(value, dict):
+            self._encode_value(dict(value), parts, intern)
+        elif isinstance(value, basestring):
+            self._encode_value(unicode(value), parts, intern)
+        elif isinstance(value, (int, long)):
+            self._encode_value(int(value), parts, intern)
+        elif isinstance(value, float):
+            self._encode_value(float(value), parts, intern)
+        else:
+            raise TypeError('%r is not JSON serializable' % (value,))
+
+    def encode(self, object_id, action, content):
+        """ Encode a message into a binary string.
+
+        """
+        # The intern tables of the peers must stay in step, so the
+        # strings interned by a message which fails to encode are
+        # removed from the table before the error is raised.
+        staged = self._staged
+        del staged[:]
+        parts = [_VERSION]
+        try:
+            self._encode_string(object_id, parts, True)
+            self._encode_string(action, parts, True)
+            self._encode_value(content, parts)
+        except Exception:
+            table = self._encode_table
+            for value in staged:
+                del table[value]
+            raise
+        finally:
+            del staged[:]
+        return ''.join(parts)
+
+    #--------------------------------------------------------------------------
+    # Decoding
+    #--------------------------------------------------------------------------
+    def _decode_value(self, data, pos):
+        """ Decode the value which starts at the given position.
+
+        Returns
+        -------
+        result : tuple
+            The decoded value and the position after the value.
+
+        """
+        tag = data[pos]
+        pos += 1
+        if tag == 'r':
+            byte = ord(data[pos])
+            if byte < 0x80:
+                return self._decode_table[byte], pos + 1
+            index, pos = _decode_varint(data, pos)
+            return self._decode_table[index], pos
+        if tag == 'm':
+            count, pos = _decode_varint(data, pos)
+            result = {}
+            table = self._decode_table
+            decode_value = self._decode_value
+            for idx in xrange(count):
+                # Keys are almost always references to interned strings.
+                if data[pos] == 'r' and ord(data[pos + 1]) < 0x80:
+                    key = table[ord(data[pos + 1])]
+                    pos += 2
+                else:
+                    key, pos = decode_value(data, pos)
+                result[key], pos = decode_value(data, pos)
+            return result, pos
+        if tag == 'b':
+            return _unpack_b(data, pos)[0], pos + 1
+        if tag == 'u' or tag == 's':
+            size, pos = _decode_varint(data, pos)
+            end = pos + size
+            value = data[pos:end].decode('utf-8')
+            if tag == 's':
+                self._decode_table.append(value)
+            return value, end
+        if tag == 'l':
+            count, pos = _decode_varint(data, pos)
+            result = []
+            append = result.append
+            decode_value = self._decode_value
+            for idx in xrange(count):
+                item, pos = decode_value(data, pos)
+                append(item)
+            return result, pos
+        if tag == 'd':
+            return _unpack_d(data, pos)[0], pos + 8
+        if tag == 'I' or tag == 'D':
+            if tag == 'I':
+                code = data[pos]
+                pos += 1
+            else:
+                code = 'd'
+            count, pos = _decode_varint(data, pos)
+            fmt = '<%d%s' % (count, code)
+            result = list(struct.unpack_from(fmt, data, pos))
+            return result, pos + struct.calcsize(fmt)
+        if tag == 'N':
+            return None, pos
+        if tag == 'T':
+            return True, pos
+        if tag == 'F':
+            return False, pos
+        if tag == 'i':
+            return _unpack_i(data, pos)[0], pos + 4
+        if tag == 'q':
+            return _unpack_q(data, pos)[0], pos + 8
+        if tag == 'L':
+            size, pos = _decode_varint(data, pos)
+            return long(data[pos:pos + size]), pos + size
+        raise ValueError('invalid tag %r at position %d' % (tag, pos - 1))
+
+    def decode(self, data):
+        """ Decode a message from a binary string.
+
+        """
+        if not data or data[0] != _VERSION:
+            raise ValueError('invalid binary message')
+        table = self._decode_table
+        size = len(table)
+        try:
+            object_id, pos = self._decode_value(data, 1)
+            action, pos = self._decode_value(data, pos)
+            content, pos = self._decode_value(data, pos)
+            if pos != len(data):
+                raise ValueError('trailing data in binary message')
+        except Exception:
+            del table[size:]
+            raise
+        return object_id, action, content
+
+
+#------------------------------------------------------------------------------
+# Compression
+#------------------------------------------------------------------------------
+#: The flag byte which starts a message which is sent uncompressed.
+_RAW = '\x00'
+
+
+#: The flag byte which starts a message which is sent compressed.
+_COMPRESSED = '\x01'
+
+
+class CompressingCodec(MessageCodec):
+    """ A codec which compresses the messages of another codec.
+
+    Messages which are encoded to at least `threshold` bytes are
+    compressed, unless the compressed form is not smaller. Each message
+    starts with a flag byte, so the peer decodes the messages of any
+    threshold. Small messages, which are most of the messages of a
+    session, pay one byte and no compression time.
+
+    """
+    def __init__(self, codec, compression='zlib', threshold=4096,
+                 max_size=1 << 26):
+        """ Initialize a CompressingCodec.
+
+        Parameters
+        ----------
+        codec : MessageCodec
+            The codec which encodes the messages.
+
+        compression : str, optional
+            The name of a registered compressor. The default is 'zlib'.
+
+        threshold : int, optional
+            The size in bytes of the smallest encoded message which is
+            compressed. The default is 4096.
+
+        max_size : int, optional
+            The size in bytes of the largest message which is accepted
+            after decompression. A larger message is rejected with a
+            ValueError. The default is 64MB.
+
+        """
+        if compression not in _compressors:
+            raise ValueError("unknown compressor '%s'" % compression)
+        self.codec = codec
+        self.compression = compression
+        self.threshold = threshold
+        self.max_size = max_size
+        self._compress, self._decompress = _compressors[compression]
+
+    @property
+    def name(self):
+        """ The name of the wrapped codec.
+
+        """
+        return self.codec.name
+
+    def encode(self, object_id, action, content):
+        """ Encode a message, compressing it if it is large.
+
+        """
+        data = self.codec.encode(object_id, action, content)
+        if len(data) >= self.threshold:
+            compressed = self._compress(data)
+            if len(compressed) < len(data):
+                return _COMPRESSED + compressed
+        return _RAW + data
+
+    def decode(self, data):
+        """ Decode a message, decompressing it if necessary.
+
+        """
+        flag = data[:1]
+        if flag == _RAW:
+            data = data[1:]
+        elif flag == _COMPRESSED:
+            data = self._decompress(data[1:], self.max_size)
+        else:
+            raise ValueError('invalid compression flag')
+        return self.codec.decode(data)
+
+
+#------------------------------------------------------------------------------
+# Codec Registry
+#------------------------------------------------------------------------------
+#: The registered codec factories, keyed by name.
+_codecs = {}
+
+
+#: The names of the registered codecs, in order of preference.
+_preferred = []
+
+
+def register_codec(name, factory, preferred=False):
+    """ Register a codec factory.
+
+    Parameters
+    ----------
+    name : str
+        The name used to negotiate the codec.
+
+    factory : callable
+        A callable with no arguments which returns a new MessageCodec.
+        A new codec is created for each session.
+
+    preferred : bool, optional
+        Whether the codec should be preferred over the codecs which are
+        already registered. The default is False.
+
+    """
+    if name in _codecs:
+        _preferred.remove(name)
+    _codecs[name] = factory
+    if preferred:
+        _preferred.insert(0, name)
+    else:
+        _preferred.append(name)
+
+
+def codec_names():
+    """ Get the names of the registered codecs.
+
+    Returns
+    -------
+    result : list
+        The names of the registered codecs, in order of preference.
+
+    """
+    return list(_preferred)
+
+
+def create_codec(name):
+    """ Create a new codec with the given name.
+
+    Parameters
+    ----------
+    name : str
+        The name of a registered codec.
+
+    Returns
+    -------
+    result : MessageCodec
+        A new codec instance.
+
+    """
+    if name not in _codecs:
+        raise ValueError("unknown codec '%s'" % name)
+    return _codecs[name]()
+
+
+def negotiate_codec(names):
+    """ Create the codec for a session given the names offered by the
+    peer.
+
+    Parameters
+    ----------
+    names : iterable
+        The names of the codecs supported by the peer, in order of the
+        peer's preference.
+
+    Returns
+    -------
+    result : MessageCodec
+        A new instance of the first offered codec which is registered,
+        or of the JSON codec if none of the offered codecs is known.
+
+    """
+    for name in names:
+        if name in _codecs:
+            return _codecs[name]()
+    return JSONCodec()
+
+
+register_codec(BinaryCodec.name, BinaryCodec)
+register_codec(JSONCodec.name, JSONCodec)
+
+
+#------------------------------------------------------------------------------
+# Compressor Registry
+#------------------------------------------------------------------------------
+#: The registered (compress, decompress) pairs, keyed by name.
+_compressors = {}
+
+
+#: The names of the registered compressors, in order of preference.
+_preferred_compressors = []
+
+
+def register_compressor(name, compress, decompress, preferred=False):
+    """ Register a compressor.
+
+    Parameters
+    ----------
+    name : str
+        The name used to negotiate the compression.
+
+    compress : callable
+        A callable which compresses a byte string.
+
+    decompress : callable
+        A callable which decompresses a byte string. It is called with
+        the string and the maximum size in bytes of the result, and
+        must raise a ValueError rather than produce a larger result.
+
+    preferred : bool, optional
+        Whether the compressor should be preferred over the compressors
+        which are already registered. The default is False.
+
+    """
+    if name in _compressors:
+        _preferred_compressors.remove(name)
+    _compressors[name] = (compress, decompress)
+    if preferred:
+        _preferred_compressors.insert(0, name)
+    else:
+        _preferred_compressors.append(name)
+
+
+def compressor_names():
+    """ Get the names of the registered compressors.
+
+    Returns
+    -------
+    result : list
+        The names of the registered compressors, in order of preference.
+
+    """
+    return list(_preferred_compressors)
+
+
+def negotiate_compression(names, allowed=None):
+    """ Select the compression of a session given the names offered
+    by the peer.
+
+    Parameters
+    ----------
+    names : iterable
+        The names of the compressors supported by the peer, in order of
+        the peer's preference.
+
+    allowed : iterable, optional
+        The names of the compressors allowed by this side. The default
+        allows all registered compressors.
+
+    Returns
+    -------
+    result : str or None
+        The name of the first offered compressor which is registered
+        and allowed, or None if the messages should not be compressed.
+
+    """
+    if allowed is not None:
+        allowed = set(allowed)
+    for name in names:
+        if name in _compressors and (allowed is None or name in allowed):
+            return name
+    return None
+
+
+#------------------------------------------------------------------------------
+# Bounded Decompressors
+#------------------------------------------------------------------------------
+#: The number of bytes fed at a time to a bz2 decompressor. The bz2
+#: module of Python 2 has no output limit, so the output is checked as
+#: the input is fed in small steps.
+_BZ2_STEP = 1024
+
+
+def _oversize(max_size):
+    """ Create the error for a message which decompresses too large.
+
+    """
+    msg = 'compressed message exceeds the maximum size of %d bytes'
+    return ValueError(msg % max_size)
+
+
+def _zlib_decompress(data, max_size):
+    """ Decompress a zlib string to at most `max_size` bytes.
+
+    """
+    decompressor = zlib.decompressobj()
+    try:
+        result = decompressor.decompress(data, max_size + 1)
+    except zlib.error as e:
+        raise ValueError('invalid zlib data: %s' % e)
+    if len(result) > max_size or decompressor.unconsumed_tail:
+        raise _oversize(max_size)
+    return result
+
+
+def _bz2_decompress(data, max_size):
+    """ Decompress a bz2 string to at most `max_size` bytes.
+
+    """
+    decompressor = bz2.BZ2Decompressor()
+    parts = []
+    size = 0
+    try:
+        for start in xrange(0, len(data), _BZ2_STEP):
+            part = decompressor.decompress(data[start:start + _BZ2_STEP])
+            size += len(part)
+            if size > max_size:
+                raise _oversize(max_size)
+            parts.append(part)
+    except (IOError, EOFError) as e:
+        raise ValueError('invalid bz2 data: %s' % e)
+    return ''.join(parts)
+
+
+register_compressor('zlib', zlib.compress, _zlib_decompress)
+if bz2 is not None:
+    register_compressor('bz2', bz2.compress, _bz2_decompress)
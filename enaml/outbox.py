@@ -0,0 +1,455 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Flow control for the messages sent by a session to its client.
+
+A `SessionOutbox` sits between a `Session` and its action socket. It
+limits the number of messages which have been written to the socket but
+not yet acknowledged by the client session to the high watermark of the
+session. Further messages are held in the outbox, where they are handled
+by the `OutboxPolicy` of the session, and are written as the client
+catches up.
+
+Acknowledgements use two session actions. After writing a number of
+messages, and on the cycle of the event loop after any message is
+written, the outbox writes a 'sync' action with the sequence number of
+the last message written. The client session replies to a 'sync' with
+an 'ack' action with the same content.
+
+"""
+from abc import ABCMeta, abstractmethod
+from collections import deque
+from threading import Condition, RLock
+from timeit import default_timer
+
+from .application import Application, deferred_call
+
+
+class OutboxPolicy(object):
+    """ An abstract base class for the policy which handles messages
+    which are held in a congested outbox.
+
+    """
+    __metaclass__ = ABCMeta
+
+    @abstractmethod
+    def enqueue(self, outbox, queue, message):
+        """ Add a message to the queue of a congested outbox.
+
+        This method is called with the lock of the outbox held.
+
+        Parameters
+        ----------
+        outbox : SessionOutbox
+            The outbox which holds the queue.
+
+        queue : deque
+            The queue of the messages which have not been written to
+            the socket, in the order they should be written.
+
+        message : tuple
+            The `(object_id, action, content)` message to add.
+
+        Returns
+        -------
+        result : int
+            The number of messages which were discarded from the queue
+            or not added to it.
+
+        """
+        raise NotImplementedError
+
+
+class BlockPolicy(OutboxPolicy):
+    """ A policy which holds every message in the outbox.
+
+    No messages are lost while the session is open. A thread other than
+    the main thread which sends a message while the outbox is congested
+    is blocked until the outbox is no longer congested, for at most
+    `timeout` seconds, so a client which stops acknowledging cannot
+    hang a worker forever. The main thread cannot block, since it must
+    process the acknowledgements of the client, so messages which it
+    sends are queued without bound. Application code should observe
+    the `congested` state of the session to throttle them.
+
+    """
+    def __init__(self, timeout=5.0):
+        """ Initialize a BlockPolicy.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The maximum time in seconds to block a worker thread. The
+            message is queued once the time has elapsed. The default
+            is 5.0.
+
+        """
+        self.timeout = timeout
+
+    def enqueue(self, outbox, queue, message):
+        """ Add a message to the queue, blocking a worker thread while
+        the outbox is congested.
+
+        """
+        app = Application.instance()
+        if app is not None and not app.is_main_thread():
+            outbox.wait_uncongested(self.timeout)
+            if outbox.closed:
+                return 1
+        queue.append(message)
+        return 0
+
+
+class DropOldestPolicy(OutboxPolicy):
+    """ A policy which bounds the outbox by dropping the oldest queued
+    attribute actions.
+
+    When the queue holds more than `capacity` messages, the oldest
+    queued action whose name starts with one of the `prefixes` is
+    dropped. The default drops `set_*` actions only, since a dropped
+    change to the widget tree would corrupt the client. The client
+    misses the dropped states, so this policy suits values which are
+    refreshed often, such as progress and readouts.
+
+    """
+    def __init__(self, capacity=1000, prefixes=('set_',)):
+        """ Initialize a DropOldestPolicy.
+
+        Parameters
+        ----------
+        capacity : int, optional
+            The maximum number of queued messages. The default is 1000.
+
+        prefixes : tuple, optional
+            The prefixes of the actions which may be dropped. The
+            default is ('set_',).
+
+        """
+        self.capacity = capacity
+        self.prefixes = tuple(prefixes)
+
+    def enqueue(self, outbox, queue, message):
+        """ Add a message to the queue, dropping the oldest droppable
+        message if the queue is full.
+
+        """
+        queue.append(message)
+        if len(queue) <= self.capacity:
+            return 0
+        prefixes = self.prefixes
+        for idx, item in enumerate(queue):
+            if item[1].startswith(prefixes):
+                del queue[idx]
+                return 1
+        return 0
+
+
+class CoalescePolicy(OutboxPolicy):
+    """ A policy which coalesces the queued attribute actions.
+
+    A queued action whose name starts with one of the `prefixes` is
+    replaced when an action with the same object id and name is added,
+    so only the latest content of each attribute is held. The queue is
+    bounded by the number of attributes, plus the other actions, and the
+    client always receives the latest state.
+
+    """
+    def __init__(self, prefixes=('set_',)):
+        """ Initialize a CoalescePolicy.
+
+        Parameters
+        ----------
+        prefixes : tuple, optional
+            The prefixes of the actions which may be coalesced. The
+            default is ('set_',).
+
+        """
+        self.prefixes = tuple(prefixes)
+
+    def enqueue(self, outbox, queue, message):
+        """ Add a message to the queue, replacing a queued message for
+        the same attribute.
+
+        """
+        object_id, action = message[:2]
+        elided = 0
+        if action.startswith(self.prefixes):
+            for idx, item in enumerate(queue):
+                if item[0] == object_id and item[1] == action:
+                    del queue[idx]
+                    elided = 1
+                    break
+        queue.append(message)
+        return elided
+
+
+class SessionOutbox(object):
+    """ An outbox which applies flow control to the messages written
+    to an action socket.
+
+    All methods are thread safe.
+
+    """
+    def __init__(self, socket, session_id, high_watermark, low_watermark,
+                 policy, congestion_changed=None):
+        """ Initialize a SessionOutbox.
+
+        Parameters
+        ----------
+        socket : ActionSocketInterface
+            The socket to which the messages are written.
+
+        session_id : str
+            The identifier of the session, used for the 'sync' actions.
+
+        high_watermark : int
+            The number of unacknowledged and queued messages at which
+            the outbox becomes congested. This is also the maximum
+            number of unacknowledged messages.
+
+        low_watermark : int
+            The number of unacknowledged and queued messages at which
+            the outbox is no longer congested.
+
+        policy : OutboxPolicy
+            The policy which handles the queued messages.
+
+        congestion_changed : callable, optional
+            A callable invoked with the new congested state when it
+            changes. It is invoked without the lock of the outbox held.
+
+        """
+        if high_watermark < 1:
+            raise ValueError('the high watermark must be positive')
+        if not 0 <= low_watermark < high_watermark:
+            raise ValueError('the low watermark must be less than the high')
+        self._socket = socket
+        self._session_id = session_id
+        self._high = high_watermark
+        self._low = low_watermark
+        self._policy = policy
+        self._congestion_changed = congestion_changed
+        self._sync_interval = max(high_watermark // 2, 1)
+        self._cond = Condition(RLock())
+        self._queue = deque()
+        self._written = 0
+        self._acked = 0
+        self._synced = 0
+        self._sync_scheduled = False
+        self._congested = False
+        self._closed = False
+        self._dropped = 0
+
+    #--------------------------------------------------------------------------
+    # Private API
+    #--------------------------------------------------------------------------
+    def _pending(self):
+        """ The number of unacknowledged and queued messages.
+
+        """
+        return self._written - self._acked + len(self._queue)
+
+    def _write(self, message):
+        """ Write a message to the socket. The lock must be held.
+
+        """
+        self._socket.send(*message)
+        self._written += 1
+        if self._written - self._synced >= self._sync_interval:
+            self._sync()
+        elif not self._sync_scheduled:
+            self._sync_scheduled = True
+            deferred_call(self._deferred_sync)
+
+    def _sync(self):
+        """ Write a 'sync' action to the socket. The lock must be held.
+
+        """
+        self._synced = self._written
+        content = {'seq': self._written}
+        self._socket.send(self._session_id, 'sync', content)
+
+    def _deferred_sync(self):
+        """ Write a 'sync' action for the messages written since the
+        last one. This is invoked on the event loop after a write.
+
+        """
+        with self._cond:
+            self._sync_scheduled = False
+            if not self._closed and self._synced < self._written:
+                self._sync()
+
+    def _drain(self):
+        """ Write the queued messages which fit in the window of
+        unacknowledged messages. The lock must be held.
+
+        """
+        queue = self._queue
+        high = self._high
+        while queue and self._written - self._acked < high:
+            self._write(queue.popleft())
+
+    def _update_congested(self):
+        """ Update the congested state. The lock must be held.
+
+        Returns
+        -------
+        result : bool
+            Whether the congested state changed.
+
+        """
+        pending = self._pending()
+        congested = self._congested
+        if self._closed:
+            self._congested = False
+            self._cond.notify_all()
+        elif not congested and pending >= self._high:
+            self._congested = True
+        elif congested and pending <= self._low:
+            self._congested = False
+            self._cond.notify_all()
+        return congested != self._congested
+
+    def _notify(self, changed):
+        """ Invoke the congestion callback if the state changed.
+
+        """
+        if changed and self._congestion_changed is not None:
+            self._congestion_changed(self._congested)
+
+    #--------------------------------------------------------------------------
+    # Public API
+    #--------------------------------------------------------------------------
+    @property
+    def congested(self):
+        """ Whether the outbox is congested.
+
+        """
+        return self._congested
+
+    @property
+    def closed(self):
+        """ Whether the outbox is closed.
+
+        """
+        return self._closed
+
+    def stats(self):
+        """ Get the flow control metrics of the outbox.
+
+        Returns
+        -------
+        result : dict
+            A dict with the keys 'in_flight', the number of messages
+            written but not acknowledged, 'queued', the number of
+            messages held in the outbox, and 'dropped', the number of
+            messages dropped or coalesced by the policy.
+
+        """
+        with self._cond:
+            return {
+                'in_flight': self._written - self._acked,
+                'queued': len(self._queue),
+                'dropped': self._dropped,
+            }
+
+    def send(self, object_id, action, content):
+        """ Send a message through the outbox.
+
+        The message is written to the socket if the window of
+        unacknowledged messages is open and no messages are queued.
+        Otherwise, it is handed to the policy of the outbox. Messages
+        sent after the outbox is closed are dropped.
+
+        """
+        message = (object_id, action, content)
+        with self._cond:
+            if self._closed:
+                self._dropped += 1
+                return
+            queue = self._queue
+            if not queue and self._written - self._acked < self._high:
+                self._write(message)
+            else:
+                self._dropped += self._policy.enqueue(self, queue, message)
+                if not self._closed:
+                    self._drain()
+            changed = self._update_congested()
+        self._notify(changed)
+
+    def acknowledge(self, seq):
+        """ Acknowledge the messages received by the client.
+
+        Parameters
+        ----------
+        seq : int
+            The sequence number of the last message received by the
+            client, as given by the 'sync' action.
+
+        """
+        with self._cond:
+            if self._closed:
+                return
+            self._acked = min(max(self._acked, seq), self._written)
+            self._drain()
+            changed = self._update_congested()
+        self._notify(changed)
+
+    def flush(self):
+        """ Write all of the queued messages to the socket, regardless
+        of the window of unacknowledged messages.
+
+        """
+        with self._cond:
+            queue = self._queue
+            while queue:
+                self._write(queue.popleft())
+            changed = self._update_congested()
+        self._notify(changed)
+
+    def close(self):
+        """ Flush the queued messages and close the outbox.
+
+        This is called when the session is closed. The outbox is no
+        longer congested once it is closed, so any blocked threads are
+        released, and later messages are dropped.
+
+        """
+        with self._cond:
+            queue = self._queue
+            while queue:
+                self._write(queue.popleft())
+            self._closed = True
+            changed = self._update_congested()
+        self._notify(changed)
+
+    def wait_uncongested(self, timeout=None):
+        """ Block the calling thread until the outbox is no longer
+        congested.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The maximum time to wait in seconds. The default waits
+            until the outbox is no longer congested.
+
+        Returns
+        -------
+        result : bool
+            True if the outbox is no longer congested, False if the
+            time elapsed first.
+
+        """
+        with self._cond:
+            if timeout is None:
+                while self._congested:
+                    self._cond.wait()
+            else:
+                end = default_timer() + timeout
+                while self._congested:
+                    remaining = end - default_timer()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            return not self._congested
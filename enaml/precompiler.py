@@ -0,0 +1,174 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Command-line tool to precompile the .enaml files of a package tree.
+
+"""
+from multiprocessing import Pool, cpu_count
+import optparse
+import os
+import sys
+import time
+import traceback
+
+from enaml.core.import_hooks import CACHEDIR, EnamlImporter, make_file_info
+
+
+#------------------------------------------------------------------------------
+# Precompiler Helpers
+#------------------------------------------------------------------------------
+def find_enaml_files(paths):
+    """ Yield the full paths of the .enaml files found under the paths.
+
+    Directories are walked recursively, skipping the cache directories
+    created by the import hooks. Paths which name a file are yielded
+    as-is, provided they are .enaml files.
+
+    Parameters
+    ----------
+    paths : iterable
+        An iterable of file and directory paths to search.
+
+    """
+    ext = os.path.extsep + 'enaml'
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                if CACHEDIR in dirs:
+                    dirs.remove(CACHEDIR)
+                dirs.sort()
+                for fn in sorted(files):
+                    if fn.endswith(ext):
+                        yield os.path.join(root, fn)
+        elif path.endswith(ext):
+            yield path
+
+
+def compile_file(path, force=False):
+    """ Compile a single .enaml file and write its cache file.
+
+    This function is run in the worker processes of the precompiler.
+    It never raises; failures are reported through the return value
+    so that a single broken file does not abort the whole run.
+
+    Parameters
+    ----------
+    path : str
+        The path to the .enaml file to compile.
+
+    force : bool, optional
+        Whether to recompile the file even if its cache is current.
+        The default is False.
+
+    Returns
+    -------
+    result : (path, status, elapsed, error)
+        The path of the file, one of 'compiled', 'skipped' or 'failed',
+        the time in seconds spent compiling, and the error text for a
+        failure or None.
+
+    """
+    start = time.time()
+    try:
+        file_info = make_file_info(os.path.abspath(path))
+        importer = EnamlImporter(file_info)
+        src_mod_time = int(os.path.getmtime(file_info.src_path))
+        if not force and importer._is_cache_current(file_info, src_mod_time):
+            return (path, 'skipped', time.time() - start, None)
+        code, digest = importer._compile_source(file_info)
+        if not importer._write_cache(code, src_mod_time, digest, file_info):
+            msg = 'could not write cache file %s' % file_info.cache_path
+            return (path, 'failed', time.time() - start, msg)
+    except Exception:
+        return (path, 'failed', time.time() - start, traceback.format_exc())
+    return (path, 'compiled', time.time() - start, None)
+
+
+def _compile_file_star(args):
+    """ Unpack the argument tuple for `compile_file`.
+
+    Pool.imap only passes a single argument to the worker function.
+
+    """
+    return compile_file(*args)
+
+
+def compile_all(paths, jobs=None, force=False):
+    """ Compile all of the .enaml files found under the given paths.
+
+    Parameters
+    ----------
+    paths : iterable
+        An iterable of file and directory paths to compile.
+
+    jobs : int, optional
+        The number of worker processes to use. The default is the
+        number of cpus. A value of 1 compiles in the current process.
+
+    force : bool, optional
+        Whether to recompile files with current caches. The default
+        is False.
+
+    Returns
+    -------
+    result : generator
+        A generator which yields the result tuple of `compile_file`
+        for each file, in order of completion.
+
+    """
+    work = [(path, force) for path in find_enaml_files(paths)]
+    if jobs is None:
+        jobs = cpu_count()
+    jobs = max(1, min(jobs, len(work)))
+    if jobs == 1:
+        for args in work:
+            yield _compile_file_star(args)
+        return
+    pool = Pool(jobs)
+    try:
+        for result in pool.imap_unordered(_compile_file_star, work):
+            yield result
+    finally:
+        pool.close()
+        pool.join()
+
+
+def main():
+    usage = 'usage: %prog [options] path [path ...]'
+    parser = optparse.OptionParser(usage=usage, description=__doc__)
+    parser.add_option('-j', '--jobs', type='int', default=None,
+                      help='The number of worker processes to use')
+    parser.add_option('-f', '--force', action='store_true', default=False,
+                      help='Recompile files even if their cache is current')
+    parser.add_option('-q', '--quiet', action='store_true', default=False,
+                      help='Only report failures')
+
+    options, args = parser.parse_args()
+    if len(args) == 0:
+        parser.error('No path specified')
+
+    counts = {'compiled': 0, 'skipped': 0, 'failed': 0}
+    total_time = 0.0
+    start = time.time()
+    for path, status, elapsed, error in compile_all(
+            args, options.jobs, options.force):
+        counts[status] += 1
+        total_time += elapsed
+        if status == 'failed':
+            print >> sys.stderr, 'failed    %s\n%s' % (path, error)
+        elif not options.quiet:
+            print '%-9s %8.1fms  %s' % (status, elapsed * 1000.0, path)
+
+    if not options.quiet:
+        msg = '%d compiled, %d skipped, %d failed in %.2fs (%.2fs compiling)'
+        print msg % (
+            counts['compiled'], counts['skipped'], counts['failed'],
+            time.time() - start, total_time,
+        )
+    if counts['failed']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -264,6 +264,9 @@ class QtNotebook(QtConstraintsWidget):
     """ A Qt implementation of an Enaml Notebook.
 
     """
+    #: The initial selected page index in the notebook.
+    _initial_index = 0
+
     #--------------------------------------------------------------------------
     # Setup methods
     #--------------------------------------------------------------------------
@@ -288,6 +291,7 @@ class QtNotebook(QtConstraintsWidget):
         self.set_tab_position(tree['tab_position'])
         self.set_tabs_closable(tree['tabs_closable'])
         self.set_tabs_movable(tree['tabs_movable'])
+        self._initial_index = tree['index']
 
     def init_layout(self):
         """ Handle the layout initialization for the notebook.
@@ -299,6 +303,10 @@ class QtNotebook(QtConstraintsWidget):
             if isinstance(child, QtPage):
                 widget.addPage(child.widget())
         widget.layoutRequested.connect(self.on_layout_requested)
+        widget.currentChanged.connect(self.on_current_changed)
+        with self.loopback_guard('index'):
+            self.set_index(self._initial_index)
+            self.on_current_changed(widget.currentIndex())
 
     #--------------------------------------------------------------------------
     # Child Events
@@ -328,9 +336,34 @@ class QtNotebook(QtConstraintsWidget):
         """
         self.size_hint_updated()
 
+    def on_current_changed(self, index):
+        """ Handle the `currentChanged` signal from the QNotebook.
+
+        The page which is shown is asked to materialize its content, in
+        case the content was deferred by a lazy notebook. The index of
+        the page is sent to the Enaml widget.
+
+        """
+        page = self.widget().widget(index)
+        if page is not None:
+            for idx, child in enumerate(self.pages()):
+                if child.widget() is page:
+                    child.materialize()
+                    if 'index' not in self.loopback_guard:
+                        content = {'index': idx}
+                        self.send_action('index_changed', content)
+                    break
+
     #--------------------------------------------------------------------------
     # Message Handlers
     #--------------------------------------------------------------------------
+    def on_action_set_index(self, content):
+        """ Handle the 'set_index' action from the Enaml widget.
+
+        """
+        with self.loopback_guard('index'):
+            self.set_index(content['index'])
+
     def on_action_set_tab_style(self, content):
         """ Handle the 'set_tab_style' action from the Enaml widget.
 
@@ -358,6 +391,25 @@ class QtNotebook(QtConstraintsWidget):
     #--------------------------------------------------------------------------
     # Widget Update Methods
     #--------------------------------------------------------------------------
+    def pages(self):
+        """ Get the QtPage children of the notebook, in order.
+
+        """
+        return [c for c in self.children() if isinstance(c, QtPage)]
+
+    def set_index(self, index):
+        """ Select the page at the given index in the notebook pages.
+
+        A hidden page has no tab, and is not selected.
+
+        """
+        pages = self.pages()
+        if 0 <= index < len(pages):
+            widget = self.widget()
+            page = pages[index].widget()
+            if widget.indexOf(page) != -1:
+                widget.setCurrentWidget(page)
+
     def set_tab_style(self, style):
         """ Set the tab style for the tab bar in the widget.
 
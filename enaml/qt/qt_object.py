@@ -5,7 +5,9 @@
 import functools
 import logging
 
-from enaml.utils import LoopbackGuard, make_dispatcher
+from enaml.utils import (
+    LoopbackGuard, apply_splices, make_dispatcher, sequence_checksum,
+)
 
 from .qt.QtCore import QObject
 from .q_deferred_caller import deferredCall
@@ -497,6 +499,23 @@ class QtObject(object):
         of the event loop.
 
         """
+        # The new order of the children is given by a list of splices
+        # to apply to the current order, or by the full order. The
+        # splices refer to the current children, so the order is
+        # computed before any children are reparented. If the current
+        # children differ from those of the server, the splices cannot
+        # be applied, and the full order is requested instead.
+        if 'splices' in content:
+            old_ids = [child._object_id for child in self._children]
+            base = content.get('base')
+            if base is None or base == sequence_checksum(old_ids):
+                order = apply_splices(old_ids, content['splices'])
+            else:
+                order = None
+                self.send_action('resync_children', {})
+        else:
+            order = content['order']
+
         # Unparent the children being removed. Destroying a widget is
         # handled through a separate message.
         lookup = self._session.lookup
@@ -513,15 +532,18 @@ class QtObject(object):
                 child.set_parent(self)
             else:
                 child = self._session.build(tree, self)
-                child.initialize()
+                if child is not None:
+                    child.initialize()
 
         # Update the ordering of the children based on the order given
         # in the message. If the given order does not include all of
         # the current children, then the ones not included will be
         # appended to the end of the new list in an undefined order.
+        if order is None:
+            return
         ordered = []
         curr_set = set(self._children)
-        for object_id in content['order']:
+        for object_id in order:
             child = lookup(object_id)
             if child is not None and child._parent is self:
                 ordered.append(child)
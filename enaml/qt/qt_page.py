@@ -251,6 +251,10 @@ class QtPage(QtWidget):
     """ A Qt implementation of an Enaml notebook Page.
 
     """
+    #: Whether the content of the page has been deferred by the
+    #: server until the page is first shown.
+    _deferred = False
+
     #--------------------------------------------------------------------------
     # Setup Methods
     #--------------------------------------------------------------------------
@@ -267,6 +271,7 @@ class QtPage(QtWidget):
         super(QtPage, self).create(tree)
         self.set_title(tree['title'])
         self.set_closable(tree['closable'])
+        self._deferred = tree['deferred']
         self.widget().pageClosed.connect(self.on_page_closed)
 
     def init_layout(self):
@@ -295,6 +300,18 @@ class QtPage(QtWidget):
                 widget = child.widget()
         return widget
 
+    def materialize(self):
+        """ Request the deferred content of the page from the server.
+
+        This method is called by the parent notebook when the page is
+        shown. It is a no-op unless the content of the page has been
+        deferred by a lazy notebook.
+
+        """
+        if self._deferred:
+            self._deferred = False
+            self.send_action('materialize', {})
+
     #--------------------------------------------------------------------------
     # Child Events
     #--------------------------------------------------------------------------
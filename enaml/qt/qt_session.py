@@ -104,6 +104,52 @@ class QtSession(object):
                 windows.append(window)
                 window.initialize()
 
+    def open_chunks(self, chunks):
+        """ Open the session using a chunked snapshot.
+
+        Parameters
+        ----------
+        chunks : iterable of dicts
+            The chunks of the snapshot, as generated by the server
+            session's `snapshot_chunks` method. Each chunk is built
+            before the next chunk is requested.
+
+        """
+        for chunk in chunks:
+            self.build_chunk(chunk)
+
+    def build_chunk(self, chunk):
+        """ Build the objects of a single chunk of a snapshot.
+
+        Top-level trees are added to the windows of the session, and
+        the windows which are complete after the chunk are initialized.
+
+        Parameters
+        ----------
+        chunk : dict
+            A chunk of the snapshot, as generated by the server
+            session's `snapshot_chunks` method.
+
+        """
+        lookup = self.lookup
+        windows = self._windows
+        for parent_id, tree in chunk['trees']:
+            if parent_id is None:
+                window = self.build(tree, None)
+                if window is not None:
+                    windows.append(window)
+            else:
+                parent = lookup(parent_id)
+                if parent is None:
+                    msg = 'Invalid parent id in snapshot chunk: %s'
+                    logger.error(msg % parent_id)
+                else:
+                    self.build(tree, parent)
+        for object_id in chunk['complete']:
+            window = lookup(object_id)
+            if window is not None:
+                window.initialize()
+
     def activate(self, socket):
         """ Active the session and its windows.
 
@@ -159,6 +205,23 @@ class QtSession(object):
             self.build(child, obj)
         return obj
 
+    def destroy(self):
+        """ Destroy the windows of the session and release its socket.
+
+        This is called when the session is closed, and when the session
+        fails to open.
+
+        """
+        for window in self._windows:
+            window.destroy()
+        self._windows = []
+        self._registered_objects = {}
+        self._resource_manager = None
+        socket = self._socket
+        if socket is not None:
+            socket.on_message(None)
+            self._socket = None
+
     def register(self, obj):
         """ Register an object with the session.
 
@@ -299,6 +362,15 @@ class QtSession(object):
         else:
             manager.on_fail(req_id, url)
 
+    def on_action_sync(self, content):
+        """ Handle the 'sync' action sent by the Enaml session.
+
+        The messages sent before the sync have been processed, so the
+        sync is acknowledged to release the flow control of the session.
+
+        """
+        self.send(self._session_id, 'ack', content)
+
     def on_action_message_batch(self, content):
         """ Handle the 'message_batch' action sent by the Enaml session.
 
@@ -330,11 +402,5 @@ class QtSession(object):
         """ Handle the 'close' action sent by the Enaml session.
 
         """
-        for window in self._windows:
-            window.destroy()
-        self._windows = []
-        self._registered_objects = {}
-        self._resource_manager = None
-        self._socket.on_message(None)
-        self._socket = None
+        self.destroy()
 
@@ -2,13 +2,19 @@
 #  Copyright (c) 2012, Enthought, Inc.
 #  All rights reserved.
 #------------------------------------------------------------------------------
+from collections import OrderedDict
 import logging
+from threading import Lock
 
-from traits.api import HasTraits, Instance, List, Str, ReadOnly, Enum, Property
+from traits.api import (
+    HasTraits, Instance, List, Str, ReadOnly, Enum, Property, Float, Bool, Int,
+)
 
+from enaml.core.messenger import snapshot_chunks
 from enaml.widgets.window import Window
 
 from .application import deferred_call
+from .outbox import BlockPolicy, OutboxPolicy, SessionOutbox
 from .resource_manager import ResourceManager
 from .signaling import Signal
 from .socket_interface import ActionSocketInterface
@@ -24,6 +30,13 @@ logger = logging.getLogger(__name__)
 BATCH_ACTIONS = set(['destroy', 'children_changed', 'relayout'])
 
 
+#: The prefix of the actions which may be coalesced when a session has
+#: `coalesce_attributes` enabled. These are the actions sent by the
+#: attribute publishers of the objects, where only the latest content
+#: for an object has an effect on the client.
+COALESCE_PREFIX = 'set_'
+
+
 #: The dispatch function for action dispatching on the session.
 dispatch_action = make_dispatcher('on_action_', logger)
 
@@ -103,6 +116,103 @@ class DeferredMessageBatch(object):
         self._tick += 1
 
 
+class MessageCoalescer(object):
+    """ A class which coalesces messages with a last-write-wins policy.
+
+    Messages are added with a key, and only the latest message for each
+    key is kept. A message which replaces a pending message is moved to
+    the end of the queue, so that the released messages are in the order
+    of their last write. The `triggered` signal is fired once on the
+    next cycle of the event loop after messages are added. Messages may
+    be added from any thread.
+
+    """
+    #: A signal emitted on the cycle of the event loop after messages
+    #: are added, when the owner should consume the messages.
+    triggered = Signal()
+
+    def __init__(self):
+        """ Initialize a MessageCoalescer.
+
+        """
+        self._messages = OrderedDict()
+        self._lock = Lock()
+        self._scheduled = False
+        self._queued = 0
+        self._elided = 0
+
+    #--------------------------------------------------------------------------
+    # Private API
+    #--------------------------------------------------------------------------
+    def _trigger(self):
+        """ A private handler method which fires the `triggered` signal.
+
+        """
+        with self._lock:
+            self._scheduled = False
+            pending = bool(self._messages)
+        if pending:
+            self.triggered.emit()
+
+    #--------------------------------------------------------------------------
+    # Public API
+    #--------------------------------------------------------------------------
+    @property
+    def queued(self):
+        """ The total number of messages added to the coalescer.
+
+        """
+        return self._queued
+
+    @property
+    def elided(self):
+        """ The total number of messages which were replaced by a later
+        message with the same key, and were never released.
+
+        """
+        return self._elided
+
+    def release(self):
+        """ Release the pending messages of the coalescer.
+
+        Returns
+        -------
+        result : list
+            The list of pending messages in the order of their last
+            write.
+
+        """
+        with self._lock:
+            messages = self._messages.values()
+            self._messages = OrderedDict()
+        return messages
+
+    def add_message(self, key, message):
+        """ Add a message to the coalescer.
+
+        Parameters
+        ----------
+        key : object
+            The hashable key of the message. A pending message with
+            the same key is discarded.
+
+        message : object
+            The message object to add to the coalescer.
+
+        """
+        with self._lock:
+            messages = self._messages
+            if key in messages:
+                del messages[key]
+                self._elided += 1
+            messages[key] = message
+            self._queued += 1
+            schedule = not self._scheduled
+            self._scheduled = True
+        if schedule:
+            deferred_call(self._trigger)
+
+
 class URLReply(object):
     """ A reply object for sending a loaded resource to a client session.
 
@@ -193,6 +303,62 @@ class Session(HasTraits):
         'closed',
     )
 
+    #: The fraction of the opening work which has been completed, from
+    #: 0.0 to 1.0. This is updated by the application as the session is
+    #: opened, and is most useful when the session is opened in time
+    #: slices. This should not be manipulated directly by user code.
+    open_progress = Float(0.0)
+
+    #: Whether the attribute actions of the objects of the session are
+    #: coalesced. When enabled, the `set_*` actions are queued by object
+    #: id and action, and only the latest content for each is sent to
+    #: the client on the next cycle of the event loop. This bounds the
+    #: traffic of attributes which are updated much faster than they
+    #: can be displayed, such as the value of a progress bar. The queue
+    #: is flushed before any other message is sent, so the order of the
+    #: coalesced actions relative to the other actions is preserved.
+    coalesce_attributes = Bool(False)
+
+    #: A read-only property which holds the message coalescing metrics
+    #: of the session as a dict with the keys 'queued', the number of
+    #: actions which were coalesced, and 'elided', the number of those
+    #: actions which were replaced by a later action and never sent.
+    coalesce_stats = Property(fget=lambda self: self._coalesce_stats())
+
+    #: The number of unacknowledged and queued messages at which the
+    #: session becomes congested. This is also the maximum number of
+    #: messages which are written to the socket before the client
+    #: acknowledges them. The remaining messages are held in the outbox
+    #: of the session and handled by the `outbox_policy`. The default
+    #: of 0 disables flow control. This must be set before the session
+    #: is activated.
+    outbox_high_watermark = Int(0)
+
+    #: The number of unacknowledged and queued messages at which the
+    #: session is no longer congested. This must be less than the high
+    #: watermark. The default is 0.
+    outbox_low_watermark = Int(0)
+
+    #: The policy which handles the messages held in the outbox while
+    #: the client catches up. The default is a BlockPolicy. See the
+    #: `enaml.outbox` module for the other policies.
+    outbox_policy = Instance(OutboxPolicy)
+    def _outbox_policy_default(self):
+        return BlockPolicy()
+
+    #: Whether the client has fallen behind the session. This is True
+    #: once the number of unacknowledged and queued messages reaches the
+    #: high watermark, and False once it falls to the low watermark.
+    #: Application code may observe this value to throttle its updates.
+    #: It may change on the thread which sends a message. This should
+    #: not be manipulated directly by user code.
+    congested = Bool(False)
+
+    #: A read-only property which holds the flow control metrics of the
+    #: session as a dict with the keys 'in_flight', 'queued' and
+    #: 'dropped'. See `SessionOutbox.stats` for their meaning.
+    outbox_stats = Property(fget=lambda self: self._outbox_stats())
+
     #: A read-only property which is True if the session is inactive.
     is_inactive = Property(fget=lambda self: self.state == 'inactive')
 
@@ -227,6 +393,19 @@ class Session(HasTraits):
         batch.triggered.connect(self._on_batch_triggered)
         return batch
 
+    #: The private message coalescer used for the attribute actions of
+    #: the session.
+    _coalescer = Instance(MessageCoalescer)
+    def __coalescer_default(self):
+        coalescer = MessageCoalescer()
+        coalescer.triggered.connect(self._on_coalescer_triggered)
+        return coalescer
+
+    #: The private outbox which applies flow control to the messages of
+    #: the session. This is created on activation when the high
+    #: watermark is set.
+    _outbox = Instance(SessionOutbox)
+
     #--------------------------------------------------------------------------
     # Class API
     #--------------------------------------------------------------------------
@@ -267,6 +446,55 @@ class Session(HasTraits):
         content = {'batch': self._batch.release()}
         self.send(self.session_id, 'message_batch', content)
 
+    def _on_coalescer_triggered(self):
+        """ A signal handler for the `triggered` signal on the message
+        coalescer.
+
+        """
+        self._flush_coalesced()
+
+    def _flush_coalesced(self):
+        """ Send the pending messages of the message coalescer.
+
+        """
+        messages = self._coalescer.release()
+        if self.is_active:
+            for object_id, action, content in messages:
+                self._write(object_id, action, content)
+
+    def _write(self, object_id, action, content):
+        """ Write a message to the outbox, or directly to the socket
+        if flow control is disabled.
+
+        """
+        outbox = self._outbox
+        if outbox is not None:
+            outbox.send(object_id, action, content)
+        else:
+            self.socket.send(object_id, action, content)
+
+    def _set_congested(self, congested):
+        """ The congestion callback of the session outbox.
+
+        """
+        self.congested = congested
+
+    def _outbox_stats(self):
+        """ The getter for the `outbox_stats` property.
+
+        """
+        outbox = self._outbox
+        if outbox is None:
+            return {'in_flight': 0, 'queued': 0, 'dropped': 0}
+        return outbox.stats()
+
+    def _coalesce_stats(self):
+        """ The getter for the `coalesce_stats` property.
+
+        """
+        coalescer = self._coalescer
+        return {'queued': coalescer.queued, 'elided': coalescer.elided}
+
     #--------------------------------------------------------------------------
     # Abstract API
     #--------------------------------------------------------------------------
@@ -308,12 +536,41 @@ class Session(HasTraits):
         session_id : str
             The unique identifier to use for this session.
 
+        """
+        for step in self.iter_open(session_id):
+            pass
+
+    def iter_open(self, session_id):
+        """ A generator which opens the session incrementally.
+
+        This generator implements `open`. It yields after `on_open`
+        returns and after each object in the windows is initialized, so
+        that the application may open a large session over several
+        cycles of the event loop. The method should never be called by
+        user code.
+
+        Parameters
+        ----------
+        session_id : str
+            The unique identifier to use for this session.
+
+        Returns
+        -------
+        result : generator
+            A generator which yields the fraction of the objects in the
+            windows which have been initialized.
+
         """
         self.session_id = session_id
         self.state = 'opening'
         self.on_open()
+        total = sum(1 for window in self.windows for obj in window.traverse())
+        done = 0
+        yield 0.0
         for window in self.windows:
-            window.initialize()
+            for step in window.iter_initialize():
+                done += 1
+                yield min(float(done) / total, 1.0)
         self.state = 'opened'
 
     def activate(self, socket):
@@ -336,6 +593,12 @@ class Session(HasTraits):
         for window in self.windows:
             window.activate(self)
         self.socket = socket
+        if self.outbox_high_watermark > 0:
+            self._outbox = SessionOutbox(
+                socket, self.session_id, self.outbox_high_watermark,
+                self.outbox_low_watermark, self.outbox_policy,
+                self._set_congested,
+            )
         socket.on_message(self.on_message)
         self.state = 'active'
 
@@ -343,8 +606,9 @@ class Session(HasTraits):
         """ Called by the application when the session is closed.
 
         This method will call the `on_close` method which can optionally
-        be implemented by subclasses. The method should never be called
-        by user code.
+        be implemented by subclasses. It may also be called to close a
+        session which is still being opened incrementally. The method
+        should never be called by user code.
 
         """
         self.send(self.session_id, 'close', {})
@@ -354,8 +618,12 @@ class Session(HasTraits):
             window.destroy()
         self.windows = []
         self._registered_objects = {}
-        self.socket.on_message(None)
-        self.socket = None
+        if self._outbox is not None:
+            self._outbox.close()
+            self._outbox = None
+        if self.socket is not None:
+            self.socket.on_message(None)
+            self.socket = None
         self.state = 'closed'
 
     def snapshot(self):
@@ -370,6 +638,28 @@ class Session(HasTraits):
         """
         return [window.snapshot() for window in self.windows]
 
+    def snapshot_chunks(self, chunk_size=500):
+        """ Get a snapshot of the windows of this session in chunks.
+
+        This is a streaming alternative to `snapshot` for very large
+        trees. The chunks are generated lazily, so a client can build
+        the objects of one chunk before the next is serialized. See
+        `enaml.core.messenger.snapshot_chunks` for the chunk format.
+
+        Parameters
+        ----------
+        chunk_size : int, optional
+            The maximum number of objects in a chunk. The default is
+            500.
+
+        Returns
+        -------
+        result : generator
+            A generator which yields the chunks of the snapshot.
+
+        """
+        return snapshot_chunks(self.windows, chunk_size)
+
     def register(self, obj):
         """ Register an object with the session.
 
@@ -405,7 +695,8 @@ class Session(HasTraits):
         """ Send a message to a client object.
 
         This method is called by the `Object` instances owned by this
-        session to send messages to their client implementations.
+        session to send messages to their client implementations. The
+        messages are batched or coalesced according to their action.
 
         Parameters
         ----------
@@ -422,8 +713,14 @@ class Session(HasTraits):
         if self.is_active:
             if action in BATCH_ACTIONS:
                 self._batch.add_message((object_id, action, content))
+            elif (self.coalesce_attributes and
+                  action.startswith(COALESCE_PREFIX)):
+                key = (object_id, action)
+                message = (object_id, action, content)
+                self._coalescer.add_message(key, message)
             else:
-                self.socket.send(object_id, action, content)
+                self._flush_coalesced()
+                self._write(object_id, action, content)
 
     def on_message(self, object_id, action, content):
         """ Receive a message sent to an object owned by this session.
@@ -460,6 +757,14 @@ class Session(HasTraits):
     #--------------------------------------------------------------------------
     # Action Handlers
     #--------------------------------------------------------------------------
+    def on_action_ack(self, content):
+        """ Handle the 'ack' action from the client session.
+
+        """
+        outbox = self._outbox
+        if outbox is not None:
+            outbox.acknowledge(content['seq'])
+
     def on_action_url_request(self, content):
         """ Handle the 'url_request' action from the client session.
 
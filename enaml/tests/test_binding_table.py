@@ -0,0 +1,54 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import unittest
+
+from enaml.core.binding_table import (
+    EMPTY_TABLE, table_get, table_set, table_items,
+)
+
+
+class TestBindingTable(unittest.TestCase):
+
+    def test_get_set(self):
+        """ Test storing and retrieving values.
+
+        """
+        table = table_set(EMPTY_TABLE, 'a', 1)
+        table = table_set(table, 'b', 2)
+        self.assertEqual(table_get(table, 'a'), 1)
+        self.assertEqual(table_get(table, 'b'), 2)
+        self.assertIsNone(table_get(table, 'c'))
+        self.assertEqual(table_items(table), [('a', 1), ('b', 2)])
+        self.assertEqual(len(table), 3)
+        self.assertEqual(EMPTY_TABLE[1:], ())
+
+    def test_replace_and_unbind(self):
+        """ Test replacing a value and unbinding a name.
+
+        """
+        table = table_set(EMPTY_TABLE, 'a', 1)
+        table = table_set(table, 'b', 2)
+        replaced = table_set(table, 'a', 3)
+        self.assertIs(replaced[0], table[0])
+        self.assertEqual(table_get(replaced, 'a'), 3)
+        self.assertEqual(table_get(table, 'a'), 1)
+        unbound = table_set(replaced, 'a', None)
+        self.assertIsNone(table_get(unbound, 'a'))
+        self.assertEqual(table_items(unbound), [('b', 2)])
+
+    def test_shared_layouts(self):
+        """ Test that tables bound in the same order share a layout.
+
+        """
+        table1 = table_set(table_set(EMPTY_TABLE, 'a', 1), 'b', 2)
+        table2 = table_set(table_set(EMPTY_TABLE, 'a', 3), 'b', 4)
+        table3 = table_set(table_set(EMPTY_TABLE, 'b', 5), 'a', 6)
+        self.assertIs(table1[0], table2[0])
+        self.assertIsNot(table1[0], table3[0])
+        self.assertEqual(table_get(table3, 'a'), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import unittest
+
+from traits.api import Int
+
+from enaml.core.declarative import Declarative
+from enaml.core.dynamic_scope import DynamicScope, Nonlocals
+
+
+class Outer(Declarative):
+
+    value = Int(1)
+
+
+class Other(Declarative):
+
+    value = Int(2)
+
+
+class TestScopeCache(unittest.TestCase):
+
+    def setUp(self):
+        self.root = Outer()
+        self.mid = Declarative(self.root)
+        self.leaf = Declarative(self.mid)
+        self.scope = DynamicScope(self.leaf, {}, {}, None)
+
+    def test_cached_lookup(self):
+        """ Test that resolved names are cached on the object.
+
+        """
+        self.assertEqual(self.scope['value'], 1)
+        self.assertIs(self.leaf._scope_cache['value'], self.root)
+        self.root.value = 3
+        self.assertEqual(self.scope['value'], 3)
+
+    def test_cached_miss(self):
+        """ Test that unresolved names are cached on the object.
+
+        """
+        self.assertRaises(KeyError, self.scope.__getitem__, 'len')
+        self.assertIsNone(self.leaf._scope_cache['len'])
+        self.assertRaises(KeyError, self.scope.__getitem__, 'len')
+        self.assertNotIn('len', self.scope)
+
+    def test_reparent(self):
+        """ Test that reparenting invalidates the cache.
+
+        """
+        self.assertEqual(self.scope['value'], 1)
+        other = Other()
+        self.mid.set_parent(other)
+        self.assertEqual(self.scope['value'], 2)
+        other.insert_children(None, [Outer(), self.leaf])
+        self.assertEqual(self.scope['value'], 2)
+        self.leaf.set_parent(None)
+        self.assertRaises(KeyError, self.scope.__getitem__, 'value')
+
+    def test_unrelated_reparent(self):
+        """ Test that reparenting another subtree keeps the cache.
+
+        """
+        self.assertEqual(self.scope['value'], 1)
+        cache = self.leaf._scope_cache
+        Declarative(self.mid)
+        Declarative(Other()).set_parent(self.root)
+        self.assertIs(self.leaf._scope_cache, cache)
+        self.mid.set_parent(Other())
+        self.assertIsNone(self.leaf._scope_cache)
+        self.assertEqual(self.scope['value'], 2)
+
+    def test_scope_nonlocals(self):
+        """ Test the nonlocals provided by the scope.
+
+        """
+        self.assertEqual(self.scope['nonlocals'].value, 1)
+        scope = DynamicScope(self.leaf, {}, {'nonlocals': 42})
+        self.assertEqual(scope['nonlocals'], 42)
+
+    def test_nonlocals(self):
+        """ Test that nonlocals use the resolution cache.
+
+        """
+        nonlocals = Nonlocals(self.leaf, None)
+        self.assertEqual(nonlocals.value, 1)
+        self.assertIs(self.leaf._scope_cache['value'], self.root)
+        nonlocals.value = 4
+        self.assertEqual(self.root.value, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import unittest
+
+from enaml.core.binding_table import table_get, table_items
+from enaml.core.operator_context import OperatorContext
+from enaml.core.operators import OPERATORS
+from enaml.tests.utils import compile_source
+
+
+SOURCE = """\
+from enaml.core.declarative import Declarative
+
+enamldef Base(Declarative):
+    attr a = 1
+    attr b << 2 + 3
+    attr c = 'c'
+    attr d = 0
+    attr changed = []
+    d ::
+        changed.append(d)
+
+enamldef Main(Base):
+    a = -1.5
+    b = (1, u'x', (None, True))
+    c = 'c'.upper()
+"""
+
+
+def bound_names(obj):
+    """ Get the sorted names of the bound expressions of an object.
+
+    """
+    return sorted(name for name, _ in table_items(obj._expressions))
+
+
+class TestLiteralFolding(unittest.TestCase):
+
+    def setUp(self):
+        self.module = compile_source(SOURCE)
+
+    def test_literal_values(self):
+        """ Test that folded literals provide the attribute values.
+
+        """
+        base = self.module.Base()
+        self.assertEqual(base.a, 1)
+        self.assertEqual(base.b, 5)
+        self.assertEqual(base.c, 'c')
+        main = self.module.Main()
+        self.assertEqual(main.a, -1.5)
+        self.assertEqual(main.b, (1, u'x', (None, True)))
+        self.assertEqual(main.c, 'C')
+
+    def test_no_expressions(self):
+        """ Test that literals do not bind expression objects.
+
+        """
+        base = self.module.Base()
+        self.assertEqual(bound_names(base), ['b', 'changed'])
+        main = self.module.Main()
+        self.assertEqual(bound_names(main), ['c', 'changed'])
+
+    def test_no_notification(self):
+        """ Test that literal defaults are assigned quietly.
+
+        """
+        main = self.module.Main()
+        self.assertEqual(main.changed, [])
+        main.d = 12
+        self.assertEqual(main.changed, [12])
+
+    def test_custom_context(self):
+        """ Test a context without the literal operator.
+
+        """
+        ops = dict(OPERATORS)
+        del ops['__operator_Equal_Literal__']
+        with OperatorContext(ops):
+            main = self.module.Main()
+        self.assertEqual(main.a, -1.5)
+        names = ['a', 'b', 'c', 'changed', 'd']
+        self.assertEqual(bound_names(main), names)
+
+
+SHARED_SOURCE = """\
+from enaml.core.declarative import Declarative
+
+enamldef Sub(Declarative):
+    id: sub
+    attr value
+    attr label << 'value %s' % sub.value
+
+enamldef Main(Declarative):
+    id: main
+    attr a = 1
+    attr b := a
+    attr c << a * 2
+    Sub:
+        value := main.c
+"""
+
+
+class TestSharedFunctions(unittest.TestCase):
+
+    def setUp(self):
+        self.module = compile_source(SHARED_SOURCE)
+
+    def test_shared_functions(self):
+        """ Test that instances share the functions of their bindings.
+
+        """
+        main1 = self.module.Main()
+        main2 = self.module.Main()
+        for name in ('b', 'c'):
+            func1 = table_get(main1._expressions, name)._func
+            func2 = table_get(main2._expressions, name)._func
+            self.assertIs(func1, func2)
+        sub1 = main1.children[0]
+        sub2 = main2.children[0]
+        func1 = table_get(sub1._expressions, 'value')._func
+        func2 = table_get(sub2._expressions, 'value')._func
+        self.assertIs(func1, func2)
+        self.assertIs(func1._update, func2._update)
+
+    def test_shared_expressions(self):
+        """ Test that instances share the expressions of their bindings.
+
+        """
+        main1 = self.module.Main()
+        main2 = self.module.Main()
+        for name in ('b', 'c'):
+            expr1 = table_get(main1._expressions, name)
+            expr2 = table_get(main2._expressions, name)
+            self.assertIs(expr1, expr2)
+        self.assertIsNot(main1._identifiers, main2._identifiers)
+        main1.c
+        main2.c
+        notifier1 = table_get(main1._subscriptions, 'c')
+        notifier2 = table_get(main2._subscriptions, 'c')
+        self.assertIsNot(notifier1, notifier2)
+
+    def test_outer_scope_binding(self):
+        """ Test a binding on a child enamldef from an outer scope.
+
+        """
+        main1 = self.module.Main()
+        main2 = self.module.Main()
+        sub1 = main1.children[0]
+        sub2 = main2.children[0]
+        self.assertIsNot(sub1._identifiers, main1._identifiers)
+        label1 = table_get(sub1._expressions, 'label')
+        label2 = table_get(sub2._expressions, 'label')
+        self.assertIs(label1, label2)
+        value1 = table_get(sub1._expressions, 'value')
+        value2 = table_get(sub2._expressions, 'value')
+        self.assertIsNot(value1, value2)
+        main1.a = 3
+        self.assertEqual(sub1.value, 6)
+        self.assertEqual(sub1.label, 'value 6')
+        self.assertEqual(sub2.label, 'value 2')
+
+    def test_instances_independent(self):
+        """ Test that shared functions evaluate in their own scope.
+
+        """
+        main1 = self.module.Main()
+        main2 = self.module.Main()
+        main1.b = 5
+        self.assertEqual(main1.a, 5)
+        self.assertEqual(main1.children[0].value, 10)
+        self.assertEqual(main2.a, 1)
+        self.assertEqual(main2.children[0].value, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import os
+import pstats
+import shutil
+import tempfile
+import unittest
+
+from enaml.core.expression_profiler import ExpressionProfiler
+from enaml.tests.utils import compile_source
+
+
+SOURCE = """\
+from enaml.core.declarative import Declarative
+
+enamldef Main(Declarative):
+    attr a = 1
+    attr b << a * 2
+    attr c << 1 / a
+    attr d := b
+    attr log = []
+    b ::
+        log.append(b)
+"""
+
+
+class TestExpressionProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.module = compile_source(SOURCE)
+        self.profiler = ExpressionProfiler()
+        with self.profiler:
+            self.main = self.module.Main()
+
+    def stats_by_label(self):
+        return dict((s.label, s) for s in self.profiler.stats())
+
+    def test_counts(self):
+        """ Test that calls are counted per expression.
+
+        """
+        main = self.main
+        self.assertEqual(main.b, 2)
+        main.a = 3
+        self.assertEqual(main.log, [6])
+        stats = self.stats_by_label()
+        self.assertEqual(stats['b <<'].calls, 2)
+        self.assertEqual(stats['b ::'].calls, 1)
+        self.assertEqual(stats['b <<'].filename, '__enaml_tests__')
+        self.assertEqual(stats['b <<'].lineno, 5)
+        self.assertEqual(stats['b ::'].lineno, 10)
+        self.assertTrue(stats['b <<'].cumulative_time > 0)
+
+    def test_shared_stats(self):
+        """ Test that instances share the statistics of an expression.
+
+        """
+        with self.profiler:
+            other = self.module.Main()
+        self.main.b
+        other.b
+        self.assertEqual(self.stats_by_label()['b <<'].calls, 2)
+
+    def test_delegate(self):
+        """ Test that both halves of a delegation are recorded.
+
+        """
+        main = self.main
+        self.assertEqual(main.d, 2)
+        main.d = 8
+        self.assertEqual(main.b, 8)
+        stats = self.stats_by_label()
+        # The update changes `b`, which refreshes the subscription
+        # from within the update.
+        self.assertEqual(stats['d :='].calls, 2)
+        self.assertEqual(stats['d >>'].calls, 1)
+        self.assertEqual(stats['d :='].callers, {stats['d >>'].key: 1})
+        self.assertEqual(stats['b <<'].callers, {stats['d :='].key: 1})
+
+    def test_exception(self):
+        """ Test that the last exception of an expression is recorded.
+
+        """
+        main = self.main
+        main.a = 0
+        self.assertRaises(ZeroDivisionError, main.eval_expression, 'c')
+        stats = self.stats_by_label()['c <<']
+        self.assertEqual(stats.errors, 1)
+        self.assertIsInstance(stats.last_exception, ZeroDivisionError)
+        self.assertIn('ZeroDivisionError', self.profiler.report())
+
+    def test_report(self):
+        """ Test the sorted text report.
+
+        """
+        main = self.main
+        for i in range(5):
+            main.a = i + 1
+            main.b
+        report = self.profiler.report(sort='calls', limit=1)
+        lines = report.splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn('__enaml_tests__:5(b <<)', lines[1])
+        self.assertRaises(ValueError, self.profiler.report, 'name')
+        self.profiler.clear()
+        self.assertEqual(self.profiler.stats(), [])
+
+    def test_dump_stats(self):
+        """ Test that the dumped statistics can be loaded by pstats.
+
+        """
+        main = self.main
+        main.d = 4
+        tempdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tempdir, 'expressions.prof')
+            self.profiler.dump_stats(path)
+            stats = pstats.Stats(path)
+        finally:
+            shutil.rmtree(tempdir)
+        key = ('__enaml_tests__', 5, 'b <<')
+        self.assertEqual(stats.stats[key][1], 1)
+        calls = sum(s.calls for s in self.profiler.stats())
+        self.assertEqual(stats.total_calls, calls)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,188 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import unittest
+
+from traits.api import HasTraits, Int, List
+
+from enaml.core.byteplay import Code
+from enaml.core.code_tracing import inject_tracing
+from enaml.core.expressions import SubscriptionNotifier
+from enaml.tests.utils import compile_source
+
+
+SOURCE = """\
+from enaml.core.declarative import Declarative
+
+enamldef Main(Declarative):
+    attr models
+    attr index = 0
+    attr value << models[index].value
+    attr double << nonlocals.index * 2
+    attr triple = nonlocals.index * 3
+"""
+
+
+class Model(HasTraits):
+
+    value = Int
+
+    items = List
+
+
+def handler_count(obj, name):
+    """ Get the number of change handlers connected to a trait.
+
+    """
+    notifiers = obj._trait(name, 2)._notifiers(0)
+    return len(notifiers) if notifiers else 0
+
+
+class TestSubscriptionExpression(unittest.TestCase):
+
+    def setUp(self):
+        self.module = compile_source(SOURCE)
+        self.models = [Model(value=i * 10) for i in range(3)]
+        self.main = self.module.Main(models=self.models)
+
+    def test_follow_dependencies(self):
+        """ Test that the expression follows its changing dependencies.
+
+        """
+        main = self.main
+        models = self.models
+        self.assertEqual(main.value, 0)
+        models[0].value = 5
+        self.assertEqual(main.value, 5)
+        main.index = 2
+        self.assertEqual(main.value, 20)
+        models[0].value = 6
+        self.assertEqual(main.value, 20)
+        models[2].value = 7
+        self.assertEqual(main.value, 7)
+
+    def test_disconnect_stale(self):
+        """ Test that stale dependencies are disconnected.
+
+        """
+        main = self.main
+        models = self.models
+        main.value
+        self.assertEqual(handler_count(models[0], 'value'), 1)
+
+        connected = SubscriptionNotifier.connected
+        disconnected = SubscriptionNotifier.disconnected
+        main.index = 1
+        self.assertEqual(handler_count(models[0], 'value'), 0)
+        self.assertEqual(handler_count(models[1], 'value'), 1)
+        self.assertEqual(SubscriptionNotifier.connected - connected, 1)
+        self.assertEqual(SubscriptionNotifier.disconnected - disconnected, 1)
+
+        # Changing back and forth never accumulates handlers.
+        for index in (0, 1, 2, 0):
+            main.index = index
+        for model in models:
+            count = 1 if model is models[0] else 0
+            self.assertEqual(handler_count(model, 'value'), count)
+
+    def test_nonlocals(self):
+        """ Test expressions which use the nonlocals scope.
+
+        """
+        main = self.main
+        self.assertEqual(main.double, 0)
+        main.index = 2
+        self.assertEqual(main.double, 4)
+        self.assertEqual(main.triple, 6)
+
+    def test_unchanged_dependencies(self):
+        """ Test that unchanged dependencies are not reconnected.
+
+        """
+        main = self.main
+        main.value
+        connected = SubscriptionNotifier.connected
+        disconnected = SubscriptionNotifier.disconnected
+        self.models[0].value = 12
+        self.assertEqual(main.value, 12)
+        self.assertEqual(SubscriptionNotifier.connected, connected)
+        self.assertEqual(SubscriptionNotifier.disconnected, disconnected)
+
+
+TRACING_SOURCE = """\
+from enaml.core.declarative import Declarative
+
+enamldef Main(Declarative):
+    attr model
+    attr field = 'value'
+    attr index = 0
+    attr label << '{0:.1f}'.format(getattr(model, field) * 1.5)
+    attr total << sum([item * 2 for item in model.items])
+    attr item << model.items[index] if model.items else None
+"""
+
+
+def traced_ops(source):
+    """ Get the number of ops added by tracing a Python expression.
+
+    """
+    code = Code.from_code(compile(source, '<test>', 'eval'))
+    return len(inject_tracing(code.code)) - len(code.code)
+
+
+class TestSelectiveTracing(unittest.TestCase):
+
+    def setUp(self):
+        self.module = compile_source(TRACING_SOURCE)
+        self.model = Model(value=2, items=[1, 2])
+        self.main = self.module.Main(model=self.model)
+
+    def test_untraced_ops(self):
+        """ Test that ops which cannot produce dependencies are skipped.
+
+        """
+        sources = (
+            "'%.2f' % (a * 2)", "'{0}'.format(a)", "abs(a) + max(a, b)",
+            "(1, 2)[a]", "{'a': 1}[a]", "range(10)[a]",
+            "[x for x in sorted(a)]",
+        )
+        for source in sources:
+            self.assertEqual(traced_ops(source), 0, source)
+
+    def test_traced_ops(self):
+        """ Test that ops which may produce dependencies are traced.
+
+        """
+        sources = (
+            "getattr(a, 'b')", "f(a)(b)", "a.b", "a[b]", "[x for x in a.b]",
+        )
+        for source in sources:
+            self.assertNotEqual(traced_ops(source), 0, source)
+
+    def test_getattr(self):
+        """ Test that a dependency through getattr is tracked.
+
+        """
+        main = self.main
+        self.assertEqual(main.label, '3.0')
+        self.model.value = 3
+        self.assertEqual(main.label, '4.5')
+
+    def test_items(self):
+        """ Test that iteration and subscripts of traits are tracked.
+
+        """
+        main = self.main
+        model = self.model
+        self.assertEqual(main.total, 6)
+        self.assertEqual(main.item, 1)
+        model.items = [5, 6]
+        self.assertEqual(main.total, 22)
+        self.assertEqual(main.item, 5)
+        main.index = 1
+        self.assertEqual(main.item, 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
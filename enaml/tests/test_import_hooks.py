@@ -2,8 +2,13 @@
 #  Copyright (c) 2011, Enthought, Inc.
 #  All rights reserved.
 #------------------------------------------------------------------------------
+import os
+import shutil
 import sys
+import tempfile
+import time
 import unittest
+import zipfile
 
 from enaml.core import import_hooks
 
@@ -49,3 +54,170 @@ class TestImportHooks(unittest.TestCase):
         self.assertEquals(counts[importer], 0)
         self.assertEquals(len(meta_path), 0)
 
+
+
+SOURCE = """\
+from enaml.core.declarative import Declarative
+
+enamldef Main(Declarative):
+    attr value = %d
+"""
+
+
+class TestEnamlCache(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.src_path = os.path.join(self.root, 'view.enaml')
+        self.write_source(1)
+        self.environ = os.environ.copy()
+
+    def tearDown(self):
+        os.environ.clear()
+        os.environ.update(self.environ)
+        shutil.rmtree(self.root)
+
+    def write_source(self, value, mtime=None):
+        with open(self.src_path, 'w') as f:
+            f.write(SOURCE % value)
+        if mtime is not None:
+            os.utime(self.src_path, (mtime, mtime))
+
+    def load(self):
+        """ Load the code for the source and return the value constant
+        along with whether the code came from the cache.
+
+        """
+        file_info = import_hooks.make_file_info(self.src_path)
+        importer = import_hooks.EnamlImporter(file_info)
+        mtime = int(os.path.getmtime(self.src_path))
+        cached = importer._is_cache_current(file_info, mtime)
+        code, path = importer.get_code()
+        self.assertEqual(path, self.src_path)
+        ns = {}
+        exec code in ns
+        return ns['Main']().value, cached
+
+    def test_write_and_load(self):
+        """ Test that the cache is written and then used.
+
+        """
+        self.assertEqual(self.load(), (1, False))
+        file_info = import_hooks.make_file_info(self.src_path)
+        self.assertTrue(os.path.exists(file_info.cache_path))
+        self.assertEqual(os.listdir(file_info.cache_dir), [
+            os.path.basename(file_info.cache_path)
+        ])
+        self.assertEqual(self.load(), (1, True))
+
+    def test_relocated_source(self):
+        """ Test that a cache older than an unchanged source is valid.
+
+        """
+        self.load()
+        # Simulate a copied install where the source is newer than the
+        # cache, but its content is unchanged.
+        future = int(time.time()) + 1000
+        os.utime(self.src_path, (future, future))
+        self.assertEqual(self.load(), (1, True))
+
+    def test_hash_mode(self):
+        """ Test that hash mode detects changes hidden by timestamps.
+
+        """
+        os.environ[import_hooks.CACHE_MODE_ENV] = 'hash'
+        self.write_source(1, mtime=1000)
+        self.assertEqual(self.load(), (1, False))
+        self.write_source(2, mtime=1000)
+        self.assertEqual(self.load(), (2, False))
+        self.assertEqual(self.load(), (2, True))
+
+    def test_cache_dir_env(self):
+        """ Test that the cache can be redirected to another root.
+
+        """
+        cache_root = os.path.join(self.root, 'cache')
+        os.environ[import_hooks.CACHE_DIR_ENV] = cache_root
+        file_info = import_hooks.make_file_info(self.src_path)
+        self.assertTrue(file_info.cache_dir.startswith(cache_root))
+        self.assertEqual(self.load(), (1, False))
+        self.assertTrue(os.path.exists(file_info.cache_path))
+        self.assertFalse(
+            os.path.exists(os.path.join(self.root, import_hooks.CACHEDIR))
+        )
+        self.assertEqual(self.load(), (1, True))
+
+    def test_unwritable_cache(self):
+        """ Test that a failure to write the cache is not an error.
+
+        """
+        file_info = import_hooks.make_file_info(self.src_path)
+        with open(file_info.cache_dir, 'w') as f:
+            f.write('not a directory')
+        self.assertEqual(self.load(), (1, False))
+        self.assertEqual(self.load(), (1, False))
+
+
+class TestEnamlZipImporter(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.archive = os.path.join(self.root, 'views.zip')
+        build = os.path.join(self.root, 'build')
+        os.mkdir(build)
+
+        # A module which is only shipped as precompiled bytecode.
+        compiled_src = os.path.join(build, 'zcompiled.enaml')
+        with open(compiled_src, 'w') as f:
+            f.write(SOURCE % 3)
+        file_info = import_hooks.make_file_info(compiled_src)
+        import_hooks.EnamlImporter(file_info).get_code()
+        cache_name = '/'.join((
+            'zpkg', import_hooks.CACHEDIR,
+            os.path.basename(file_info.cache_path),
+        ))
+
+        with zipfile.ZipFile(self.archive, 'w') as zfile:
+            zfile.writestr('zview.enaml', SOURCE % 1)
+            zfile.writestr('zpkg/__init__.py', '')
+            zfile.writestr('zpkg/zsub.enaml', SOURCE % 2)
+            zfile.write(file_info.cache_path, cache_name)
+
+        sys.path.insert(0, self.archive)
+        import_hooks.imports.add_importer(import_hooks.EnamlZipImporter)
+
+    def tearDown(self):
+        import_hooks.imports.remove_importer(import_hooks.EnamlZipImporter)
+        import_hooks.EnamlZipImporter.invalidate_caches()
+        sys.path.remove(self.archive)
+        for name in ('zview', 'zpkg', 'zpkg.zsub', 'zpkg.zcompiled'):
+            sys.modules.pop(name, None)
+        shutil.rmtree(self.root)
+
+    def test_import_top_level(self):
+        """ Test importing a module from the root of an archive.
+
+        """
+        with import_hooks.imports():
+            import zview
+        self.assertEqual(zview.Main().value, 1)
+        self.assertEqual(
+            zview.__file__, os.path.join(self.archive, 'zview.enaml')
+        )
+
+    def test_import_from_package(self):
+        """ Test importing modules from a package in an archive.
+
+        """
+        with import_hooks.imports():
+            from zpkg import zsub, zcompiled
+        self.assertEqual(zsub.Main().value, 2)
+        self.assertEqual(zcompiled.Main().value, 3)
+
+    def test_missing_module(self):
+        """ Test that a module missing from the archive is not found.
+
+        """
+        importer = import_hooks.EnamlZipImporter
+        self.assertIsNone(importer.locate_module('zmissing'))
+        self.assertIsNotNone(importer.locate_module('zview'))
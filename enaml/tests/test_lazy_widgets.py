@@ -0,0 +1,142 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import unittest
+
+from enaml.tests.utils import RecordingSession
+from enaml.widgets.container import Container
+from enaml.widgets.notebook import Notebook
+from enaml.widgets.page import Page
+from enaml.widgets.stack import Stack
+from enaml.widgets.stack_item import StackItem
+
+
+def make_notebook(lazy, index=0):
+    """ Create an activated notebook with three pages of content.
+
+    """
+    notebook = Notebook(lazy=lazy, index=index)
+    for i in range(3):
+        page = Page(notebook, title=unicode(i))
+        Container(page)
+    notebook.initialize()
+    session = RecordingSession()
+    notebook.activate(session)
+    return notebook, session
+
+
+class TestLazyNotebook(unittest.TestCase):
+
+    def test_eager(self):
+        """ Test that all pages are sent by a default notebook.
+
+        """
+        notebook, session = make_notebook(False)
+        snap = notebook.snapshot()
+        for page_snap in snap['children']:
+            self.assertFalse(page_snap['deferred'])
+            self.assertEqual(len(page_snap['children']), 1)
+        self.assertEqual(len(session.objects), 7)
+
+    def test_deferred_pages(self):
+        """ Test that only the first page is sent by a lazy notebook.
+
+        """
+        notebook, session = make_notebook(True)
+        snaps = notebook.snapshot()['children']
+        self.assertEqual([s['deferred'] for s in snaps], [False, True, True])
+        self.assertEqual([len(s['children']) for s in snaps], [1, 0, 0])
+        self.assertEqual(len(session.objects), 5)
+        for page in notebook.pages[1:]:
+            self.assertEqual(page.page_widget.state, 'initialized')
+
+    def test_selected_page(self):
+        """ Test that the page at the selected index is sent.
+
+        """
+        notebook, session = make_notebook(True, 1)
+        snap = notebook.snapshot()
+        self.assertEqual(snap['index'], 1)
+        deferred = [s['deferred'] for s in snap['children']]
+        self.assertEqual(deferred, [True, False, True])
+
+    def test_index_changed(self):
+        """ Test that selecting a page sends its content.
+
+        """
+        notebook, session = make_notebook(True)
+        page = notebook.pages[2]
+        notebook.receive_action('index_changed', {'index': 2})
+        self.assertEqual(notebook.index, 2)
+        self.assertFalse(page._deferred)
+        self.assertEqual(page.page_widget.state, 'active')
+        actions = [(msg[0], msg[1]) for msg in session.messages]
+        self.assertEqual(actions, [(page.object_id, 'children_changed')])
+        notebook.index = 1
+        self.assertEqual(notebook.pages[1].page_widget.state, 'active')
+        self.assertIn(
+            (notebook.object_id, 'set_index', {'index': 1}), session.messages
+        )
+
+    def test_materialize(self):
+        """ Test that a page sends its content when requested.
+
+        """
+        notebook, session = make_notebook(True)
+        page = notebook.pages[2]
+        content = page.page_widget
+        page.receive_action('materialize', {})
+        (object_id, action, msg), = session.messages
+        self.assertEqual(object_id, page.object_id)
+        self.assertEqual(action, 'children_changed')
+        self.assertEqual(msg['splices'], [[0, 0, [content.object_id]]])
+        self.assertEqual(msg['added'][0]['object_id'], content.object_id)
+        self.assertEqual(content.state, 'active')
+        self.assertIn(content.object_id, session.objects)
+        self.assertEqual(len(page.snapshot()['children']), 1)
+
+        # A second request is a no-op.
+        page.receive_action('materialize', {})
+        self.assertEqual(len(session.messages), 1)
+
+
+class TestLazyStack(unittest.TestCase):
+
+    def setUp(self):
+        stack = self.stack = Stack(lazy=True, index=1)
+        for i in range(3):
+            Container(StackItem(stack))
+        stack.initialize()
+        self.session = RecordingSession()
+        stack.activate(self.session)
+
+    def test_deferred_items(self):
+        """ Test that only the current item is sent by a lazy stack.
+
+        """
+        snaps = self.stack.snapshot()['children']
+        self.assertEqual([len(s['children']) for s in snaps], [0, 1, 0])
+
+    def test_index_changed(self):
+        """ Test that changing the index sends the item content.
+
+        """
+        stack = self.stack
+        item = stack.stack_items[2]
+        stack.receive_action('index_changed', {'index': 2})
+        self.assertFalse(item._deferred)
+        self.assertEqual(item.stack_widget.state, 'active')
+        added = [
+            msg for msg in self.session.messages
+            if msg[1] == 'children_changed'
+        ]
+        self.assertEqual(len(added), 1)
+        self.assertEqual(added[0][0], item.object_id)
+        stack.index = 0
+        self.assertEqual(stack.stack_items[0].stack_widget.state, 'active')
+        self.assertFalse(any(i._deferred for i in stack.stack_items))
+
+
+if __name__ == '__main__':
+    unittest.main()
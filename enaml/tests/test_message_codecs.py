@@ -0,0 +1,209 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from collections import namedtuple
+import json
+import unittest
+
+from enaml.message_codecs import (
+    BinaryCodec, CompressingCodec, JSONCodec, codec_names, compressor_names,
+    create_codec, negotiate_codec, negotiate_compression,
+)
+
+
+Box = namedtuple('Box', 'top right bottom left')
+
+
+CONTENT = {
+    'text': u'caf\xe9',
+    'bytes': 'caf\xc3\xa9',
+    'ints': [0, 1, -1, 127, -128, 128, 70000, -70000, 1 << 40],
+    'small': [1, 2, 3, 4, 5],
+    'wide': [1, 2, 1 << 20, 4],
+    'huge': [1, 2, 3, 1 << 40],
+    'floats': [0.5, -1.25, 1e300, 3.0],
+    'mixed': [1, 2.5, True, None, False, 'x', (1, 2)],
+    'bools': [True, False, True, False],
+    'big': 1 << 80,
+    'box': Box(1, 2, 3, 4),
+    'nested': {'object_id': 'abc', 'class': 'Field', 'bases': ['A', 'B']},
+    'empty': {},
+    1: 'int key',
+    None: 'none key',
+}
+
+
+def json_form(object_id, action, content):
+    """ Get the result of a JSON round trip of a message.
+
+    """
+    object_id, action, content = json.loads(
+        json.dumps([object_id, action, content])
+    )
+    return object_id, action, content
+
+
+class TestBinaryCodec(unittest.TestCase):
+
+    def setUp(self):
+        self.encoder = BinaryCodec()
+        self.decoder = BinaryCodec()
+
+    def round_trip(self, object_id, action, content):
+        data = self.encoder.encode(object_id, action, content)
+        return data, self.decoder.decode(data)
+
+    def test_json_form(self):
+        """ Test that messages round trip to their JSON form.
+
+        """
+        msg = ('abc', 'set_value', CONTENT)
+        data, result = self.round_trip(*msg)
+        self.assertEqual(result, json_form(*msg))
+        for item in result:
+            self.assertTrue(isinstance(item, (unicode, dict)))
+
+    def test_interning(self):
+        """ Test that repeated strings are sent as small references.
+
+        """
+        msg = ('b' * 32, 'children_changed', {
+            'object_id': 'a' * 32, 'class': 'PushButton',
+        })
+        first, result = self.round_trip(*msg)
+        second, result = self.round_trip(*msg)
+        self.assertEqual(result, json_form(*msg))
+        self.assertTrue(len(second) <= 16)
+        self.assertTrue(len(second) * 5 < len(first))
+
+    def test_intern_limit(self):
+        """ Test that strings are sent as literals once the table is full.
+
+        """
+        self.encoder = BinaryCodec(max_interned=2)
+        for idx in range(5):
+            msg = ('id%d' % idx, 'action%d' % idx, {})
+            data, result = self.round_trip(*msg)
+            self.assertEqual(result, json_form(*msg))
+        self.assertEqual(len(self.decoder._decode_table), 2)
+
+    def test_packed_arrays(self):
+        """ Test that lists of numbers are packed.
+
+        """
+        values = range(100)
+        data, result = self.round_trip('a', 'b', {'v': values})
+        self.assertEqual(result[2]['v'], values)
+        self.assertTrue(len(data) < 120)
+
+    def test_invalid(self):
+        """ Test that invalid data is rejected.
+
+        """
+        data = self.encoder.encode('a', 'b', {})
+        self.assertRaises(ValueError, self.decoder.decode, '')
+        self.assertRaises(ValueError, self.decoder.decode, '\x02' + data[1:])
+        self.assertRaises(ValueError, BinaryCodec().decode, data + 'N')
+        content = {'x': object()}
+        self.assertRaises(TypeError, self.encoder.encode, 'a', 'b', content)
+
+    def test_failed_encode(self):
+        """ Test that a failed encode leaves the intern tables in step.
+
+        """
+        content = {'new_key': 'x', 'bad': object()}
+        self.assertRaises(
+            TypeError, self.encoder.encode, 'new_id', 'set_bad', content,
+        )
+        for idx in range(2):
+            msg = ('obj_id', 'set_value', {'value': idx, 'new_key': 'y'})
+            data, result = self.round_trip(*msg)
+            self.assertEqual(result, json_form(*msg))
+        msg = ('new_id', 'set_bad', {'new_key': 'z'})
+        data, result = self.round_trip(*msg)
+        self.assertEqual(result, json_form(*msg))
+
+
+class TestNegotiation(unittest.TestCase):
+
+    def test_negotiate(self):
+        """ Test the negotiation of the codec of a session.
+
+        """
+        self.assertEqual(codec_names()[:2], ['binary', 'json'])
+        self.assertIsInstance(negotiate_codec(['msgpack', 'json']), JSONCodec)
+        self.assertIsInstance(negotiate_codec(['binary']), BinaryCodec)
+        self.assertIsInstance(negotiate_codec([]), JSONCodec)
+        self.assertIsNot(create_codec('binary'), create_codec('binary'))
+        self.assertRaises(ValueError, create_codec, 'msgpack')
+
+    def test_json_codec(self):
+        """ Test that the JSON codec round trips to the JSON form.
+
+        """
+        codec = JSONCodec()
+        msg = ('abc', 'set_value', CONTENT)
+        self.assertEqual(codec.decode(codec.encode(*msg)), json_form(*msg))
+
+
+class TestCompressingCodec(unittest.TestCase):
+
+    def test_threshold(self):
+        """ Test that only messages above the threshold are compressed.
+
+        """
+        encoder = CompressingCodec(BinaryCodec(), 'zlib', 256)
+        decoder = CompressingCodec(BinaryCodec(), 'zlib', 1 << 20)
+        small = ('abc', 'set_text', {'text': u'hello'})
+        large = ('abc', 'set_source', {'source': u'<p>text</p>' * 500})
+        for msg in (small, large, small):
+            data = encoder.encode(*msg)
+            self.assertEqual(decoder.decode(data), json_form(*msg))
+        self.assertEqual(encoder.encode(*small)[0], '\x00')
+        data = encoder.encode(*large)
+        self.assertEqual(data[0], '\x01')
+        self.assertTrue(len(data) < 200)
+        self.assertEqual(encoder.name, 'binary')
+
+    def test_incompressible(self):
+        """ Test that a message is sent raw if compression does not help.
+
+        """
+        codec = CompressingCodec(JSONCodec(), 'zlib', 0)
+        data = codec.encode('a', 'b', {})
+        self.assertEqual(data[0], '\x00')
+        self.assertEqual(codec.decode(data), (u'a', u'b', {}))
+        self.assertRaises(ValueError, codec.decode, '\x02' + data[1:])
+
+    def test_negotiate(self):
+        """ Test the negotiation of the compression of a session.
+
+        """
+        self.assertEqual(compressor_names()[0], 'zlib')
+        self.assertEqual(negotiate_compression(['lz4', 'zlib']), 'zlib')
+        self.assertEqual(negotiate_compression(['zlib'], ()), None)
+        self.assertEqual(negotiate_compression([]), None)
+        self.assertRaises(ValueError, CompressingCodec, JSONCodec(), 'lz4')
+        for name in compressor_names():
+            codec = CompressingCodec(JSONCodec(), name, 0)
+            msg = ('a', 'b', {'items': [u'item'] * 1000})
+            self.assertEqual(codec.decode(codec.encode(*msg)), json_form(*msg))
+
+    def test_compression_bomb(self):
+        """ Test that a message which decompresses too large is rejected.
+
+        """
+        for name in compressor_names():
+            codec = CompressingCodec(JSONCodec(), name, 0, max_size=1 << 16)
+            msg = ('a', 'b', {'text': u'x' * 60000})
+            self.assertEqual(codec.decode(codec.encode(*msg)), json_form(*msg))
+            encoder = CompressingCodec(JSONCodec(), name, 0)
+            bomb = encoder.encode('a', 'b', {'text': u'x' * (1 << 22)})
+            self.assertTrue(len(bomb) < 1 << 16)
+            self.assertRaises(ValueError, codec.decode, bomb)
+            self.assertRaises(ValueError, codec.decode, '\x01garbage')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,224 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import unittest
+
+from traits.api import Instance, List
+
+from enaml.core.messenger import Messenger, snapshot_chunks
+from enaml.core.object import Object
+from enaml.utils import apply_splices, sequence_checksum
+
+
+class RecordingMessenger(Messenger):
+    """ A messenger which records the actions it sends.
+
+    """
+    actions = List
+
+    def send_action(self, action, content):
+        self.actions.append((action, content))
+
+
+class TestChildrenChanged(unittest.TestCase):
+
+    def setUp(self):
+        self.parent = RecordingMessenger()
+        self.kids = [Messenger(self.parent) for i in range(100)]
+        self.parent.state = 'active'
+
+    def ids(self):
+        return [c.object_id for c in self.parent.children]
+
+    def test_append(self):
+        """ Test that appending a child sends a small message.
+
+        """
+        parent = self.parent
+        old_ids = self.ids()
+        child = Messenger(parent)
+        (action, content), = parent.actions
+        self.assertEqual(action, 'children_changed')
+        self.assertNotIn('order', content)
+        self.assertEqual(content['splices'], [[100, 0, [child.object_id]]])
+        self.assertEqual(content['removed'], [])
+        self.assertEqual(len(content['added']), 1)
+        self.assertEqual(content['added'][0]['object_id'], child.object_id)
+        self.assertEqual(apply_splices(old_ids, content['splices']), self.ids())
+        self.assertEqual(content['base'], sequence_checksum(old_ids))
+
+    def test_move_and_remove(self):
+        """ Test the message for a move and a removal.
+
+        """
+        parent = self.parent
+        kids = self.kids
+        old_ids = self.ids()
+        parent.remove_children([kids[5]])
+        parent.move_children(kids[0], [kids[50]])
+        removal, move = parent.actions
+        self.assertEqual(removal[1]['removed'], [kids[5].object_id])
+        self.assertNotIn('order', removal[1])
+        self.assertEqual(removal[1]['splices'], [[5, 1, []]])
+        self.assertEqual(removal[1]['base'], sequence_checksum(old_ids))
+        self.assertEqual(move[1]['removed'], [])
+        self.assertEqual(move[1]['added'], [])
+        ids = apply_splices(old_ids, removal[1]['splices'])
+        self.assertEqual(move[1]['base'], sequence_checksum(ids))
+        ids = apply_splices(ids, move[1]['splices'])
+        self.assertEqual(ids, self.ids())
+
+    def test_destroy(self):
+        """ Test that destroying a child sends splices of the order
+        the client has after it drops the child.
+
+        """
+        parent = self.parent
+        kids = self.kids
+        old_ids = self.ids()
+        kids[1].destroy()
+        (action, content), = parent.actions
+        self.assertNotIn('order', content)
+        self.assertEqual(content['splices'], [])
+        self.assertEqual(content['removed'], [kids[1].object_id])
+        client_ids = [i for i in old_ids if i != kids[1].object_id]
+        self.assertEqual(content['base'], sequence_checksum(client_ids))
+        self.assertEqual(apply_splices(client_ids, []), self.ids())
+
+    def test_resync(self):
+        """ Test that a resync request is answered with the full order.
+
+        """
+        parent = self.parent
+        parent.receive_action('resync_children', {})
+        (action, content), = parent.actions
+        self.assertEqual(action, 'children_changed')
+        self.assertEqual(content['order'], self.ids())
+        self.assertEqual(content['added'], [])
+
+    def test_non_messenger(self):
+        """ Test that changes to other children send no message.
+
+        """
+        Object(self.parent)
+        self.assertEqual(self.parent.actions, [])
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def test_schema(self):
+        """ Test the cached class and base names of snapshots.
+
+        """
+        first = RecordingMessenger().snapshot()
+        second = RecordingMessenger().snapshot()
+        self.assertEqual(first['class'], 'RecordingMessenger')
+        self.assertEqual(first['bases'], ['Messenger', 'Declarative', 'Object'])
+        self.assertIs(first['bases'], second['bases'])
+        self.assertEqual(Messenger().snapshot()['class'], 'Messenger')
+
+
+class EmbeddingMessenger(Messenger):
+    """ A messenger which embeds the full snapshot of another tree.
+
+    """
+    embedded = Instance(Messenger)
+
+    def snapshot(self, shallow=False):
+        snap = super(EmbeddingMessenger, self).snapshot(shallow)
+        snap['embedded'] = self.embedded.snapshot()
+        return snap
+
+
+def build_tree(parent, depth, fanout):
+    """ Build a balanced tree of Messengers under a parent.
+
+    """
+    if depth > 0:
+        for i in range(fanout):
+            build_tree(Messenger(parent), depth - 1, fanout)
+
+
+def assemble(chunks):
+    """ Assemble full snapshots from a sequence of chunks.
+
+    """
+    roots = []
+    nodes = {}
+    complete = []
+
+    def register(tree):
+        nodes[tree['object_id']] = tree
+        for child in tree['children']:
+            register(child)
+
+    for chunk in chunks:
+        for parent_id, tree in chunk['trees']:
+            if parent_id is None:
+                roots.append(tree)
+            else:
+                nodes[parent_id]['children'].append(tree)
+            register(tree)
+        complete.extend(chunk['complete'])
+    return roots, complete
+
+
+class TestSnapshotChunks(unittest.TestCase):
+
+    def setUp(self):
+        self.roots = [Messenger(), Messenger()]
+        build_tree(self.roots[0], 3, 4)
+        build_tree(self.roots[1], 2, 3)
+
+    def test_assembled(self):
+        """ Test that assembled chunks match the full snapshots.
+
+        """
+        expected = [root.snapshot() for root in self.roots]
+        for size in (1, 7, 500):
+            chunks = list(snapshot_chunks(self.roots, size))
+            roots, complete = assemble(chunks)
+            self.assertEqual(roots, expected)
+            self.assertEqual(complete, [r.object_id for r in self.roots])
+            for chunk in chunks:
+                count = len(chunk['trees'])
+                self.assertTrue(0 < count <= size)
+
+    def test_window_boundaries(self):
+        """ Test that each root completes in its own chunk.
+
+        """
+        chunks = list(snapshot_chunks(self.roots, 500))
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(chunks[0]['complete'], [self.roots[0].object_id])
+        self.assertEqual(len(chunks[0]['trees']), 1)
+
+    def test_lazy(self):
+        """ Test that chunks are generated on demand.
+
+        """
+        chunks = snapshot_chunks(self.roots, 10)
+        first = next(chunks)
+        self.assertEqual(first['complete'], [])
+        self.roots[1].children[0].destroy()
+        roots, complete = assemble([first] + list(chunks))
+        self.assertEqual(len(roots[1]['children']), 2)
+
+    def test_nested_snapshot(self):
+        """ Test a full snapshot taken while chunks are generated.
+
+        """
+        root = EmbeddingMessenger()
+        root.embedded = self.roots[1]
+        build_tree(root, 1, 3)
+        expected = self.roots[1].snapshot()
+        chunks = list(snapshot_chunks([root], 2))
+        (parent_id, tree), = chunks[0]['trees']
+        self.assertEqual(tree['embedded'], expected)
+        roots, complete = assemble(chunks)
+        self.assertEqual(len(roots[0]['children']), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,249 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import unittest
+
+from traits.api import List
+
+from enaml.core.object import Object
+from enaml.tests.utils import compile_source
+
+
+SOURCE = """\
+from enaml.core.declarative import Declarative
+
+enamldef Item(Declarative):
+    name = 'item'
+
+enamldef Main(Declarative):
+    attr prefix = 'x'
+    Item:
+        pass
+    Declarative:
+        name << prefix + '1'
+        Item:
+            name = 'inner'
+
+enamldef Row(Declarative):
+    attr index
+    name << 'row%d' % index
+"""
+
+
+def make_tree():
+    """ Create a tree of objects with some duplicate names.
+
+    """
+    root = Object(name='root')
+    a = Object(root, name='a')
+    b = Object(root, name='b')
+    Object(a, name='x')
+    Object(a, name='c')
+    Object(b, name='x')
+    Object(b, name='c')
+    Object(b.children[0], name='c')
+    return root
+
+
+class TestNameIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.root = make_tree()
+        self.root.enable_name_index()
+
+    def tearDown(self):
+        self.root.destroy()
+
+    def assertConsistent(self, obj):
+        """ Assert that the indexed results match a traversal.
+
+        """
+        names = set(o.name for o in self.root.traverse())
+        names.add('missing')
+        for name in names:
+            expected = [o for o in obj.traverse() if o.name == name]
+            self.assertEqual(obj.find_all(name), expected)
+            self.assertIs(obj.find(name), expected[0] if expected else None)
+
+    def test_breadth_first(self):
+        """ Test that indexed lookups follow breadth first order.
+
+        """
+        root = self.root
+        self.assertConsistent(root)
+        for obj in root.traverse():
+            self.assertConsistent(obj)
+
+    def test_reparent(self):
+        """ Test that the index follows parenting changes.
+
+        """
+        root = self.root
+        a, b = root.children
+        b.children[0].set_parent(a)
+        self.assertConsistent(root)
+        outside = Object(name='outside')
+        Object(outside, name='x')
+        root.insert_children(a, [outside])
+        self.assertConsistent(root)
+        self.assertEqual(root.children[0], outside)
+        b.set_parent(None)
+        self.assertConsistent(root)
+        self.assertNotIn(b, root.find_all('b'))
+        b.destroy()
+
+    def test_rename_and_destroy(self):
+        """ Test that the index follows renames and destruction.
+
+        """
+        root = self.root
+        a, b = root.children
+        a.name = 'renamed'
+        self.assertConsistent(root)
+        self.assertIs(root.find('renamed'), a)
+        self.assertIs(root.find('a'), None)
+        b.destroy()
+        self.assertConsistent(root)
+        self.assertEqual(len(root.find_all('c')), 1)
+
+    def test_regex(self):
+        """ Test that regex searches still traverse the tree.
+
+        """
+        found = self.root.find_all('^[ab]$', regex=True)
+        self.assertEqual([o.name for o in found], ['a', 'b'])
+
+    def test_disable(self):
+        """ Test that disabling the index falls back to traversal.
+
+        """
+        root = self.root
+        root.disable_name_index()
+        self.assertIs(root._name_index, None)
+        root.children[0].name = 'renamed'
+        self.assertIs(root.find('renamed'), root.children[0])
+
+    def test_declarative_names(self):
+        """ Test the index of names assigned by enamldef bindings.
+
+        """
+        module = compile_source(SOURCE)
+        main = module.Main()
+        self.root.insert_children(None, [main])
+        item, middle = main.children
+        self.assertIs(self.root.find('item'), item)
+        self.assertIs(self.root.find('x1'), middle)
+        self.assertIs(self.root.find('inner'), middle.children[0])
+        main.prefix = 'y'
+        self.assertIs(self.root.find('y1'), middle)
+        self.assertIs(self.root.find('x1'), None)
+        self.assertConsistent(self.root)
+
+    def test_name_from_kwargs(self):
+        """ Test that a name bound to a keyword argument is indexed.
+
+        The name can not be evaluated before the keyword arguments are
+        applied, so it must not be read while the object is built.
+
+        """
+        module = compile_source(SOURCE)
+        rows = [module.Row(self.root, index=idx) for idx in range(3)]
+        self.assertIs(self.root.find('row2'), rows[2])
+        rows[2].index = 5
+        self.assertIs(self.root.find('row5'), rows[2])
+        self.assertIs(self.root.find('row2'), None)
+
+    def test_wide_parent(self):
+        """ Test lookups among many siblings with duplicate names.
+
+        """
+        root = self.root
+        kids = [Object(name='kid%d' % (idx % 10)) for idx in range(1000)]
+        root.insert_children(None, kids)
+        self.assertEqual(root.find_all('kid3'), kids[3::10])
+        root.remove_children([kids[3]])
+        self.assertEqual(root.find_all('kid3'), kids[13::10])
+        self.assertConsistent(root)
+
+
+class EventObject(Object):
+    """ An object which records its children events.
+
+    """
+    events = List
+
+    def children_event(self, event):
+        self.events.append(event)
+        super(EventObject, self).children_event(event)
+
+
+class TestBulkChildren(unittest.TestCase):
+
+    def setUp(self):
+        self.parent = EventObject()
+        self.kids = [Object(self.parent, name=str(i)) for i in range(5)]
+        del self.parent.events[:]
+
+    def test_extend(self):
+        """ Test appending children with a single event.
+
+        """
+        parent = self.parent
+        other = EventObject()
+        new = [Object(other) for i in range(3)]
+        del other.events[:]
+        parent.extend_children(new)
+        self.assertEqual(parent.children, tuple(self.kids + new))
+        self.assertEqual(other.children, ())
+        self.assertEqual(len(parent.events), 1)
+        self.assertEqual(len(other.events), 1)
+        for child in new:
+            self.assertIs(child.parent, parent)
+
+    def test_move(self):
+        """ Test moving children with a single event.
+
+        """
+        parent = self.parent
+        kids = self.kids
+        parent.move_children(kids[1], [kids[3], kids[4]])
+        expected = (kids[0], kids[3], kids[4], kids[1], kids[2])
+        self.assertEqual(parent.children, expected)
+        self.assertEqual(len(parent.events), 1)
+        self.assertEqual(parent.events[0].new, expected)
+        self.assertRaises(ValueError, parent.move_children, None, [Object()])
+
+    def test_remove(self):
+        """ Test unparenting children with a single event.
+
+        """
+        parent = self.parent
+        kids = self.kids
+        parent.remove_children([kids[4], kids[0], kids[2]])
+        self.assertEqual(parent.children, (kids[1], kids[3]))
+        self.assertEqual(len(parent.events), 1)
+        self.assertEqual(parent.events[0].old, tuple(kids))
+        for child in (kids[0], kids[2], kids[4]):
+            self.assertIs(child.parent, None)
+        self.assertRaises(ValueError, parent.remove_children, [kids[0]])
+        self.assertRaises(ValueError, parent.remove_children, [kids[1]] * 2)
+        parent.remove_children([])
+        self.assertEqual(len(parent.events), 1)
+
+    def test_remove_name_index(self):
+        """ Test that removed children leave the name index.
+
+        """
+        parent = self.parent
+        parent.enable_name_index()
+        try:
+            parent.remove_children(self.kids[:2])
+            self.assertIs(parent.find('0'), None)
+            self.assertIs(parent.find('2'), self.kids[2])
+        finally:
+            parent.disable_name_index()
+
+
+if __name__ == '__main__':
+    unittest.main()
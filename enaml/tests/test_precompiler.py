@@ -0,0 +1,89 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import os
+import shutil
+import tempfile
+import unittest
+
+from enaml.core.import_hooks import EnamlImporter, make_file_info
+from enaml.precompiler import compile_all, find_enaml_files
+
+
+GOOD_SOURCE = """\
+from enaml.core.declarative import Declarative
+
+enamldef Main(Declarative):
+    attr value = 42
+"""
+
+
+BAD_SOURCE = """\
+enamldef Main(Declarative)
+    attr value = 42
+"""
+
+
+class TestPrecompiler(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        pkg = os.path.join(self.root, 'pkg')
+        os.mkdir(pkg)
+        self.good = os.path.join(pkg, 'good.enaml')
+        self.bad = os.path.join(pkg, 'bad.enaml')
+        with open(self.good, 'w') as f:
+            f.write(GOOD_SOURCE)
+        with open(self.bad, 'w') as f:
+            f.write(BAD_SOURCE)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def results(self, **kwargs):
+        return dict(
+            (path, status) for path, status, _, _ in
+            compile_all([self.root], **kwargs)
+        )
+
+    def test_find_enaml_files(self):
+        """ Test that the .enaml files of a tree are found.
+
+        """
+        found = sorted(find_enaml_files([self.root]))
+        self.assertEqual(found, [self.bad, self.good])
+
+    def test_compile_serial(self):
+        """ Test compiling a tree in the current process.
+
+        """
+        results = self.results(jobs=1)
+        self.assertEqual(results[self.good], 'compiled')
+        self.assertEqual(results[self.bad], 'failed')
+        file_info = make_file_info(self.good)
+        self.assertTrue(os.path.exists(file_info.cache_path))
+
+        # Loading the code should now come from the cache.
+        importer = EnamlImporter(file_info)
+        mtime = int(os.path.getmtime(self.good))
+        self.assertTrue(importer._is_cache_current(file_info, mtime))
+
+        # A second run skips the current files, unless forced.
+        self.assertEqual(self.results(jobs=1)[self.good], 'skipped')
+        results = self.results(jobs=1, force=True)
+        self.assertEqual(results[self.good], 'compiled')
+
+    def test_compile_parallel(self):
+        """ Test compiling a tree with a process pool.
+
+        """
+        results = self.results(jobs=2)
+        self.assertEqual(results[self.good], 'compiled')
+        self.assertEqual(results[self.bad], 'failed')
+        file_info = make_file_info(self.good)
+        self.assertTrue(os.path.exists(file_info.cache_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
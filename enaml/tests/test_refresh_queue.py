@@ -0,0 +1,199 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import threading
+import unittest
+
+from traits.api import HasTraits, Int
+
+from enaml.core import refresh_queue
+from enaml.core.binding_table import table_get
+from enaml.tests.utils import LoopApplication, compile_source
+
+
+SOURCE = """\
+from enaml.core.declarative import Declarative
+
+enamldef Main(Declarative):
+    attr model
+    attr count = 0
+    attr total << model.a + model.b + model.c
+    total ::
+        self.count += 1
+"""
+
+
+class Model(HasTraits):
+
+    a = Int
+
+    b = Int
+
+    c = Int
+
+
+class TestRefreshQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.module = compile_source(SOURCE)
+        self.app = LoopApplication()
+        refresh_queue.enable_batching()
+
+    def tearDown(self):
+        refresh_queue.disable_batching()
+        self.app.destroy()
+
+    def test_coalesce(self):
+        """ Test that several changes cause a single refresh.
+
+        """
+        model = Model()
+        main = self.module.Main(model=model)
+        self.assertEqual(main.total, 0)
+        model.a = 1
+        model.b = 2
+        model.c = 3
+        self.assertEqual(main.total, 0)
+        self.app.run_pending()
+        self.assertEqual(main.total, 6)
+        self.assertEqual(main.count, 1)
+
+    def test_flush(self):
+        """ Test flushing the queue synchronously.
+
+        """
+        model = Model()
+        main = self.module.Main(model=model)
+        main.total
+        model.a = 1
+        model.b = 2
+        refresh_queue.flush()
+        self.assertEqual(main.total, 3)
+        self.assertEqual(main.count, 1)
+        # The scheduled flush finds nothing left to do.
+        self.app.run_pending()
+        self.assertEqual(main.count, 1)
+
+    def test_disabled(self):
+        """ Test that refreshes are synchronous when disabled.
+
+        """
+        refresh_queue.disable_batching()
+        model = Model()
+        main = self.module.Main(model=model)
+        main.total
+        model.a = 1
+        model.b = 2
+        self.assertEqual(main.total, 3)
+        self.assertEqual(main.count, 2)
+
+    def test_no_application(self):
+        """ Test that refreshes are synchronous without an application.
+
+        """
+        self.app.destroy()
+        model = Model()
+        main = self.module.Main(model=model)
+        main.total
+        model.a = 1
+        self.assertEqual(main.total, 1)
+        self.app = LoopApplication()
+
+
+CHAIN_SOURCE = """\
+from enaml.core.declarative import Declarative
+
+enamldef Main(Declarative):
+    attr model
+    attr log = []
+    attr a << model.a
+    attr b << a * 2
+    attr c << a + b
+    c ::
+        log.append(c)
+"""
+
+
+class TestTransaction(unittest.TestCase):
+
+    def setUp(self):
+        self.module = compile_source(CHAIN_SOURCE)
+
+    def test_ranks(self):
+        """ Test the ranks of chained subscriptions.
+
+        """
+        main = self.module.Main(model=Model())
+        main.c
+        ranks = [
+            table_get(main._subscriptions, name).rank
+            for name in ('a', 'b', 'c')
+        ]
+        self.assertEqual(ranks, [0, 1, 2])
+
+    def test_topological_order(self):
+        """ Test that a transaction refreshes each expression once.
+
+        """
+        model = Model()
+        main = self.module.Main(model=model)
+        main.c
+        with refresh_queue.transaction():
+            model.a = 1
+            self.assertEqual(main.c, 0)
+        self.assertEqual(main.log, [3])
+        with refresh_queue.transaction():
+            with refresh_queue.transaction():
+                model.a = 2
+            model.a = 3
+            self.assertEqual(main.log, [3])
+        self.assertEqual(main.log, [3, 9])
+
+    def test_batched_order(self):
+        """ Test that batched refreshes are in topological order.
+
+        """
+        model = Model()
+        main = self.module.Main(model=model)
+        main.c
+        app = LoopApplication()
+        refresh_queue.enable_batching()
+        try:
+            model.a = 1
+            model.a = 2
+            app.run_pending()
+        finally:
+            refresh_queue.disable_batching()
+            app.destroy()
+        self.assertEqual(main.log, [6])
+
+    def test_thread_local(self):
+        """ Test that a transaction on one thread does not queue the
+        changes made by another thread.
+
+        """
+        model = Model()
+        main = self.module.Main(model=model)
+        main.c
+        entered = threading.Event()
+        release = threading.Event()
+        def worker():
+            with refresh_queue.transaction():
+                entered.set()
+                release.wait(5.0)
+        thread = threading.Thread(target=worker)
+        thread.daemon = True
+        thread.start()
+        try:
+            self.assertTrue(entered.wait(5.0))
+            model.a = 1
+            self.assertEqual(main.log, [3])
+        finally:
+            release.set()
+            thread.join(5.0)
+        self.assertEqual(main.log, [3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,472 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import threading
+import unittest
+
+from enaml.application import IncrementalTask
+from enaml.outbox import BlockPolicy, CoalescePolicy, DropOldestPolicy
+from enaml.session import Session
+from enaml.socket_interface import ActionSocketInterface
+from enaml.tests.utils import LoopApplication
+from enaml.widgets.container import Container
+from enaml.widgets.slider import Slider
+from enaml.widgets.window import Window
+
+
+class ViewSession(Session):
+    """ A session with a window of nested containers.
+
+    """
+    def on_open(self):
+        window = Window()
+        for i in range(3):
+            Container(Container(window))
+        self.windows = [window]
+
+
+class SliderSession(Session):
+    """ A session with a window which holds two sliders.
+
+    """
+    def on_open(self):
+        window = Window()
+        self.container = Container(window)
+        self.first = Slider(self.container)
+        self.second = Slider(self.container)
+        self.windows = [window]
+
+
+class RecordingSocket(object):
+    """ An action socket which records the messages it sends.
+
+    """
+    def __init__(self):
+        self.messages = []
+
+    def on_message(self, callback):
+        pass
+
+    def send(self, object_id, action, content):
+        self.messages.append((object_id, action, content))
+
+
+ActionSocketInterface.register(RecordingSocket)
+
+
+class TestIterOpen(unittest.TestCase):
+
+    def test_progress(self):
+        """ Test that the session reports the progress of the open.
+
+        """
+        session = ViewSession()
+        values = list(session.iter_open('id'))
+        self.assertEqual(values[0], 0.0)
+        self.assertEqual(values[-1], 1.0)
+        self.assertEqual(len(values), 8)
+        self.assertEqual(values, sorted(values))
+        self.assertEqual(session.state, 'opened')
+        window = session.windows[0]
+        for obj in window.traverse():
+            self.assertEqual(obj.state, 'initialized')
+
+    def test_order(self):
+        """ Test that objects are initialized in the same order as open.
+
+        """
+        def record(session, opener):
+            log = []
+            def on_open():
+                ViewSession.on_open(session)
+                for obj in session.windows[0].traverse():
+                    obj.on_trait_change(
+                        lambda obj=obj: log.append(obj.object_id),
+                        'initialized',
+                    )
+            session.on_open = on_open
+            opener(session)
+            window = session.windows[0]
+            ids = dict((o.object_id, i) for i, o in enumerate(window.traverse()))
+            return [ids[object_id] for object_id in log]
+        eager = record(ViewSession(), lambda s: s.open('id'))
+        lazy = record(ViewSession(), lambda s: list(s.iter_open('id')))
+        self.assertEqual(eager, lazy)
+
+
+class TestIncrementalTask(unittest.TestCase):
+
+    def setUp(self):
+        self.app = LoopApplication()
+
+    def tearDown(self):
+        self.app.destroy()
+
+    def test_time_slices(self):
+        """ Test that a task runs one tick per scheduled call.
+
+        """
+        log = []
+        def steps(name):
+            for i in range(3):
+                log.append((name, i))
+                yield i
+        progress = []
+        done = []
+        first = IncrementalTask(steps('a'), 0.0, progress.append,
+                                lambda: done.append('a'))
+        second = IncrementalTask(steps('b'), 0.0, None,
+                                 lambda: done.append('b'))
+        first.start()
+        second.start()
+        self.assertEqual(log, [])
+        self.app.run_pending()
+        self.assertEqual(log, [
+            ('a', 0), ('b', 0), ('a', 1), ('b', 1), ('a', 2), ('b', 2),
+        ])
+        self.assertEqual(progress, [0, 1, 2])
+        self.assertEqual(done, ['a', 'b'])
+        self.assertTrue(first.finished())
+
+    def test_cancel(self):
+        """ Test that a cancelled task runs no more steps.
+
+        """
+        log = []
+        def steps():
+            for i in range(5):
+                log.append(i)
+                yield
+        done = []
+        task = IncrementalTask(steps(), 0.0, done=lambda: done.append(1))
+        task.start()
+        self.app.run_pending()
+        task = IncrementalTask(steps(), 0.0, done=lambda: done.append(2))
+        task.start()
+        task._tick()
+        task.cancel()
+        self.app.run_pending()
+        self.assertEqual(log, [0, 1, 2, 3, 4, 0])
+        self.assertEqual(done, [1])
+
+    def test_open_session(self):
+        """ Test opening a session with an incremental task.
+
+        """
+        session = ViewSession()
+        progress = []
+        task = IncrementalTask(session.iter_open('id'), 0.0, progress.append)
+        task.start()
+        self.assertEqual(session.state, 'inactive')
+        self.app.run_pending()
+        self.assertEqual(session.state, 'opened')
+        self.assertEqual(progress[-1], 1.0)
+        self.assertEqual(len(progress), 8)
+
+
+class RecordingClient(object):
+    """ A client session which records how it is built and torn down.
+
+    """
+    def __init__(self, fail_at=None):
+        self.fail_at = fail_at
+        self.chunks = []
+        self.socket = None
+        self.destroyed = False
+
+    def build_chunk(self, chunk):
+        if len(self.chunks) == self.fail_at:
+            raise ValueError('bad chunk')
+        self.chunks.append(chunk)
+
+    def activate(self, socket):
+        self.socket = socket
+
+    def destroy(self):
+        self.destroyed = True
+
+
+class TestOpenPair(unittest.TestCase):
+
+    def setUp(self):
+        self.app = LoopApplication()
+        self.session = ViewSession()
+
+    def tearDown(self):
+        self.app.destroy()
+
+    def open_pair(self, client):
+        connect = lambda: (RecordingSocket(), RecordingSocket())
+        return self.app._iter_open_pair(
+            self.session, 'id', 2, lambda session: client, connect
+        )
+
+    def test_open(self):
+        """ Test that both sessions are opened and activated.
+
+        """
+        client = RecordingClient()
+        values = list(self.open_pair(client))
+        self.assertEqual(values[-1], 1.0)
+        self.assertEqual(values, sorted(values))
+        self.assertEqual(self.session.state, 'active')
+        self.assertIsNotNone(client.socket)
+        self.assertFalse(client.destroyed)
+
+    def test_failed_chunk(self):
+        """ Test that a failing chunk tears down both sessions.
+
+        """
+        client = RecordingClient(fail_at=1)
+        self.assertRaises(ValueError, list, self.open_pair(client))
+        self.assertEqual(self.session.state, 'closed')
+        self.assertEqual(self.session.windows, [])
+        self.assertTrue(client.destroyed)
+        self.assertIsNone(client.socket)
+
+    def test_cancel(self):
+        """ Test that closing the generator tears down both sessions.
+
+        """
+        client = RecordingClient()
+        steps = self.open_pair(client)
+        while not client.chunks:
+            steps.next()
+        steps.close()
+        self.assertEqual(self.session.state, 'closed')
+        self.assertTrue(client.destroyed)
+
+
+class TestCoalescing(unittest.TestCase):
+
+    def setUp(self):
+        self.app = LoopApplication()
+        self.session = SliderSession(coalesce_attributes=True)
+        self.session.open('id')
+        self.socket = RecordingSocket()
+        self.session.activate(self.socket)
+
+    def tearDown(self):
+        self.app.destroy()
+
+    def test_last_write_wins(self):
+        """ Test that only the latest value of an attribute is sent.
+
+        """
+        session = self.session
+        first = session.first
+        second = session.second
+        for value in range(1, 51):
+            first.value = value
+            second.value = value
+        first.value = 10
+        self.assertEqual(self.socket.messages, [])
+        self.app.run_pending()
+        self.assertEqual(self.socket.messages, [
+            (second.object_id, 'set_value', {'value': 50}),
+            (first.object_id, 'set_value', {'value': 10}),
+        ])
+        stats = {'queued': 101, 'elided': 99}
+        self.assertEqual(session.coalesce_stats, stats)
+
+    def test_order(self):
+        """ Test that coalesced actions are sent before later actions.
+
+        """
+        session = self.session
+        first = session.first
+        first.value = 1
+        first.value = 2
+        session.send(first.object_id, 'custom', {})
+        first.value = 3
+        self.app.run_pending()
+        self.assertEqual(self.socket.messages, [
+            (first.object_id, 'set_value', {'value': 2}),
+            (first.object_id, 'custom', {}),
+            (first.object_id, 'set_value', {'value': 3}),
+        ])
+
+    def test_disabled(self):
+        """ Test that every action is sent when coalescing is disabled.
+
+        """
+        session = SliderSession()
+        session.open('other')
+        socket = RecordingSocket()
+        session.activate(socket)
+        for value in range(1, 6):
+            session.first.value = value
+        self.assertEqual(len(socket.messages), 5)
+        self.assertEqual(session.coalesce_stats, {'queued': 0, 'elided': 0})
+
+    def test_class_default(self):
+        """ Test coalescing enabled by a class default.
+
+        """
+        class CoalescingSession(SliderSession):
+            coalesce_attributes = True
+        session = CoalescingSession()
+        session.open('other')
+        socket = RecordingSocket()
+        session.activate(socket)
+        session.first.value = 1
+        session.first.value = 2
+        self.app.run_pending()
+        first_id = session.first.object_id
+        self.assertEqual(socket.messages, [
+            (first_id, 'set_value', {'value': 2}),
+        ])
+
+
+class TestFlowControl(unittest.TestCase):
+
+    def setUp(self):
+        self.app = LoopApplication()
+
+    def tearDown(self):
+        self.app.destroy()
+
+    def activate(self, policy=None):
+        session = SliderSession(outbox_high_watermark=4)
+        session.outbox_low_watermark = 1
+        if policy is not None:
+            session.outbox_policy = policy
+        session.open('id')
+        socket = RecordingSocket()
+        session.activate(socket)
+        states = []
+        session.on_trait_change(lambda new: states.append(new), 'congested')
+        return session, socket, states
+
+    def ack(self, session, socket):
+        """ Acknowledge the last sync written to the socket.
+
+        """
+        syncs = [msg for msg in socket.messages if msg[1] == 'sync']
+        session.on_message('id', 'ack', syncs[-1][2])
+
+    def actions(self, socket):
+        return [msg[1] for msg in socket.messages if msg[1] != 'sync']
+
+    def test_watermarks(self):
+        """ Test that the client window and congested state follow the
+        acknowledgements of the client.
+
+        """
+        session, socket, states = self.activate()
+        for idx in range(10):
+            session.send('id', 'custom_%d' % idx, {})
+        self.assertEqual(len(self.actions(socket)), 4)
+        self.assertEqual(session.outbox_stats, {
+            'in_flight': 4, 'queued': 6, 'dropped': 0,
+        })
+        self.assertEqual(states, [True])
+        self.ack(session, socket)
+        self.assertEqual(len(self.actions(socket)), 8)
+        self.assertTrue(session.congested)
+        self.app.run_pending()
+        self.ack(session, socket)
+        self.app.run_pending()
+        self.ack(session, socket)
+        expected = ['custom_%d' % idx for idx in range(10)]
+        self.assertEqual(self.actions(socket), expected)
+        self.assertEqual(states, [True, False])
+        self.assertEqual(session.outbox_stats['in_flight'], 0)
+
+    def test_drop_oldest(self):
+        """ Test that the drop oldest policy drops attribute actions.
+
+        """
+        session, socket, states = self.activate(DropOldestPolicy(2))
+        for idx in range(4):
+            session.send('id', 'custom_%d' % idx, {})
+        for value in range(3):
+            session.send('obj', 'set_value', {'value': value})
+        session.send('id', 'custom_4', {})
+        self.assertEqual(session.outbox_stats['dropped'], 2)
+        self.ack(session, socket)
+        self.assertEqual(self.actions(socket)[4:], ['set_value', 'custom_4'])
+        values = [msg[2] for msg in socket.messages if msg[1] == 'set_value']
+        self.assertEqual(values, [{'value': 2}])
+
+    def test_coalesce(self):
+        """ Test that the coalesce policy keeps the latest attribute.
+
+        """
+        session, socket, states = self.activate(CoalescePolicy())
+        first = session.first
+        for value in range(1, 11):
+            first.value = value
+        self.assertEqual(session.outbox_stats, {
+            'in_flight': 4, 'queued': 1, 'dropped': 5,
+        })
+        self.ack(session, socket)
+        values = [
+            msg[2]['value'] for msg in socket.messages
+            if msg[1] == 'set_value'
+        ]
+        self.assertEqual(values, [1, 2, 3, 4, 10])
+
+    def send_from_thread(self, session, timeout):
+        """ Send a message from a worker thread and wait for the
+        thread for at most `timeout` seconds.
+
+        """
+        done = []
+        def worker():
+            session.send('id', 'late', {})
+            done.append(True)
+        thread = threading.Thread(target=worker)
+        thread.daemon = True
+        thread.start()
+        thread.join(timeout)
+        return thread, done
+
+    def test_close_releases(self):
+        """ Test that closing a session releases a blocked worker.
+
+        """
+        session, socket, states = self.activate(BlockPolicy(10.0))
+        for idx in range(4):
+            session.send('id', 'custom_%d' % idx, {})
+        self.assertTrue(session.congested)
+        thread, done = self.send_from_thread(session, 0.1)
+        self.assertEqual(done, [])
+        session.close()
+        thread.join(5.0)
+        self.assertEqual(done, [True])
+        self.assertFalse(session.congested)
+        self.assertNotIn('late', self.actions(socket))
+
+    def test_block_timeout(self):
+        """ Test that a worker is blocked for at most the timeout of
+        the block policy.
+
+        """
+        session, socket, states = self.activate(BlockPolicy(0.05))
+        for idx in range(4):
+            session.send('id', 'custom_%d' % idx, {})
+        thread, done = self.send_from_thread(session, 5.0)
+        self.assertEqual(done, [True])
+        self.assertEqual(session.outbox_stats['queued'], 1)
+        self.ack(session, socket)
+        self.assertEqual(self.actions(socket)[-1], 'late')
+
+    def test_disabled(self):
+        """ Test that no syncs are sent without a high watermark.
+
+        """
+        session = SliderSession()
+        session.open('id')
+        socket = RecordingSocket()
+        session.activate(socket)
+        for value in range(1, 11):
+            session.first.value = value
+        self.app.run_pending()
+        self.assertEqual(len(socket.messages), 10)
+        self.assertFalse(session.congested)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import random
+import unittest
+
+from enaml.utils import apply_splices, sequence_checksum, sequence_splices
+
+
+class TestSequenceSplices(unittest.TestCase):
+
+    def check(self, old, new):
+        splices = sequence_splices(old, new)
+        self.assertEqual(apply_splices(old, splices), list(new))
+        return splices
+
+    def test_small_changes(self):
+        """ Test that small changes produce small splices.
+
+        """
+        old = range(5000)
+        self.assertEqual(self.check(old, old), [])
+        self.assertEqual(self.check(old, old + [-1]), [[5000, 0, [-1]]])
+        new = old[:10] + [-1] + old[10:]
+        self.assertEqual(self.check(old, new), [[10, 0, [-1]]])
+        new = old[:10] + old[11:]
+        self.assertEqual(self.check(old, new), [[10, 1, []]])
+        new = [-1] + old[1:]
+        self.assertEqual(self.check(old, new), [[0, 1, [-1]]])
+
+    def test_move(self):
+        """ Test that a move is a removal and an insertion.
+
+        """
+        old = range(10)
+        new = old[:2] + old[5:8] + old[2:5] + old[8:]
+        splices = self.check(old, new)
+        inserted = sum(len(items) for _, _, items in splices)
+        self.assertEqual(inserted, 3)
+
+    def test_random(self):
+        """ Test random edits of random sequences.
+
+        """
+        rng = random.Random(12)
+        for i in range(200):
+            old = rng.sample(range(50), rng.randint(0, 20))
+            new = list(old)
+            for j in range(rng.randint(0, 5)):
+                op = rng.choice(('insert', 'remove', 'move'))
+                if op == 'insert':
+                    new.insert(rng.randint(0, len(new)), 100 + i * 10 + j)
+                elif new:
+                    item = new.pop(rng.randrange(len(new)))
+                    if op == 'move':
+                        new.insert(rng.randint(0, len(new)), item)
+            self.check(old, new)
+
+    def test_checksum(self):
+        """ Test that the checksum depends on the order of the ids.
+
+        """
+        ids = ['a1', 'b2', 'c3']
+        self.assertEqual(sequence_checksum(ids), sequence_checksum(
+            [u'a1', u'b2', u'c3']
+        ))
+        self.assertNotEqual(sequence_checksum(ids), sequence_checksum(
+            ['a1', 'c3', 'b2']
+        ))
+        self.assertNotEqual(sequence_checksum(['a', 'b']), sequence_checksum(
+            ['ab']
+        ))
+
+
+if __name__ == '__main__':
+    unittest.main()
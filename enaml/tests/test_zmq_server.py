@@ -0,0 +1,318 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import threading
+from timeit import default_timer
+import unittest
+
+try:
+    import zmq
+except ImportError:
+    zmq = None
+
+try:
+    from enaml.qt.qt.QtGui import QApplication
+    from enaml.qt.qt_session import QtSession
+except Exception:
+    QtSession = None
+
+from enaml.message_codecs import BinaryCodec, CompressingCodec
+from enaml.session import Session
+from enaml.widgets.container import Container
+from enaml.widgets.field import Field
+from enaml.widgets.window import Window
+
+if zmq is not None:
+    from enaml.zeromq.zmq_client import ZMQClient
+    from enaml.zeromq.zmq_server import ZMQServer
+
+
+class FieldSession(Session):
+    """ A session with a window which holds a field.
+
+    """
+    def on_open(self):
+        window = Window()
+        self.container = Container(window)
+        self.field = Field(self.container, text=u'initial')
+        self.windows = [window]
+
+
+class RecordingClientSession(object):
+    """ A client session which records the messages from the server.
+
+    """
+    def __init__(self, session_id, widget_groups):
+        self.session_id = session_id
+        self.widget_groups = widget_groups
+        self.windows = None
+        self.socket = None
+        self.messages = []
+
+    def open(self, windows):
+        self.windows = windows
+
+    def activate(self, socket):
+        self.socket = socket
+        socket.on_message(self.on_message)
+
+    def on_message(self, object_id, action, content):
+        self.messages.append((object_id, action, content))
+
+    def send(self, object_id, action, content):
+        self.socket.send(object_id, action, content)
+
+    def actions(self):
+        return [action for object_id, action, content in self.messages]
+
+
+@unittest.skipIf(zmq is None, 'pyzmq is not installed')
+class TestZMQServer(unittest.TestCase):
+
+    #: The factory of the client sessions.
+    session_factory = RecordingClientSession
+
+    def setUp(self):
+        self.context = zmq.Context()
+        factory = FieldSession.factory('fields')
+        self.server = ZMQServer(
+            [factory], 'tcp://127.0.0.1:*', self.context, ping_interval=0.05,
+        )
+        self.client = ZMQClient(
+            self.server.endpoint, self.session_factory, self.context,
+            ['binary'],
+        )
+
+    def tearDown(self):
+        self.client.close()
+        self.server.destroy()
+        self.context.term()
+
+    def pump(self, condition):
+        """ Run the server and the client until a condition is met.
+
+        """
+        for idx in range(200):
+            if condition():
+                return
+            self.server.process_events(0.005)
+            self.client.process_events(0.005)
+        self.fail('timed out waiting for the server')
+
+    def start(self):
+        self.client.start_session('fields')
+        self.pump(lambda: self.server.sessions())
+        session = self.server.sessions()[0]
+        client_session = self.client.session(session.session_id)
+        self.pump(lambda: client_session.socket is not None)
+        return session, client_session
+
+    def test_discover(self):
+        """ Test discovering the sessions of the server.
+
+        """
+        self.client.discover()
+        self.pump(lambda: self.client.discovered is not None)
+        self.assertEqual(self.client.discovered[0]['name'], 'fields')
+
+    def test_open(self):
+        """ Test that a started session is opened with its snapshot.
+
+        """
+        session, client_session = self.start()
+        self.assertEqual(session.state, 'active')
+        self.assertIsNotNone(session.socket.routing_id)
+        tree = client_session.windows[0]
+        self.assertEqual(tree['object_id'], session.windows[0].object_id)
+        field = tree['children'][0]['children'][0]
+        self.assertEqual(field['text'], u'initial')
+        names = {session.session_id: 'fields'}
+        self.assertEqual(self.client.sessions(), names)
+
+    def test_messages(self):
+        """ Test the exchange of actions between the session pair.
+
+        """
+        session, client_session = self.start()
+        field = session.field
+        client_session.send(field.object_id, 'submit_text', {'text': u'new'})
+        self.pump(lambda: field.text == u'new')
+
+        field.text = u'server'
+        Field(session.container)
+        self.pump(lambda: 'message_batch' in client_session.actions())
+        self.assertIn(
+            (field.object_id, 'set_text', {'text': u'server'}),
+            client_session.messages,
+        )
+
+        content = {'id': 'r1', 'url': 'bogus://x', 'metadata': {}}
+        client_session.send(session.session_id, 'url_request', content)
+        self.pump(lambda: 'url_reply' in client_session.actions())
+        replies = [
+            content for object_id, action, content in client_session.messages
+            if action == 'url_reply'
+        ]
+        reply = replies[0]
+        self.assertEqual(reply['status'], 'fail')
+        self.assertEqual(reply['id'], 'r1')
+
+    def test_compression(self):
+        """ Test that large messages are compressed.
+
+        """
+        session, client_session = self.start()
+        codec = session.socket._codec
+        self.assertEqual(codec.compression, 'zlib')
+        text = u'compressible text ' * 1000
+        session.field.text = text
+        self.pump(lambda: len(client_session.messages) > 0)
+        self.assertEqual(client_session.messages[-1][2], {'text': text})
+        fresh = CompressingCodec(BinaryCodec(), 'zlib', codec.threshold)
+        data = fresh.encode('id', 'set_text', {'text': text})
+        self.assertTrue(len(data) < len(text) / 10)
+
+    def test_end_session(self):
+        """ Test that ending a session closes both sides.
+
+        """
+        session, client_session = self.start()
+        self.client.end_session(session.session_id)
+        self.pump(lambda: self.client.session(session.session_id) is None)
+        self.assertEqual(session.state, 'closed')
+        self.assertEqual(self.server.sessions(), [])
+        self.assertEqual(client_session.actions()[-1], 'close')
+
+    def test_invalid_session(self):
+        """ Test that an invalid session name is reported to the client.
+
+        """
+        self.client.start_session('missing')
+        self.pump(lambda: self.client.errors)
+        error = ('missing', 'Invalid session name')
+        self.assertEqual(self.client.errors, [error])
+        self.assertEqual(self.server.sessions(), [])
+
+    def test_attach(self):
+        """ Test attaching a client to a session started by the server.
+
+        """
+        server = self.server
+        session_id = server.start_session('fields')
+        session = server.session(session_id)
+        self.assertEqual(session.state, 'opened')
+        self.client.attach_session(session_id)
+        self.pump(lambda: self.client.session(session_id) is not None)
+        client_session = self.client.session(session_id)
+        self.pump(lambda: client_session.socket is not None)
+        self.assertEqual(session.state, 'active')
+        self.assertEqual(self.client.sessions(), {session_id: 'fields'})
+        self.client.attach_session(session_id)
+        self.pump(lambda: self.client.errors)
+        self.assertEqual(self.client.errors, [
+            (session_id, 'Invalid session id'),
+        ])
+
+    def test_attach_opening(self):
+        """ Test attaching a client to a session which is opening.
+
+        """
+        session_id = self.server.start_session('fields', budget=0.0)
+        self.assertIsNone(self.server.session(session_id))
+        self.client.attach_session(session_id)
+        self.pump(lambda: self.client.session(session_id) is not None)
+        client_session = self.client.session(session_id)
+        self.pump(lambda: client_session.socket is not None)
+        self.assertEqual(self.server.session(session_id).state, 'active')
+
+    def test_lost_client(self):
+        """ Test that the sessions of a client which has gone away are
+        ended.
+
+        """
+        session, client_session = self.start()
+        self.client.close()
+        end = default_timer() + 5.0
+        while self.server.sessions() and default_timer() < end:
+            self.server.process_events(0.01)
+        self.assertEqual(self.server.sessions(), [])
+        self.assertEqual(session.state, 'closed')
+
+    def test_wake(self):
+        """ Test that a call deferred from another thread wakes the
+        event loop of the server.
+
+        """
+        results = []
+        def worker():
+            self.server.deferred_call(results.append, 'call')
+        thread = threading.Thread(target=worker)
+        start = default_timer()
+        thread.start()
+        while not results and default_timer() - start < 5.0:
+            self.server.process_events(2.0)
+        thread.join()
+        self.assertEqual(results, ['call'])
+        self.assertTrue(default_timer() - start < 1.0)
+
+    def test_call_errors(self):
+        """ Test that a failing call does not stop the later calls.
+
+        """
+        results = []
+        def fail():
+            raise ValueError('failed')
+        self.server.deferred_call(fail)
+        self.server.deferred_call(results.append, 'call')
+        self.server.timed_call(0, fail)
+        self.server.timed_call(0, results.append, 'timer')
+        self.pump(lambda: len(results) == 2)
+        self.assertEqual(sorted(results), ['call', 'timer'])
+
+
+@unittest.skipIf(zmq is None or QtSession is None, 'requires pyzmq and Qt')
+class TestZMQQtClient(unittest.TestCase):
+
+    def setUp(self):
+        self.qapp = QApplication.instance() or QApplication([])
+        self.context = zmq.Context()
+        factory = FieldSession.factory('fields')
+        self.server = ZMQServer([factory], 'tcp://127.0.0.1:*', self.context)
+        self.client = ZMQClient(self.server.endpoint, QtSession, self.context)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.destroy()
+        self.context.term()
+
+    def pump(self, condition):
+        for idx in range(200):
+            if condition():
+                return
+            self.server.process_events(0.005)
+            self.client.process_events(0.005)
+            self.qapp.processEvents()
+        self.fail('timed out waiting for the server')
+
+    def test_session(self):
+        """ Test that a Qt client session mirrors the server session.
+
+        """
+        self.client.start_session('fields')
+        self.pump(lambda: self.server.sessions())
+        session = self.server.sessions()[0]
+        field_id = session.field.object_id
+        client_session = self.client.session(session.session_id)
+        self.pump(lambda: client_session.lookup(field_id) is not None)
+        widget = client_session.lookup(field_id).widget()
+        self.assertEqual(widget.text(), u'initial')
+        session.field.text = u'server'
+        self.pump(lambda: widget.text() == u'server')
+        self.client.end_session(session.session_id)
+        self.pump(lambda: self.client.session(session.session_id) is None)
+        self.assertEqual(client_session.lookup(field_id), None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Utilities shared by the tests and the benchmarks.
+
+"""
+import threading
+import types
+
+from enaml.application import Application
+from enaml.core.enaml_compiler import EnamlCompiler
+from enaml.core.parser import parse
+
+
+def compile_source(source, name='__enaml_tests__'):
+    """ Compile an Enaml source string into a new module.
+
+    Parameters
+    ----------
+    source : str
+        The Enaml source code to compile.
+
+    name : str, optional
+        The name of the module, which is also used as the filename of
+        the compiled code. The default is '__enaml_tests__'.
+
+    Returns
+    -------
+    result : module
+        A new module in which the compiled code has been executed.
+
+    """
+    code = EnamlCompiler.compile(parse(source), name)
+    module = types.ModuleType(name)
+    exec code in module.__dict__
+    return module
+
+
+class LoopApplication(Application):
+    """ An application which runs deferred calls on demand.
+
+    The deferred and timed calls are queued until `run_pending` is
+    called, so a test controls when the event loop runs. The thread
+    named 'MainThread' is the main thread of the application.
+
+    """
+    def __init__(self):
+        super(LoopApplication, self).__init__([])
+        self.calls = []
+
+    def run_pending(self):
+        while self.calls:
+            callback, args, kwargs = self.calls.pop(0)
+            callback(*args, **kwargs)
+
+    def start_session(self, name, budget=None):
+        raise NotImplementedError
+
+    def end_session(self, session_id):
+        raise NotImplementedError
+
+    def session(self, session_id):
+        return None
+
+    def sessions(self):
+        return []
+
+    def start(self):
+        self.run_pending()
+
+    def stop(self):
+        pass
+
+    def deferred_call(self, callback, *args, **kwargs):
+        self.calls.append((callback, args, kwargs))
+
+    def timed_call(self, ms, callback, *args, **kwargs):
+        self.calls.append((callback, args, kwargs))
+
+    def is_main_thread(self):
+        return threading.current_thread().name == 'MainThread'
+
+
+class RecordingSession(object):
+    """ A session which records the objects and messages it handles.
+
+    """
+    session_id = 'session'
+
+    def __init__(self):
+        self.objects = {}
+        self.messages = []
+
+    def register(self, obj):
+        self.objects[obj.object_id] = obj
+
+    def unregister(self, obj):
+        self.objects.pop(obj.object_id, None)
+
+    def send(self, object_id, action, content):
+        self.messages.append((object_id, action, content))
@@ -6,10 +6,12 @@
 
 """
 from collections import defaultdict
+from difflib import SequenceMatcher
 from functools import wraps
 import logging
 from random import shuffle
 from string import letters, digits
+import zlib
 
 
 def id_generator(stem):
@@ -238,6 +240,103 @@ def log_exceptions(func):
         return res
     return closure
 
+def sequence_splices(old, new):
+    """ Compute the splices which transform one sequence into another.
+
+    A splice is a list of the form `[index, count, items]`, which means
+    that `count` items starting at `index` are replaced by `items`. The
+    splices are ordered from the end of the sequence to the start, so
+    each index refers to a position in the original sequence. A moved
+    item appears as a removal in one splice and an insertion in another.
+
+    Common leading and trailing items are trimmed before the remainder
+    is diffed, so the common cases of appending, inserting or removing
+    a few items are computed in linear time.
+
+    Parameters
+    ----------
+    old : sequence
+        The original sequence of hashable items.
+
+    new : sequence
+        The updated sequence of hashable items.
+
+    Returns
+    -------
+    result : list
+        The list of splices which transform `old` into `new` when they
+        are applied in order with `apply_splices`.
+
+    """
+    old_len = len(old)
+    new_len = len(new)
+    start = 0
+    limit = min(old_len, new_len)
+    while start < limit and old[start] == new[start]:
+        start += 1
+    old_end = old_len
+    new_end = new_len
+    while old_end > start and new_end > start and \
+            old[old_end - 1] == new[new_end - 1]:
+        old_end -= 1
+        new_end -= 1
+    old_mid = old[start:old_end]
+    new_mid = new[start:new_end]
+    if not old_mid or not new_mid:
+        if not old_mid and not new_mid:
+            return []
+        return [[start, len(old_mid), list(new_mid)]]
+    matcher = SequenceMatcher(None, old_mid, new_mid, autojunk=False)
+    splices = []
+    for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+        if tag != 'equal':
+            splices.append([start + i1, i2 - i1, list(new_mid[j1:j2])])
+    return splices
+
+
+def sequence_checksum(ids):
+    """ Compute a checksum of a sequence of string ids.
+
+    The checksum is sent with a list of splices, so that the receiver
+    can verify that it applies the splices to the same sequence as the
+    sender.
+
+    Parameters
+    ----------
+    ids : sequence
+        A sequence of str or unicode ids.
+
+    Returns
+    -------
+    result : int
+        The unsigned CRC-32 of the ids.
+
+    """
+    data = u'\x00'.join(ids).encode('utf-8')
+    return zlib.crc32(data) & 0xffffffff
+
+
+def apply_splices(items, splices):
+    """ Apply the splices computed by `sequence_splices`.
+
+    Parameters
+    ----------
+    items : sequence
+        The original sequence of items.
+
+    splices : list
+        The splices to apply to the sequence.
+
+    Returns
+    -------
+    result : list
+        A new list with the splices applied.
+
+    """
+    items = list(items)
+    for index, count, inserted in splices:
+        items[index:index + count] = inserted
+    return items
 
 
 def make_dispatcher(prefix, logger=None):
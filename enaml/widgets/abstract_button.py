@@ -47,11 +47,11 @@ class AbstractButton(Control):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Returns the snapshot for an abstract button.
 
         """
-        snap = super(AbstractButton, self).snapshot()
+        snap = super(AbstractButton, self).snapshot(shallow)
         snap['text'] = self.text
         snap['checkable'] = self.checkable
         snap['checked'] = self.checked
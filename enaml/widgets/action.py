@@ -57,11 +57,11 @@ class Action(Messenger):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Returns the snapshot dict for the Action.
 
         """
-        snap = super(Action, self).snapshot()
+        snap = super(Action, self).snapshot(shallow)
         snap['text'] = self.text
         snap['tool_tip'] = self.tool_tip
         snap['status_tip'] = self.status_tip
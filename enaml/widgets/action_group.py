@@ -33,11 +33,11 @@ class ActionGroup(Messenger):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Returns the snapshot dict for the ActionGroup.
 
         """
-        snap = super(ActionGroup, self).snapshot()
+        snap = super(ActionGroup, self).snapshot(shallow)
         snap['exclusive'] = self.exclusive
         snap['enabled'] = self.enabled
         snap['visible'] = self.visible
@@ -40,12 +40,12 @@ class BoundedDate(Control):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Return a dictionary which contains all the state necessary to
         initialize a client widget.
 
         """
-        snap = super(BoundedDate, self).snapshot()
+        snap = super(BoundedDate, self).snapshot(shallow)
         snap['minimum'] = self.minimum.isoformat()
         snap['maximum'] = self.maximum.isoformat()
         snap['date'] = self.date.isoformat()
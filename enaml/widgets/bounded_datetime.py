@@ -44,12 +44,12 @@ class BoundedDatetime(Control):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Return a dictionary which contains all the state necessary to
         initialize a client widget.
 
         """
-        snap = super(BoundedDatetime, self).snapshot()
+        snap = super(BoundedDatetime, self).snapshot(shallow)
         snap['minimum'] = self.minimum.isoformat()
         snap['maximum'] = self.maximum.isoformat()
         snap['datetime'] = self.datetime.isoformat()
@@ -39,12 +39,12 @@ class BoundedTime(Control):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Return a dictionary which contains all the state necessary to
         initialize a client widget.
 
         """
-        snap = super(BoundedTime, self).snapshot()
+        snap = super(BoundedTime, self).snapshot(shallow)
         snap['minimum'] = self.minimum.isoformat()
         snap['maximum'] = self.maximum.isoformat()
         snap['time'] = self.time.isoformat()
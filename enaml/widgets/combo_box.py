@@ -36,11 +36,11 @@ class ComboBox(Control):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Returns the dict of creation attributes for the combo box.
 
         """
-        snap = super(ComboBox, self).snapshot()
+        snap = super(ComboBox, self).snapshot(shallow)
         snap['items'] = self.items
         snap['index'] = self.index
         snap['editable'] = self.editable
@@ -113,7 +113,7 @@ class ConstraintsWidget(Widget):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Populates the initial attributes dict for the component.
 
         A ConstraintsWidget adds the 'layout' key to the creation
@@ -129,7 +129,7 @@ class ConstraintsWidget(Widget):
             A tuple containing width and height hug policies.
 
         """
-        snap = super(ConstraintsWidget, self).snapshot()
+        snap = super(ConstraintsWidget, self).snapshot(shallow)
         snap['layout'] = self._layout_info()
         return snap
 
@@ -30,12 +30,12 @@ class DateSelector(BoundedDate):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Return a dictionary which contains all the state necessary to
         initialize a client widget.
 
         """
-        snap = super(DateSelector, self).snapshot()
+        snap = super(DateSelector, self).snapshot(shallow)
         snap['date_format'] = self.date_format
         snap['calendar_popup'] = self.calendar_popup
         return snap
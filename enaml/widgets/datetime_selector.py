@@ -27,12 +27,12 @@ class DatetimeSelector(BoundedDatetime):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Return a dictionary which contains all the state necessary to
         initialize a client widget.
 
         """
-        snap = super(DatetimeSelector, self).snapshot()
+        snap = super(DatetimeSelector, self).snapshot(shallow)
         snap['datetime_format'] = self.datetime_format
         snap['calendar_popup'] = self.calendar_popup
         return snap
@@ -59,11 +59,11 @@ class DockPane(Widget):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Returns the snapshot dict for the DockPane.
 
         """
-        snap = super(DockPane, self).snapshot()
+        snap = super(DockPane, self).snapshot(shallow)
         snap['title'] = self.title
         snap['title_bar_visible'] = self.title_bar_visible
         snap['title_bar_orientation'] = self.title_bar_orientation
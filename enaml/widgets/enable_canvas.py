@@ -23,11 +23,11 @@ class EnableCanvas(Control):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Get the snapshot dict for the canvas.
 
         """
-        snap = super(EnableCanvas, self).snapshot()
+        snap = super(EnableCanvas, self).snapshot(shallow)
         snap['component'] = self.component
         return snap
 
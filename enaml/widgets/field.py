@@ -56,11 +56,11 @@ class Field(Control):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Returns the snapshot dict for the field.
 
         """
-        snap = super(Field, self).snapshot()
+        snap = super(Field, self).snapshot(shallow)
         snap['text'] = self.text
         snap['validator'] = self._client_validator()
         snap['submit_triggers'] = self.submit_triggers
@@ -43,11 +43,11 @@ class FlowArea(ConstraintsWidget):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Returns the snapshot dict for the FlowArea.
 
         """
-        snap = super(FlowArea, self).snapshot()
+        snap = super(FlowArea, self).snapshot(shallow)
         snap['direction'] = self.direction
         snap['align'] = self.align
         snap['horizontal_spacing'] = self.horizontal_spacing
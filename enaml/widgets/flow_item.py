@@ -47,11 +47,11 @@ class FlowItem(Widget):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Returns the snapshot dict for the FlowItem.
 
         """
-        snap = super(FlowItem, self).snapshot()
+        snap = super(FlowItem, self).snapshot(shallow)
         snap['preferred_size'] = self.preferred_size
         snap['align'] = self.align
         snap['stretch'] = self.stretch
@@ -23,11 +23,11 @@ class GroupBox(Container):
     #: The alignment of the title text.
     title_align = Enum('left', 'right', 'center')
 
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Populates the initial attributes dict for the component.
 
         """
-        snap = super(GroupBox, self).snapshot()
+        snap = super(GroupBox, self).snapshot(shallow)
         snap['title'] = self.title
         snap['flat'] = self.flat
         snap['title_align'] = self.title_align
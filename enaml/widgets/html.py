@@ -25,11 +25,11 @@ class Html(Control):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Return the dictionary of creation attributes for the control.
 
         """
-        snap = super(Html, self).snapshot()
+        snap = super(Html, self).snapshot(shallow)
         snap['source'] = self.source
         return snap
 
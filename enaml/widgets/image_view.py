@@ -32,11 +32,11 @@ class ImageView(Control):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Returns the dict of creation attribute for the control.
 
         """
-        snap = super(ImageView, self).snapshot()
+        snap = super(ImageView, self).snapshot(shallow)
         snap['source'] = self.source
         snap['scale_to_fit'] = self.scale_to_fit
         snap['allow_upscaling'] = self.allow_upscaling
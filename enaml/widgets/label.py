@@ -27,11 +27,11 @@ class Label(Control):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Returns the dict of creation attributes for the control.
 
         """
-        snap = super(Label, self).snapshot()
+        snap = super(Label, self).snapshot(shallow)
         snap['text'] = self.text
         snap['align'] = self.align
         snap['vertical_align'] = self.vertical_align
@@ -25,11 +25,11 @@ class Menu(Widget):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Returns the snapshot dict for the Menu.
 
         """
-        snap = super(Menu, self).snapshot()
+        snap = super(Menu, self).snapshot(shallow)
         snap['title'] = self.title
         snap['context_menu'] = self.context_menu
         return snap
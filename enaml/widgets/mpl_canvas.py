@@ -28,11 +28,11 @@ class MPLCanvas(Control):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Get the snapshot dict for the MPLCanvas.
 
         """
-        snap = super(MPLCanvas, self).snapshot()
+        snap = super(MPLCanvas, self).snapshot(shallow)
         snap['figure'] = self.figure
         snap['toolbar_visible'] = self.toolbar_visible
         return snap
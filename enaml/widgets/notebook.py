@@ -2,7 +2,7 @@
 #  Copyright (c) 2012, Enthought, Inc.
 #  All rights reserved.
 #------------------------------------------------------------------------------
-from traits.api import Enum, Bool, Property, cached_property
+from traits.api import Enum, Bool, Int, Property, cached_property
 
 from .constraints_widget import ConstraintsWidget
 from .page import Page
@@ -27,6 +27,19 @@ class Notebook(ConstraintsWidget):
     #: Whether or not the tabs in the notebook should be movable.
     tabs_movable = Bool(True)
 
+    #: The index of the selected page in the notebook's pages. It is
+    #: kept in sync with the tab selected by the user. If the index is
+    #: out of range or the page is hidden, the client keeps its current
+    #: selection.
+    index = Int(0)
+
+    #: Whether or not the pages are built lazily. When True, only the
+    #: page at the selected index is sent to the client when the
+    #: notebook is activated. The content of the other pages is sent
+    #: and built by the client when they are first selected. Changing
+    #: this value after the notebook is activated has no effect.
+    lazy = Bool(False)
+
     #: A read only property which returns the notebook's Pages.
     pages = Property(depends_on='children')
 
@@ -41,15 +54,16 @@ class Notebook(ConstraintsWidget):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Returns the snapshot for the control.
 
         """
-        snap = super(Notebook, self).snapshot()
+        snap = super(Notebook, self).snapshot(shallow)
         snap['tab_style'] = self.tab_style
         snap['tab_position'] = self.tab_position
         snap['tabs_closable'] = self.tabs_closable
         snap['tabs_movable'] = self.tabs_movable
+        snap['index'] = self.index
         return snap
 
     def bind(self):
@@ -59,12 +73,45 @@ class Notebook(ConstraintsWidget):
         super(Notebook, self).bind()
         attrs = (
             'tab_style', 'tab_position', 'tabs_closable', 'tabs_movable',
+            'index',
         )
         self.publish_attributes(*attrs)
 
+    def pre_activate(self, session):
+        """ A reimplemented activation method.
+
+        If the notebook is lazy, the content of all but the selected
+        page is deferred until the page is selected.
+
+        """
+        super(Notebook, self).pre_activate(session)
+        if self.lazy:
+            index = self.index
+            for idx, page in enumerate(self.pages):
+                if idx != index:
+                    page._deferred = True
+
+    #--------------------------------------------------------------------------
+    # Message Handling
+    #--------------------------------------------------------------------------
+    def on_action_index_changed(self, content):
+        """ Handle the `index_changed` action from the client widget.
+
+        """
+        with self.loopback_guard('index'):
+            self.index = content['index']
+
     #--------------------------------------------------------------------------
     # Private API
     #--------------------------------------------------------------------------
+    def _index_changed(self, index):
+        """ Send the content of a deferred page when it is selected.
+
+        """
+        pages = self.pages
+        if 0 <= index < len(pages):
+            pages[index].materialize_children()
+
     @cached_property
     def _get_pages(self):
         """ The getter for the 'pages' property.
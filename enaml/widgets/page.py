@@ -40,13 +40,14 @@ class Page(Widget):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Return the snapshot for the control.
 
         """
-        snap = super(Page, self).snapshot()
+        snap = super(Page, self).snapshot(shallow)
         snap['title'] = self.title
         snap['closable'] = self.closable
+        snap['deferred'] = self._deferred
         return snap
 
     def bind(self):
@@ -85,6 +86,12 @@ class Page(Widget):
         self.set_guarded(visible=False)
         self.closed()
 
+    def on_action_materialize(self, content):
+        """ Handle the 'materialize' action from the client widget.
+
+        """
+        self.materialize_children()
+
     #--------------------------------------------------------------------------
     # Public API
     #--------------------------------------------------------------------------
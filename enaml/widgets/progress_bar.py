@@ -47,11 +47,11 @@ class ProgressBar(Control):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Returns the dict of creation attributes for the control.
 
         """
-        snap = super(ProgressBar, self).snapshot()
+        snap = super(ProgressBar, self).snapshot(shallow)
         snap['maximum'] = self.maximum
         snap['minimum'] = self.minimum
         snap['value'] = self.value
@@ -43,12 +43,12 @@ class ScrollArea(ConstraintsWidget):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Return a dictionary which contains all the state necessary to
         initialize a client widget.
 
         """
-        snap = super(ScrollArea, self).snapshot()
+        snap = super(ScrollArea, self).snapshot(shallow)
         snap['horizontal_policy'] = self.horizontal_policy
         snap['vertical_policy'] = self.vertical_policy
         snap['widget_resizable'] = self.widget_resizable
@@ -42,11 +42,11 @@ class Separator(Control):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Returns the snapshot dictionary for the Separator.
 
         """
-        snap = super(Separator, self).snapshot()
+        snap = super(Separator, self).snapshot(shallow)
         snap['orientation'] = self.orientation
         snap['line_style'] = self.line_style
         snap['line_width'] = self.line_width
@@ -105,12 +105,12 @@ class Slider(Control):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Return a dictionary which contains all the state necessary to
         initialize a client widget.
 
         """
-        snap = super(Slider, self).snapshot()
+        snap = super(Slider, self).snapshot(shallow)
         for attr in _SLIDER_ATTRS:
             snap[attr] = getattr(self, attr)
         return snap
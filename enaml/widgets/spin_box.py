@@ -51,11 +51,11 @@ class SpinBox(Control):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Return the dict of creation attributes for the control.
 
         """
-        snap = super(SpinBox, self).snapshot()
+        snap = super(SpinBox, self).snapshot(shallow)
         attrs = {
             'maximum' : self.maximum,
             'minimum' : self.minimum,
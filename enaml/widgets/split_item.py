@@ -26,11 +26,11 @@ class SplitItem(Widget):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Return the dict of creation attributes for the control.
 
         """
-        snap = super(SplitItem, self).snapshot()
+        snap = super(SplitItem, self).snapshot(shallow)
         snap['preferred_size'] = self.preferred_size
         return snap
 
@@ -41,11 +41,11 @@ class Splitter(ConstraintsWidget):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Return the dict of creation attributes for the control.
 
         """
-        snap = super(Splitter, self).snapshot()
+        snap = super(Splitter, self).snapshot(shallow)
         snap['orientation'] = self.orientation
         snap['live_drag'] = self.live_drag
         return snap
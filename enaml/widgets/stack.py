@@ -2,7 +2,7 @@
 #  Copyright (c) 2012, Enthought, Inc.
 #  All rights reserved.
 #------------------------------------------------------------------------------
-from traits.api import Dict, Int, Property, cached_property
+from traits.api import Bool, Dict, Int, Property, cached_property
 
 from .constraints_widget import ConstraintsWidget
 from .stack_item import StackItem
@@ -23,17 +23,24 @@ class Stack(ConstraintsWidget):
     #: XXX Document the supported transitions.
     transition = Dict
 
+    #: Whether or not the stack items are built lazily. When True, only
+    #: the item at the current index is sent to the client when the
+    #: stack is activated. The content of the other items is sent and
+    #: built by the client when the index first changes to the item.
+    #: Changing this value after the stack is activated has no effect.
+    lazy = Bool(False)
+
     #: A read only property which returns the stack's StackItems
     stack_items = Property(depends_on='children')
 
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Returns the snapshot for the control.
 
         """
-        snap = super(Stack, self).snapshot()
+        snap = super(Stack, self).snapshot(shallow)
         snap['index'] = self.index
         snap['transition'] = self.transition
         return snap
@@ -45,6 +52,20 @@ class Stack(ConstraintsWidget):
         super(Stack, self).bind()
         self.publish_attributes('index', 'transition')
 
+    def pre_activate(self, session):
+        """ A reimplemented activation method.
+
+        If the stack is lazy, the content of all but the current item
+        is deferred until the index changes to the item.
+
+        """
+        super(Stack, self).pre_activate(session)
+        if self.lazy:
+            index = self.index
+            for idx, item in enumerate(self.stack_items):
+                if idx != index:
+                    item._deferred = True
+
     #--------------------------------------------------------------------------
     # Message Handling
     #--------------------------------------------------------------------------
@@ -58,6 +79,14 @@ class Stack(ConstraintsWidget):
     #--------------------------------------------------------------------------
     # Private API
     #--------------------------------------------------------------------------
+    def _index_changed(self, index):
+        """ Send the content of a deferred item when it is shown.
+
+        """
+        items = self.stack_items
+        if 0 <= index < len(items):
+            items[index].materialize_children()
+
     @cached_property
     def _get_stack_items(self):
         """ The getter for the 'stack_items' property.
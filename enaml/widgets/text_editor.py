@@ -35,11 +35,11 @@ class TextEditor(Control):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Returns the dict of creation attributes for the control.
 
         """
-        snap = super(TextEditor, self).snapshot()
+        snap = super(TextEditor, self).snapshot(shallow)
         snap['text'] = self.text
         snap['mode'] = self.mode
         snap['theme'] = self.theme
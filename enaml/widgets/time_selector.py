@@ -24,12 +24,12 @@ class TimeSelector(BoundedTime):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Return a dictionary which contains all the state necessary to
         initialize a client widget.
 
         """
-        snap = super(TimeSelector, self).snapshot()
+        snap = super(TimeSelector, self).snapshot(shallow)
         snap['time_format'] = self.time_format
         return snap
 
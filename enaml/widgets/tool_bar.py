@@ -71,11 +71,11 @@ class ToolBar(ConstraintsWidget):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Returns the snapshot dict for the DockPane.
 
         """
-        snap = super(ToolBar, self).snapshot()
+        snap = super(ToolBar, self).snapshot(shallow)
         snap['movable'] = self.movable
         snap['floatable'] = self.floatable
         snap['floating'] = self.floating
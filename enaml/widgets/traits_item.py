@@ -34,11 +34,11 @@ class TraitsItem(Control):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Get the snapshot dictionary for the TraitsItem widget.
 
         """
-        snap = super(TraitsItem, self).snapshot()
+        snap = super(TraitsItem, self).snapshot(shallow)
         snap['model'] = self.model
         snap['view'] = self.view
         snap['handler'] = self.handler
@@ -30,11 +30,11 @@ class WebView(Control):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Create the snapshot for the widget.
 
         """
-        snap = super(WebView, self).snapshot()
+        snap = super(WebView, self).snapshot(shallow)
         snap['url'] = self.url
         snap['html'] = self.html
         return snap
@@ -54,8 +54,8 @@ class Widget(Messenger):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
-        snap = super(Widget, self).snapshot()
+    def snapshot(self, shallow=False):
+        snap = super(Widget, self).snapshot(shallow)
         snap['enabled'] = self.enabled
         snap['visible'] = self.visible
         snap['bgcolor'] = self.bgcolor
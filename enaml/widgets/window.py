@@ -45,11 +45,11 @@ class Window(Widget):
     #--------------------------------------------------------------------------
     # Initialization
     #--------------------------------------------------------------------------
-    def snapshot(self):
+    def snapshot(self, shallow=False):
         """ Return the snapshot for a Window.
 
         """
-        snap = super(Window, self).snapshot()
+        snap = super(Window, self).snapshot(shallow)
         snap['title'] = self.title
         snap['initial_size'] = self.initial_size
         snap['modality'] = self.modality
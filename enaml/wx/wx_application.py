@@ -7,7 +7,7 @@ import uuid
 
 import wx
 
-from enaml.application import Application
+from enaml.application import Application, IncrementalTask
 
 from .wx_action_socket import wxActionSocket, EVT_ACTION_SOCKET
 from .wx_deferred_caller import DeferredCall, TimedCall
@@ -30,6 +30,10 @@ class WxApplication(Application):
     runs in the local process.
 
     """
+    #: The maximum number of objects built per step when a session is
+    #: opened incrementally.
+    incremental_chunk_size = 50
+
     def __init__(self, factories):
         """ Initialize a WxApplication.
 
@@ -44,11 +48,66 @@ class WxApplication(Application):
         self._wxapp = wx.GetApp() or wx.PySimpleApp()
         self._wx_sessions = {}
         self._sessions = {}
+        self._opening = {}
+
+    #--------------------------------------------------------------------------
+    # Private API
+    #--------------------------------------------------------------------------
+    def _open_session(self, session, session_id, chunk_size):
+        """ A generator which opens a server and client session pair.
+
+        See `Application._iter_open_pair`. The session is removed from
+        the opening sessions when the generator finishes, fails or is
+        closed, and a failed client session is discarded.
+
+        Parameters
+        ----------
+        session : Session
+            The server session to open.
+
+        session_id : str
+            The unique identifier to use for the session.
+
+        chunk_size : int
+            The maximum number of objects to build per step.
+
+        Returns
+        -------
+        result : generator
+            A generator which yields the fraction of the work which is
+            complete.
+
+        """
+        def create_client(session):
+            wx_session = WxSession(session_id, session.widget_groups[:])
+            self._wx_sessions[session_id] = wx_session
+            return wx_session
+
+        def connect():
+            server_socket = wxActionSocket()
+            client_socket = wxActionSocket()
+            server_socket.Bind(EVT_ACTION_SOCKET, client_socket.receive)
+            client_socket.Bind(EVT_ACTION_SOCKET, server_socket.receive)
+            return server_socket, client_socket
+
+        steps = self._iter_open_pair(
+            session, session_id, chunk_size, create_client, connect
+        )
+        try:
+            for value in steps:
+                yield value
+            self._sessions[session_id] = session
+            session.open_progress = 1.0
+        finally:
+            steps.close()
+            self._opening.pop(session_id, None)
+            if session_id not in self._sessions:
+                self._wx_sessions.pop(session_id, None)
 
     #--------------------------------------------------------------------------
     # Abstract API Implementation
     #--------------------------------------------------------------------------
-    def start_session(self, name):
+    def start_session(self, name, budget=None):
         """ Start a new session of the given name.
 
         This method will create a new session object for the requested
@@ -60,6 +119,11 @@ class WxApplication(Application):
         name : str
             The name of the session to start.
 
+        budget : float, optional
+            If given, the session is opened incrementally, spending at
+            most about `budget` seconds per cycle of the event loop.
+            The default opens the session synchronously.
+
         Returns
         -------
         result : str
@@ -69,32 +133,22 @@ class WxApplication(Application):
         if name not in self._named_factories:
             raise ValueError('Invalid session name')
 
-        # Create and open a new server-side session.
         factory = self._named_factories[name]
         session = factory()
         session_id = uuid.uuid4().hex
-        session.open(session_id)
-        self._sessions[session_id] = session
-
-        # Create and open a new client-side session.
-        groups = session.widget_groups[:]
-        wx_session = WxSession(session_id, groups)
-        self._wx_sessions[session_id] = wx_session
-        wx_session.open(session.snapshot())
-
-        # Setup the sockets for the session pair
-        server_socket = wxActionSocket()
-        client_socket = wxActionSocket()
-        server_socket.Bind(EVT_ACTION_SOCKET, client_socket.receive)
-        client_socket.Bind(EVT_ACTION_SOCKET, server_socket.receive)
-
-        # Activate the server and client sessions. The server session
-        # is activated first so that it is ready to receive messages
-        # sent by the client during activation. These messages will
-        # typically be requests for resources.
-        session.activate(server_socket)
-        wx_session.activate(client_socket)
-
+        if budget is None:
+            chunk_size = 500
+        else:
+            chunk_size = self.incremental_chunk_size
+        steps = self._open_session(session, session_id, chunk_size)
+        def progress(value):
+            session.open_progress = value
+        if budget is None:
+            IncrementalTask(steps, progress=progress).run()
+        else:
+            task = IncrementalTask(steps, budget, progress)
+            self._opening[session_id] = (task, session)
+            task.start()
         return session_id
 
     def end_session(self, session_id):
@@ -109,6 +163,10 @@ class WxApplication(Application):
             The unique identifier for the session to close.
 
         """
+        if session_id in self._opening:
+            task, session = self._opening.pop(session_id)
+            task.cancel()
+            return
         if session_id not in self._sessions:
             raise ValueError('Invalid session id')
         self._sessions.pop(session_id).close()
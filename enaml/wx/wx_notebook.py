@@ -367,6 +367,9 @@ class WxNotebook(WxConstraintsWidget):
     """ A Wx implementation of an Enaml Notebook.
 
     """
+    #: The initial selected page index in the notebook.
+    _initial_index = 0
+
     #--------------------------------------------------------------------------
     # Setup methods
     #--------------------------------------------------------------------------
@@ -390,6 +393,7 @@ class WxNotebook(WxConstraintsWidget):
         self.set_tab_position(tree['tab_position'])
         self.set_tabs_closable(tree['tabs_closable'])
         self.set_tabs_movable(tree['tabs_movable'])
+        self._initial_index = tree['index']
 
     def init_layout(self):
         """ Handle the layout initialization for the notebook.
@@ -401,6 +405,11 @@ class WxNotebook(WxConstraintsWidget):
             if isinstance(child, WxPage):
                 widget.AddWxPage(child.widget())
         widget.Bind(EVT_COMMAND_LAYOUT_REQUESTED, self.on_layout_requested)
+        widget.Bind(wx.EVT_NOTEBOOK_PAGE_CHANGED, self.on_page_changed)
+        widget.Bind(aui.EVT_AUINOTEBOOK_PAGE_CHANGED, self.on_page_changed)
+        with self.loopback_guard('index'):
+            self.set_index(self._initial_index)
+            self.materialize_page(widget.GetSelection())
 
     #--------------------------------------------------------------------------
     # Child Events
@@ -432,9 +441,51 @@ class WxNotebook(WxConstraintsWidget):
         """
         self.size_hint_updated()
 
+    def on_page_changed(self, event):
+        """ Handle the page changed event from the notebook.
+
+        """
+        event.Skip()
+        self.materialize_page(event.GetSelection())
+
+    #--------------------------------------------------------------------------
+    # Utility Methods
+    #--------------------------------------------------------------------------
+    def pages(self):
+        """ Get the WxPage children of the notebook, in order.
+
+        """
+        return [c for c in self.children() if isinstance(c, WxPage)]
+
+    def materialize_page(self, index):
+        """ Ask the page at the given index to materialize its content.
+
+        This is called when a page is shown, in case the content of the
+        page was deferred by a lazy notebook. The index of the page is
+        sent to the Enaml widget.
+
+        """
+        widget = self.widget()
+        if 0 <= index < widget.GetPageCount():
+            page = widget.GetPage(index)
+            for idx, child in enumerate(self.pages()):
+                if child.widget() is page:
+                    child.materialize()
+                    if 'index' not in self.loopback_guard:
+                        content = {'index': idx}
+                        self.send_action('index_changed', content)
+                    break
+
     #--------------------------------------------------------------------------
     # Message Handlers
     #--------------------------------------------------------------------------
+    def on_action_set_index(self, content):
+        """ Handle the 'set_index' action from the Enaml widget.
+
+        """
+        with self.loopback_guard('index'):
+            self.set_index(content['index'])
+
     def on_action_set_tab_style(self, content):
         """ Handle the 'set_tab_style' action from the Enaml widget.
 
@@ -462,6 +513,19 @@ class WxNotebook(WxConstraintsWidget):
     #--------------------------------------------------------------------------
     # Widget Update Methods
     #--------------------------------------------------------------------------
+    def set_index(self, index):
+        """ Select the page at the given index in the notebook pages.
+
+        A hidden page has no tab, and is not selected.
+
+        """
+        pages = self.pages()
+        if 0 <= index < len(pages):
+            widget = self.widget()
+            tab = widget.GetPageIndex(pages[index].widget())
+            if tab != -1:
+                widget.SetSelection(tab)
+
     def set_tab_style(self, style):
         """ Set the tab style for the underlying widget.
 
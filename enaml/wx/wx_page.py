@@ -220,6 +220,10 @@ class WxPage(WxWidget):
     """ A Wx implementation of an Enaml notebook Page.
 
     """
+    #: Whether the content of the page has been deferred by the
+    #: server until the page is first shown.
+    _deferred = False
+
     #--------------------------------------------------------------------------
     # Setup Methods
     #--------------------------------------------------------------------------
@@ -236,6 +240,7 @@ class WxPage(WxWidget):
         super(WxPage, self).create(tree)
         self.set_title(tree['title'])
         self.set_closable(tree['closable'])
+        self._deferred = tree['deferred']
         self.widget().Bind(EVT_PAGE_CLOSED, self.on_page_closed)
 
     def init_layout(self):
@@ -264,6 +269,18 @@ class WxPage(WxWidget):
                 widget = child.widget()
         return widget
 
+    def materialize(self):
+        """ Request the deferred content of the page from the server.
+
+        This method is called by the parent notebook when the page is
+        shown. It is a no-op unless the content of the page has been
+        deferred by a lazy notebook.
+
+        """
+        if self._deferred:
+            self._deferred = False
+            self.send_action('materialize', {})
+
     #--------------------------------------------------------------------------
     # Child Events
     #--------------------------------------------------------------------------
@@ -0,0 +1,409 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" The client side of the ZeroMQ session protocol.
+
+A ZMQClient connects a DEALER socket to a ZMQServer and hosts the client
+sessions, such as `QtSession` instances, of the sessions it starts. See
+`enaml.zeromq.zmq_server` for a description of the protocol.
+
+"""
+import logging
+import types
+
+import zmq
+
+from enaml.message_codecs import (
+    CompressingCodec, JSONCodec, codec_names, compressor_names, create_codec,
+)
+from enaml.socket_interface import ActionSocketInterface
+from enaml.utils import make_dispatcher
+from enaml.weakmethod import WeakMethod
+
+
+logger = logging.getLogger(__name__)
+
+
+#: The dispatch function for control messages.
+dispatch_control = make_dispatcher('on_control_', logger)
+
+
+class ZMQClientSocket(object):
+    """ An action socket which sends the messages of a client session
+    to its server session over the DEALER socket of a ZMQClient.
+
+    """
+    def __init__(self, client, session_id, codec):
+        """ Initialize a ZMQClientSocket.
+
+        Parameters
+        ----------
+        client : ZMQClient
+            The client which owns the DEALER socket.
+
+        session_id : str
+            The identifier of the session.
+
+        codec : MessageCodec
+            The codec negotiated for the session.
+
+        """
+        self._client = client
+        self._session_id = session_id
+        self._codec = codec
+        self._callback = None
+
+    def on_message(self, callback):
+        """ Register a callback for receiving messages sent by a
+        server object.
+
+        Parameters
+        ----------
+        callback : callable
+            A callable with an argument signature that is equivalent to
+            the `send` method. If the callback is a bound method, then
+            the lifetime of the callback will be bound to lifetime of
+            the method owner object.
+
+        """
+        if isinstance(callback, types.MethodType):
+            callback = WeakMethod(callback)
+        self._callback = callback
+
+    def send(self, object_id, action, content):
+        """ Send an action to the server object.
+
+        Parameters
+        ----------
+        object_id : str
+            The object id of the target object.
+
+        action : str
+            The action that should be performed by the object.
+
+        content : dict
+            The content dictionary for the action.
+
+        """
+        payload = self._codec.encode(object_id, action, content)
+        self._client.send_frames(self._session_id, payload)
+
+    def receive(self, payload):
+        """ Decode a message from the server and route it to the
+        registered callback.
+
+        Parameters
+        ----------
+        payload : str
+            The encoded message.
+
+        Returns
+        -------
+        result : tuple
+            The decoded `(object_id, action, content)` message.
+
+        """
+        message = self._codec.decode(payload)
+        callback = self._callback
+        if callback is not None:
+            callback(*message)
+        return message
+
+
+ActionSocketInterface.register(ZMQClientSocket)
+
+
+class ZMQClient(object):
+    """ A client which hosts the client sessions of a ZMQServer.
+
+    The client does not run an event loop. The `process_events` method
+    should be called when the socket is readable, for example from a
+    QSocketNotifier on the `fd` of the client.
+
+    """
+    def __init__(self, address, session_factory, context=None, codecs=None,
+                 compression=None):
+        """ Initialize a ZMQClient.
+
+        Parameters
+        ----------
+        address : str
+            The zmq address of the server.
+
+        session_factory : callable
+            A callable which accepts the session id and the widget
+            groups of a session and returns a new client session, such
+            as `QtSession`.
+
+        context : zmq.Context, optional
+            The zmq context to use. The default is the global instance.
+
+        codecs : list, optional
+            The names of the codecs supported by the client, in order
+            of preference. The default is all registered codecs.
+
+        compression : list, optional
+            The names of the compressors supported by the client, in
+            order of preference. The server may select one of these to
+            compress the large messages of a session. The default is
+            all registered compressors.
+
+        """
+        if context is None:
+            context = zmq.Context.instance()
+        dealer = context.socket(zmq.DEALER)
+        dealer.setsockopt(zmq.LINGER, 0)
+        dealer.connect(address)
+        self._dealer = dealer
+        self._session_factory = session_factory
+        if codecs is None:
+            codecs = codec_names()
+        self._codecs = list(codecs)
+        if compression is None:
+            compression = compressor_names()
+        self._compression = list(compression)
+        self._sessions = {}
+        self._sockets = {}
+        self._names = {}
+        self._discovered = None
+        self._errors = []
+
+    #--------------------------------------------------------------------------
+    # Private API
+    #--------------------------------------------------------------------------
+    def _on_frames(self, frames):
+        """ Handle a multipart message received by the DEALER.
+
+        """
+        if len(frames) != 2:
+            logger.warn('Invalid message received by ZMQClient')
+            return
+        session_id, payload = frames
+        if not session_id:
+            object_id, action, content = JSONCodec().decode(payload)
+            dispatch_control(self, action, object_id, content)
+            return
+        socket = self._sockets.get(session_id)
+        if socket is None:
+            msg = 'Invalid session id sent to ZMQClient: %s'
+            logger.warn(msg % session_id)
+            return
+        object_id, action, content = socket.receive(payload)
+        if object_id == session_id:
+            if action == 'snapshot':
+                session = self._sessions[session_id]
+                session.open(content['windows'])
+                session.activate(socket)
+            elif action == 'close':
+                del self._sessions[session_id]
+                del self._sockets[session_id]
+                del self._names[session_id]
+
+    def _send_control(self, action, content):
+        """ Send a control message to the server.
+
+        """
+        payload = JSONCodec().encode('', action, content)
+        self.send_frames('', payload)
+
+    #--------------------------------------------------------------------------
+    # Control Handlers
+    #--------------------------------------------------------------------------
+    def on_control_discover(self, session_id, content):
+        """ Handle the 'discover' control message from the server.
+
+        """
+        self._discovered = content['sessions']
+
+    def on_control_open(self, session_id, content):
+        """ Handle the 'open' control message from the server.
+
+        """
+        session_id = str(session_id)
+        codec = create_codec(content['codec'])
+        compression = content.get('compression')
+        if compression is not None:
+            threshold = content['compression_threshold']
+            codec = CompressingCodec(codec, compression, threshold)
+        session = self._session_factory(session_id, content['widget_groups'])
+        self._sessions[session_id] = session
+        self._sockets[session_id] = ZMQClientSocket(self, session_id, codec)
+        self._names[session_id] = content['name']
+
+    def on_control_error(self, session_id, content):
+        """ Handle the 'error' control message from the server.
+
+        """
+        name = content['name']
+        error = content['error']
+        self._errors.append((name, error))
+        msg = 'ZMQServer could not open session %r: %s'
+        logger.error(msg % (name, error))
+
+    def on_control_ping(self, session_id, content):
+        """ Handle the 'ping' control message from the server.
+
+        The server pings the client to detect that it has gone away,
+        so no reply is needed.
+
+        """
+        pass
+
+    #--------------------------------------------------------------------------
+    # Public API
+    #--------------------------------------------------------------------------
+    @property
+    def fd(self):
+        """ The file descriptor which signals the events of the socket.
+
+        The descriptor is edge triggered. Call `process_events` until
+        no more messages are pending whenever it becomes readable.
+
+        """
+        return self._dealer.getsockopt(zmq.FD)
+
+    @property
+    def discovered(self):
+        """ The session info of the last 'discover' reply, or None if
+        no reply has been received.
+
+        """
+        return self._discovered
+
+    @property
+    def errors(self):
+        """ The list of the `(name, error)` tuples of the 'error'
+        control messages received from the server.
+
+        """
+        return self._errors[:]
+
+    def discover(self):
+        """ Request the session info of the server.
+
+        The reply is available from `discovered` once it is received.
+
+        """
+        self._send_control('discover', {})
+
+    def start_session(self, name):
+        """ Request the server to start a session of the given name.
+
+        The client session is created by the session factory when the
+        server replies.
+
+        Parameters
+        ----------
+        name : str
+            The name of the session to start.
+
+        """
+        content = {
+            'name': name,
+            'codecs': self._codecs,
+            'compression': self._compression,
+        }
+        self._send_control('start_session', content)
+
+    def attach_session(self, session_id):
+        """ Request the server to attach a session which it started.
+
+        The client session is created by the session factory when the
+        server replies.
+
+        Parameters
+        ----------
+        session_id : str
+            The identifier of a session started with the
+            `start_session` method of the server.
+
+        """
+        content = {
+            'session_id': session_id,
+            'codecs': self._codecs,
+            'compression': self._compression,
+        }
+        self._send_control('attach_session', content)
+
+    def end_session(self, session_id):
+        """ Request the server to end the session with the given id.
+
+        Parameters
+        ----------
+        session_id : str
+            The unique identifier for the session to close.
+
+        """
+        self._send_control('end_session', {'session_id': session_id})
+
+    def session(self, session_id):
+        """ Get the client session for the given session id.
+
+        Returns
+        -------
+        result : object or None
+            The client session with the given id, or None if the id
+            does not correspond to an active session.
+
+        """
+        return self._sessions.get(session_id)
+
+    def sessions(self):
+        """ Get a dictionary of the names of the client sessions,
+        keyed by session id.
+
+        """
+        return self._names.copy()
+
+    def process_events(self, timeout=0.0):
+        """ Process the messages received from the server.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The maximum time in seconds to wait for the first message.
+            The default is 0.0.
+
+        Returns
+        -------
+        result : int
+            The number of messages which were processed.
+
+        """
+        dealer = self._dealer
+        handled = 0
+        if not dealer.poll(int(timeout * 1000)):
+            return handled
+        while True:
+            try:
+                frames = dealer.recv_multipart(zmq.NOBLOCK)
+            except zmq.Again:
+                break
+            handled += 1
+            try:
+                self._on_frames(frames)
+            except Exception:
+                logger.exception('Error handling a ZMQClient message')
+        return handled
+
+    def send_frames(self, session_id, payload):
+        """ Send a multipart message to the server.
+
+        Parameters
+        ----------
+        session_id : str
+            The session id of the message, or an empty string for a
+            control message.
+
+        payload : str
+            The encoded message.
+
+        """
+        self._dealer.send_multipart([str(session_id), payload])
+
+    def close(self):
+        """ Close the socket of the client.
+
+        """
+        self._dealer.close()
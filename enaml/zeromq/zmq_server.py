@@ -2,274 +2,722 @@
 #  Copyright (c) 2012, Enthought, Inc.
 #  All rights reserved.
 #------------------------------------------------------------------------------
-import json
+""" An Enaml Application which serves sessions over a ZeroMQ socket.
+
+The server binds a ROUTER socket. Each client connects a DEALER socket
+and exchanges multipart messages of the form `[session_id, payload]`,
+where the ROUTER prepends the identity of the client. The payload is an
+encoded `(object_id, action, content)` message.
+
+Messages with an empty session id are control messages. They are always
+encoded with the JSON codec, and are used to discover the sessions
+served by the application, and to start, attach and end sessions:
+
+'discover'
+    Sent by the client. The server replies with a 'discover' message
+    with the session info of `Application.discover` as 'sessions'.
+
+'start_session'
+    Sent by the client with the session 'name', and the names of the
+    'codecs' and the 'compression' methods the client supports, in order
+    of preference. The server opens the session and replies with an
+    'open' message, whose object id is the new session id, with the
+    'name', 'widget_groups', the negotiated 'codec' and 'compression'
+    of the session, and the 'compression_threshold'. The 'compression'
+    is None if the messages are not compressed. The server then sends
+    the 'snapshot' of the session windows as the first session message
+    and activates the session.
+
+'attach_session'
+    Sent by the client with the 'session_id' of a session started with
+    `ZMQServer.start_session`, and the 'codecs' and 'compression' of
+    the client. The server replies as for 'start_session'. A session
+    may only be attached to one client.
+
+'error'
+    Sent by the server when a session cannot be started or attached,
+    with the 'name' of the session or the session id, and the 'error'.
+
+'ping'
+    Sent by the server to the clients with attached sessions at the
+    ping interval of the server. The server ends the sessions of a
+    client which can no longer be reached.
+
+'end_session'
+    Sent by the client with the 'session_id' to close. The server closes
+    the session, which sends a 'close' message to the client session.
+
+All other messages are session messages, encoded with the codec of the
+session. These are the actions exchanged by a `Session` and a client
+session such as a `QtSession`: the 'message_batch', 'url_request' and
+'url_reply' actions of the sessions, and the actions of their objects.
+
+"""
+from collections import deque
+from heapq import heappush, heappop
+from itertools import count
+import logging
+import threading
+from timeit import default_timer
+import types
+import uuid
 
 import zmq
-from zmq.eventloop.ioloop import IOLoop
-from zmq.eventloop.zmqstream import ZMQStream
 
-from enaml.message import Message
-from enaml.request import BaseRequest, BasePushHandler
-from enaml.utils import log_exceptions
+from enaml.application import Application, IncrementalTask
+from enaml.message_codecs import (
+    CompressingCodec, JSONCodec, negotiate_codec, negotiate_compression,
+)
+from enaml.socket_interface import ActionSocketInterface
+from enaml.utils import make_dispatcher
+from enaml.weakmethod import WeakMethod
 
 
-def pack_message(routing_id, message):
-    """ Pack a routing id and Message into a mutlipart zmq message.
+logger = logging.getLogger(__name__)
 
-    Parameters
-    ----------
-    routing_id : str
-        The zmq socket identity to place first in the message.
 
-    message : Message
-        The Message object to serialized into the multipart message.
+#: The dispatch function for control messages.
+dispatch_control = make_dispatcher('on_control_', logger)
+
+
+class ZMQActionSocket(object):
+    """ An action socket which sends the messages of a server session
+    to its client over the ROUTER socket of a ZMQServer.
 
     """
-    multipart = [routing_id]
-    dumps = json.dumps
-    multipart.extend(dumps(part) for part in message)
-    return multipart
+    def __init__(self, server, routing_id, session_id, codec):
+        """ Initialize a ZMQActionSocket.
 
+        Parameters
+        ----------
+        server : ZMQServer
+            The server which owns the ROUTER socket.
 
-def unpack_message(multipart):
-    """ Unpack a mutlipart Enaml message received by the server.
+        routing_id : str
+            The zmq identity of the client of the session.
 
-    Parameters
-    ----------
-    multipart : list
-        The 5-element list representing the routing_id, header, 
-        parent_header, metadata, and content of a client message.
+        session_id : str
+            The identifier of the session.
 
-    Returns
-    -------
-    routing_id, message : str, Message
-        The zmq routing id and the deserialized Message object.
+        codec : MessageCodec
+            The codec negotiated for the session.
 
-    """
-    if len(multipart) != 5:
-        raise TypeError('Invalid wire message: %s' % multipart)
-    routing_id = multipart[0]
-    loads = json.loads
-    return routing_id, Message(loads(part) for part in multipart[1:])
+        """
+        self._server = server
+        self._routing_id = routing_id
+        self._session_id = session_id
+        self._codec = codec
+        self._callback = None
 
+    @property
+    def routing_id(self):
+        """ The zmq identity of the client of the session.
 
-class ZMQRequest(BaseRequest):
-    """ A concrete BaseRequest implementation for the ZMQServer.
+        """
+        return self._routing_id
 
-    """
-    def __init__(self, message, routing_id, stream, ioloop):
-        """ Initialize a ZMQRequest.
+    def on_message(self, callback):
+        """ Register a callback for receiving messages sent by a client
+        object.
 
         Parameters
         ----------
-        message : Message
-            The Message instance that generated this request.
+        callback : callable
+            A callable with an argument signature that is equivalent to
+            the `send` method. If the callback is a bound method, then
+            the lifetime of the callback will be bound to lifetime of
+            the method owner object.
 
-        routing_id : str
-            The zmq identity string for the client.
+        """
+        if isinstance(callback, types.MethodType):
+            callback = WeakMethod(callback)
+        self._callback = callback
+
+    def send(self, object_id, action, content):
+        """ Send an action to the client of an object.
+
+        The message is encoded and sent on the server thread. It is safe
+        to call this method from other threads, such as the threads of
+        a resource loader.
 
-        stream : ZMQStream
-            The zmq socket stream for this request.
+        Parameters
+        ----------
+        object_id : str
+            The object id of the target object.
 
-        ioloop : IOLoop
-            The zmq IOLoop instance for this request.
+        action : str
+            The action that should be performed by the object.
+
+        content : dict
+            The content dictionary for the action.
 
         """
-        self._message = message
-        self._routing_id = routing_id
-        self._stream = stream
-        self._ioloop = ioloop
-        self._finished = False
+        server = self._server
+        if not server.is_main_thread():
+            server.deferred_call(self.send, object_id, action, content)
+            return
+        payload = self._codec.encode(object_id, action, content)
+        server.send_frames(self._routing_id, self._session_id, payload)
 
-    #--------------------------------------------------------------------------
-    # Abstract API implementation
-    #--------------------------------------------------------------------------
-    @property
-    def message(self):
-        """ The Message object for this request.
+    def receive(self, payload):
+        """ Decode a message from the client and route it to the
+        registered callback.
 
-        Returns
-        -------
-        result : Message
-            The Message instance pertaining to this request.
+        Parameters
+        ----------
+        payload : str
+            The encoded message.
 
         """
-        return self._message
+        object_id, action, content = self._codec.decode(payload)
+        callback = self._callback
+        if callback is not None:
+            callback(object_id, action, content)
+
 
-    def add_callback(self, callback):
-        """ Add a callback to the event queue to be called later.
+ActionSocketInterface.register(ZMQActionSocket)
 
-        This is can be used by the request handlers to defer long 
-        running work until a future time, at which point the results
-        can be pushed to the client with the 'push_handler()'.
+
+class ZMQServer(Application):
+    """ An Enaml Application which serves sessions over ZeroMQ.
+
+    The server runs its own event loop, so the Enaml objects of the
+    sessions are created and run in the process of the server, away
+    from the process of the user interface.
+
+    """
+    def __init__(self, factories, address, context=None,
+                 compression=('zlib',), compression_threshold=4096,
+                 ping_interval=5.0):
+        """ Initialize a ZMQServer.
 
         Parameters
         ----------
-        callback : callable
-            A callable which should be invoked by the event loop at 
-            some future time. This method will return immediately.
+        factories : iterable
+            An iterable of SessionFactory instances to pass to the
+            superclass constructor.
+
+        address : str
+            The zmq address on which to bind the server, for example
+            'tcp://127.0.0.1:8888' or 'ipc:///tmp/enaml'.
+
+        context : zmq.Context, optional
+            The zmq context to use. An 'inproc://' address requires the
+            context of the client. The default is the global instance.
+
+        compression : iterable, optional
+            The names of the compressors which the server allows for
+            its sessions. The compressor of a session is the first of
+            these offered by the client. An empty iterable disables
+            compression. The default is ('zlib',).
+
+        compression_threshold : int, optional
+            The size in bytes of the smallest encoded message which is
+            compressed. The default is 4096.
+
+        ping_interval : float, optional
+            The interval in seconds at which the clients with attached
+            sessions are pinged, so that the sessions of a client which
+            has gone away are ended. None disables the pings. The
+            default is 5.0.
+
+        """
+        super(ZMQServer, self).__init__(factories)
+        self._compression = tuple(compression)
+        self._compression_threshold = compression_threshold
+        if context is None:
+            context = zmq.Context.instance()
+        router = context.socket(zmq.ROUTER)
+        router.setsockopt(zmq.LINGER, 0)
+        # Sending to a client which has gone away raises an error
+        # instead of silently dropping the message.
+        router.setsockopt(zmq.ROUTER_MANDATORY, 1)
+        router.bind(address)
+        self._router = router
+        self._sessions = {}
+        self._sockets = {}
+        self._names = {}
+        self._opening = {}
+        self._lost_peers = set()
+        self._calls = deque()
+        self._timers = []
+        self._timer_counter = count()
+        self._thread = threading.current_thread()
+        self._running = False
+        # A pair of inproc sockets which wakes the poller when a call
+        # is deferred from another thread. The sending socket is shared
+        # by the other threads, so it is guarded by a lock.
+        wake_address = 'inproc://enaml-zmq-wake-%s' % uuid.uuid4().hex
+        wake_recv = context.socket(zmq.PAIR)
+        wake_recv.setsockopt(zmq.LINGER, 0)
+        wake_recv.bind(wake_address)
+        wake_send = context.socket(zmq.PAIR)
+        wake_send.setsockopt(zmq.LINGER, 0)
+        wake_send.connect(wake_address)
+        self._wake_recv = wake_recv
+        self._wake_send = wake_send
+        self._wake_lock = threading.Lock()
+        poller = self._poller = zmq.Poller()
+        poller.register(router, zmq.POLLIN)
+        poller.register(wake_recv, zmq.POLLIN)
+        self._ping_interval = ping_interval
+        if ping_interval is not None:
+            self.timed_call(int(ping_interval * 1000), self._ping_peers)
+
+    #--------------------------------------------------------------------------
+    # Private API
+    #--------------------------------------------------------------------------
+    def _on_frames(self, frames):
+        """ Handle a multipart message received by the ROUTER.
+
+        """
+        if len(frames) != 3:
+            logger.warn('Invalid message received by ZMQServer')
+            return
+        routing_id, session_id, payload = frames
+        if not session_id:
+            object_id, action, content = JSONCodec().decode(payload)
+            dispatch_control(self, action, routing_id, content)
+            return
+        socket = self._sockets.get(session_id)
+        if socket is None or socket.routing_id != routing_id:
+            msg = 'Invalid session id sent to ZMQServer: %s'
+            logger.warn(msg % session_id)
+            return
+        socket.receive(payload)
+
+    def _send_control(self, routing_id, object_id, action, content):
+        """ Send a control message to a client.
+
+        """
+        payload = JSONCodec().encode(object_id, action, content)
+        self.send_frames(routing_id, '', payload)
+
+    def _send_error(self, routing_id, name, error):
+        """ Send an 'error' control message to a client.
 
         """
-        self._ioloop.add_callback(callback)
+        reply = {'name': name, 'error': error}
+        self._send_control(routing_id, '', 'error', reply)
 
-    @log_exceptions
-    def send_reply(self, message):
-        """ Send the given message to the client as a reply.
+    def _attach(self, routing_id, session_id, content):
+        """ Attach an opened session to a client and activate it.
 
         Parameters
         ----------
-        message : Message
-            A Message instance to send to the client as a reply to
-            this particular request.
+        routing_id : str
+            The zmq identity of the client.
+
+        session_id : str
+            The identifier of an opened session which is not attached.
 
-        Notes
-        -----
-        * Users should not usually call this method directly. Instead,
-          users should call the 'reply' convenience method. 
-        * Calling this method effectively closes the request and further 
-          calls to this method will log an error.
+        content : dict
+            The content of the 'start_session' or 'attach_session'
+            control message, with the 'codecs' and 'compression' of
+            the client.
 
         """
-        if self._finished:
-            raise RuntimeError('Request already finished')
-        packed = pack_message(self._routing_id, message)
-        self._stream.send_multipart(packed)
-        self._finished = True
+        session = self._sessions[session_id]
+        codec = negotiate_codec(content.get('codecs', ()))
+        codec_name = codec.name
+        compression = negotiate_compression(
+            content.get('compression', ()), self._compression
+        )
+        threshold = self._compression_threshold
+        if compression is not None:
+            codec = CompressingCodec(codec, compression, threshold)
+        socket = ZMQActionSocket(self, routing_id, session_id, codec)
+        self._sockets[session_id] = socket
+
+        reply = {}
+        reply['name'] = self._names[session_id]
+        reply['widget_groups'] = session.widget_groups[:]
+        reply['codec'] = codec_name
+        reply['compression'] = compression
+        reply['compression_threshold'] = threshold
+        self._send_control(routing_id, session_id, 'open', reply)
+        snapshot = {'windows': session.snapshot()}
+        socket.send(session_id, 'snapshot', snapshot)
+        session.activate(socket)
+
+    def _ping_peers(self):
+        """ Ping the clients with attached sessions, and schedule the
+        next ping.
+
+        A client which has gone away cannot be reached, and its
+        sessions are ended by `send_frames`.
 
-    def push_handler(self):
-        """ Returns an object that can be used to push unsolicited 
-        messages to this client.
+        """
+        peers = set(socket.routing_id for socket in self._sockets.values())
+        for routing_id in peers:
+            self._send_control(routing_id, '', 'ping', {})
+        interval = int(self._ping_interval * 1000)
+        self.timed_call(interval, self._ping_peers)
 
-        Returns
-        -------
-        result : ZMQPushHandler
-            A ZMQPushHandler instance which can be used to push messages
-            to this client, without the client initiating a request.
+    def _drop_peer(self, routing_id):
+        """ End the sessions of a client which can no longer be
+        reached.
 
         """
-        return ZMQPushHandler(self._routing_id, self._stream, self._ioloop)
+        for session_id, socket in self._sockets.items():
+            if socket.routing_id == routing_id:
+                if session_id in self._sessions:
+                    self.end_session(session_id)
+        self._lost_peers.discard(routing_id)
 
+    def _run_timers(self):
+        """ Run the timed calls which are due.
 
-class ZMQPushHandler(BasePushHandler):
-    """ A concrete BasePushHandler implementation for the ZMQServer.
+        """
+        timers = self._timers
+        now = default_timer()
+        while timers and timers[0][0] <= now:
+            when, ignored, callback, args, kwargs = heappop(timers)
+            try:
+                callback(*args, **kwargs)
+            except Exception:
+                logger.exception('Error in a ZMQServer timed call')
+
+    def _run_calls(self):
+        """ Run the calls which were deferred before this method was
+        called.
 
-    Instances of this class will remain functional for the lifetime
-    of the originating client. If the client disconnects, then 
-    this handler will silently drop the messages.
+        """
+        calls = self._calls
+        for idx in xrange(len(calls)):
+            callback, args, kwargs = calls.popleft()
+            try:
+                callback(*args, **kwargs)
+            except Exception:
+                logger.exception('Error in a ZMQServer deferred call')
 
-    """
-    def __init__(self, routing_id, stream, ioloop):
-        """ Initialize a ZMQPushHandler.
+    #--------------------------------------------------------------------------
+    # Control Handlers
+    #--------------------------------------------------------------------------
+    def on_control_discover(self, routing_id, content):
+        """ Handle the 'discover' control message from a client.
+
+        """
+        reply = {'sessions': self.discover()}
+        self._send_control(routing_id, '', 'discover', reply)
+
+    def on_control_start_session(self, routing_id, content):
+        """ Handle the 'start_session' control message from a client.
+
+        """
+        name = content['name']
+        if name not in self._named_factories:
+            self._send_error(routing_id, name, 'Invalid session name')
+            return
+        session_id = self.start_session(name)
+        self._attach(routing_id, session_id, content)
+
+    def on_control_attach_session(self, routing_id, content):
+        """ Handle the 'attach_session' control message from a client.
+
+        A session which is still opening is attached once it is open.
+
+        """
+        session_id = str(content['session_id'])
+        if session_id in self._opening:
+            self._opening[session_id][1].append((routing_id, content))
+            return
+        if session_id not in self._sessions or session_id in self._sockets:
+            self._send_error(routing_id, session_id, 'Invalid session id')
+            return
+        self._attach(routing_id, session_id, content)
+
+    def on_control_end_session(self, routing_id, content):
+        """ Handle the 'end_session' control message from a client.
+
+        """
+        session_id = content['session_id']
+        socket = self._sockets.get(session_id)
+        if socket is not None and socket.routing_id == routing_id:
+            self.end_session(session_id)
+
+    #--------------------------------------------------------------------------
+    # Abstract API Implementation
+    #--------------------------------------------------------------------------
+    def start_session(self, name, budget=None):
+        """ Start a new session of the given name.
+
+        The session is opened on the server, and is activated when a
+        client attaches to it with the 'attach_session' control message,
+        for example with `ZMQClient.attach_session`. The sessions started
+        by a client with the 'start_session' control message are opened
+        with this method and attached to that client.
 
         Parameters
         ----------
-        routing_id : str
-            The zmq identity string for the client.
+        name : str
+            The name of the session to start.
 
-        stream : ZMQStream
-            The zmq socket stream for this push handler.
+        budget : float, optional
+            If given, the session is opened incrementally with an
+            IncrementalTask which spends at most about `budget` seconds
+            per cycle of the event loop. The session is available from
+            `session` once it is fully opened, and clients which attach
+            while it is opening are attached once it is open. The
+            default opens the session synchronously.
 
-        ioloop : IOLoop
-            The zmq IOLoop instance for this push handler.
+        Returns
+        -------
+        result : str
+            The unique identifier for the created session.
 
         """
-        self._routing_id = routing_id
-        self._stream = stream
-        self._ioloop = ioloop
+        if name not in self._named_factories:
+            raise ValueError('Invalid session name')
+        session = self._named_factories[name]()
+        session_id = uuid.uuid4().hex
+        self._names[session_id] = name
+        if budget is None:
+            session.open(session_id)
+            self._sessions[session_id] = session
+            return session_id
+
+        def steps():
+            opened = False
+            try:
+                for value in session.iter_open(session_id):
+                    yield value
+                opened = True
+            finally:
+                entry = self._opening.pop(session_id, None)
+                if not opened:
+                    self._names.pop(session_id, None)
+                    session.close()
+            self._sessions[session_id] = session
+            for routing_id, content in entry[1]:
+                self._attach(routing_id, session_id, content)
+
+        def progress(value):
+            session.open_progress = value
+
+        task = IncrementalTask(steps(), budget, progress)
+        self._opening[session_id] = (task, [])
+        task.start()
+        return session_id
+
+    def end_session(self, session_id):
+        """ End the session with the given session id.
+
+        This method will close down the existing session. If the session
+        id is not valid, an exception will be raised.
 
-    @log_exceptions
-    def push_message(self, message):
-        """ Push the given message to the client.
+        Parameters
+        ----------
+        session_id : str
+            The unique identifier for the session to close.
+
+        """
+        if session_id in self._opening:
+            task, attaches = self._opening.pop(session_id)
+            task.cancel()
+            self._names.pop(session_id, None)
+            return
+        if session_id not in self._sessions:
+            raise ValueError('Invalid session id')
+        self._names.pop(session_id, None)
+        self._sessions.pop(session_id).close()
+        self._sockets.pop(session_id, None)
+
+    def session(self, session_id):
+        """ Get the session for the given session id.
 
         Parameters
         ----------
-        message : Message
-            The Message instance that should be pushed to the client.
+        session_id : str
+            The unique identifier for the session to retrieve.
+
+        Returns
+        -------
+        result : Session or None
+            The session object with the given id, or None if the id
+            does not correspond to an active session.
 
         """
-        packed = pack_message(self._routing_id, message)
-        self._stream.send_multipart(packed)
+        return self._sessions.get(session_id)
+
+    def sessions(self):
+        """ Get the opened sessions of the application.
 
-    def add_callback(self, callback):
-        """ Add a callback to the event queue to be called later.
+        Returns
+        -------
+        result : list
+            The list of the opened sessions of the application. This
+            includes the sessions which are not attached to a client.
+
+        """
+        return self._sessions.values()
+
+    def start(self):
+        """ Start the server's event loop. This call will block until
+        the 'stop' method is called.
+
+        """
+        self._running = True
+        while self._running:
+            self.process_events(timeout=1.0)
+
+    def stop(self):
+        """ Stop the server's event loop. This will cause a previous
+        call to 'start' to return.
 
-        This is used as a convenience for Session objects to provide
-        a way to run callables in a deferred fashion. It does not 
-        imply any communication with the client. It is merely an
-        abstract entry point into the zmq event loop. 
+        """
+        self._running = False
+        self.deferred_call(lambda: None)
 
-        Call it a concession to practicality over purity - SCC
+    def deferred_call(self, callback, *args, **kwargs):
+        """ Invoke a callable on the next cycle of the main event loop
+        thread.
 
         Parameters
         ----------
         callback : callable
-            A callable which should be invoked by the event loop at 
-            some future time. This method returns immediately.
+            The callable object to execute at some point in the future.
+
+        *args, **kwargs
+            Any additional positional and keyword arguments to pass to
+            the callback.
 
         """
-        self._ioloop.add_callback(callback)
+        self._calls.append((callback, args, kwargs))
+        if not self.is_main_thread():
+            with self._wake_lock:
+                try:
+                    self._wake_send.send('', zmq.NOBLOCK)
+                except zmq.Again:
+                    # A wake message is already pending.
+                    pass
+
+    def timed_call(self, ms, callback, *args, **kwargs):
+        """ Invoke a callable on the main event loop thread at a
+        specified time in the future.
 
+        Parameters
+        ----------
+        ms : int
+            The time to delay, in milliseconds, before executing the
+            callable.
 
-class ZMQServer(object):
-    """ An Enaml Application server which uses ZeroMQ sockets.
+        callback : callable
+            The callable object to execute at some point in the future.
 
-    """
-    def __init__(self, app, host, port):
-        """ Initialize a ZMQServer.
+        *args, **kwargs
+            Any additional positional and keyword arguments to pass to
+            the callback.
 
-        Parameters
-        ----------
-        app : Application
-            The Enaml Application instance which should be served by 
-            this server.
+        """
+        if self.is_main_thread():
+            when = default_timer() + ms / 1000.0
+            item = (when, self._timer_counter.next(), callback, args, kwargs)
+            heappush(self._timers, item)
+        else:
+            self.deferred_call(self.timed_call, ms, callback, *args, **kwargs)
 
-        host : string
-            The host address for tcp communication. e.g. '127.0.0.1'
+    def is_main_thread(self):
+        """ Indicates whether the caller is on the main gui thread.
 
-        port : int
-            The host port to use for communication. e.g. 8888
+        Returns
+        -------
+        result : bool
+            True if called from the thread which created the server.
+            False otherwise.
 
         """
-        ctxt = zmq.Context()
-        router = ctxt.socket(zmq.ROUTER)
-        router.bind('tcp://%s:%s' % (host, port))
-        self._app = app
-        self._router = router
-        self._stream = ZMQStream(router)
-        self._stream.on_recv(self._on_recv)
-        self._ioloop = IOLoop.instance()
+        return threading.current_thread() is self._thread
 
     #--------------------------------------------------------------------------
-    # Private API
+    # Public API
     #--------------------------------------------------------------------------
-    @log_exceptions
-    def _on_recv(self, multipart):
-        """ The zmq stream message receive handler.
+    @property
+    def endpoint(self):
+        """ The address to which the server is bound, with a wildcard
+        port of a 'tcp://' address resolved to the bound port.
+
+        """
+        return self._router.getsockopt(zmq.LAST_ENDPOINT)
+
+    def process_events(self, timeout=0.0):
+        """ Process the pending messages and calls of the server.
+
+        This is called repeatedly by `start`. It may also be called
+        directly to drive the server from another event loop.
 
         Parameters
         ----------
-        multipart : list
-            The multipart message received by the client.
+        timeout : float, optional
+            The maximum time in seconds to wait for a message if there
+            are no pending calls. The default is 0.0.
 
         """
-        routing_id, message = unpack_message(multipart)
-        request = ZMQRequest(message, routing_id, self._stream, self._ioloop)
-        self._app.handle_request(request)
+        if self._calls:
+            timeout = 0.0
+        elif self._timers:
+            delay = self._timers[0][0] - default_timer()
+            timeout = max(min(timeout, delay), 0.0)
+        events = dict(self._poller.poll(int(timeout * 1000)))
+        if self._wake_recv in events:
+            wake_recv = self._wake_recv
+            while True:
+                try:
+                    wake_recv.recv(zmq.NOBLOCK)
+                except zmq.Again:
+                    break
+        if self._router in events:
+            router = self._router
+            while True:
+                try:
+                    frames = router.recv_multipart(zmq.NOBLOCK)
+                except zmq.Again:
+                    break
+                try:
+                    self._on_frames(frames)
+                except Exception:
+                    logger.exception('Error handling a ZMQServer message')
+        self._run_timers()
+        self._run_calls()
+
+    def send_frames(self, routing_id, session_id, payload):
+        """ Send a multipart message to a client.
+
+        This method must be called on the server thread. If the client
+        can no longer be reached, the message is dropped and the
+        sessions of the client are ended on the next cycle of the event
+        loop.
 
-    #--------------------------------------------------------------------------
-    # Public API
-    #--------------------------------------------------------------------------
-    def start(self):
-        """ Start the server's io loop. This call will block until
-        the 'stop' method is called.
+        Parameters
+        ----------
+        routing_id : str
+            The zmq identity of the client.
 
-        """
-        self._ioloop.start()
+        session_id : str
+            The session id of the message, or an empty string for a
+            control message.
 
-    def stop(self):
-        """ Stop the server's io loop. This will cause a previous call
-        to 'start' to return.
+        payload : str
+            The encoded message.
 
         """
-        self._ioloop.stop()
+        try:
+            self._router.send_multipart([routing_id, session_id, payload])
+        except zmq.ZMQError as exc:
+            if exc.errno != zmq.EHOSTUNREACH:
+                raise
+            if routing_id not in self._lost_peers:
+                self._lost_peers.add(routing_id)
+                self.deferred_call(self._drop_peer, routing_id)
+
+    def destroy(self):
+        """ Destroy the server and close its socket.
 
+        """
+        super(ZMQServer, self).destroy()
+        poller = self._poller
+        poller.unregister(self._router)
+        poller.unregister(self._wake_recv)
+        self._router.close()
+        self._wake_recv.close()
+        self._wake_send.close()
@@ -49,6 +49,7 @@ setup(
     entry_points = dict(
         console_scripts=[
             'enaml-run = enaml.runner:main',
+            'enaml-compile = enaml.precompiler:main',
         ],
     ),
     ext_modules=ext_modules,